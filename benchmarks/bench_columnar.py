@@ -0,0 +1,77 @@
+""" Compare shared-memory columnar transfer against pickled per-class summaries.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_columnar --classes 50000 --jobs 4
+"""
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.columnar import scan_class_columns
+
+FIXTURES = (
+    "tests_resources/DefaultPileConfigurationService.class",
+    "tests_resources/GatewayServer.class",
+)
+
+
+def _pickled_summaries(class_file_paths: list[str]) -> list[dict]:
+    summaries = []
+    for class_file_path in class_file_paths:
+        java_class = JavaClass(JavaClassDumpPipeline(class_file_path).run())
+        summaries.append({
+            "this_class": java_class.get_class_name(),
+            "super_class": java_class.get_super_class_name() if java_class.super_class else None,
+            "access_flags": java_class.access_flags,
+            "minor_version": java_class.get_minor_version(),
+            "major_version": java_class.get_major_version(),
+            "interfaces_count": java_class.get_interfaces_count(),
+            "fields_count": java_class.get_fields_count(),
+            "methods_count": java_class.get_methods_count(),
+        })
+    return summaries
+
+
+def bench_pickled(paths: list[str], jobs: int, batch_size: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    rows = 0
+    methods = 0
+    batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for summaries in executor.map(_pickled_summaries, batches):
+            rows += len(summaries)
+            methods += sum(summary["methods_count"] for summary in summaries)
+    return time.perf_counter() - start, rows
+
+
+def bench_columnar(paths: list[str], jobs: int, batch_size: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    rows = 0
+    methods = 0
+    for block in scan_class_columns(paths, jobs=jobs, batch_size=batch_size):
+        with block:
+            rows += len(block)
+            methods += sum(block.column("methods_count"))
+    return time.perf_counter() - start, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Columnar shared-memory transfer benchmark")
+    parser.add_argument("--classes", type=int, default=50_000)
+    parser.add_argument("--jobs", type=int, default=os.process_cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    paths = list(itertools.islice(itertools.cycle(FIXTURES), args.classes))
+
+    for name, bench in (("pickled", bench_pickled), ("columnar", bench_columnar)):
+        elapsed, rows = bench(paths, args.jobs, args.batch_size)
+        print(f"{name:>9}: {rows} classes in {elapsed:.3f}s ({rows / elapsed:,.0f} classes/s)")
+
+
+if __name__ == "__main__":
+    main()
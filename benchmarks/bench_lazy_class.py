@@ -0,0 +1,63 @@
+""" Measure what get_class_name() costs on a class with many members, against decoding every section.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_lazy_class --members 10000
+
+JavaClass decodes each section on first access, so reading the class name only builds the
+constant pool; fields, methods, interfaces and attributes stay undecoded.
+"""
+import argparse
+import time
+from io import BytesIO
+
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+
+from .synthetic import ClassShape, generate_class
+
+SECTIONS = ("interfaces", "fields", "methods", "attributes")
+
+
+def _best(repeat: int, function) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-m", "--members", type=int, default=10000, help="fields plus methods (default: 10000)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="timed runs (default: 5)")
+    args = parser.parse_args()
+
+    shape = ClassShape(pool_size=4 * args.members, fields=args.members // 2, methods=args.members - args.members // 2,
+                       code_size=8)
+    chunk = JavaClassDumpPipeline.dump(BytesIO(generate_class(shape, "bench/Wide")))
+
+    java_class = JavaClass(chunk)
+    java_class.get_class_name()
+    touched = [section for section in SECTIONS if section in vars(java_class)]
+    assert not touched, f"get_class_name() decoded {', '.join(touched)}"
+
+    def class_name() -> None:
+        JavaClass(chunk).get_class_name()
+
+    def everything() -> None:
+        full = JavaClass(chunk)
+        full.get_class_name()
+        full.get_interfaces()
+        full.get_attributes()
+        for member in (*full.get_fields(), *full.get_methods()):
+            member.attributes
+
+    lazy, eager = _best(args.repeat, class_name), _best(args.repeat, everything)
+    print(f"{args.members:,} members, {len(chunk.constant_pool_segment):,} pool bytes")
+    print(f"get_class_name() {lazy * 1000:>10.2f} ms")
+    print(f"every section    {eager * 1000:>10.2f} ms ({eager / lazy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+""" Parser benchmark suite over synthetic class files.
+
+Run from the repository root:
+
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --compare baseline.json --threshold 0.10
+
+Every scenario generates class files of one ClassShape and times the pipeline, constant pool
+construction, attribute loading, full JavaClass construction and writing classes back, as is and
+with a compacted constant pool. Throughput is the best of `--repeat` runs; peak memory is measured
+in a separate tracemalloc pass so it does not skew timings. With --compare the exit status is 1
+when any throughput drops, or peak memory grows, by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.attributes import AttributeFactory, CodeAttributeInfo
+from xscripts.java.constant_pool import ConstantPoolFactory
+from xscripts.java.pipeline import ChunkedJavaClass
+from xscripts.java.writer import class_bytes
+
+from .synthetic import ClassShape, generate_class
+
+SCENARIOS: dict[str, ClassShape] = {
+    "default": ClassShape(),
+    "small": ClassShape(pool_size=32, fields=1, methods=2, code_size=8),
+    "large_pool": ClassShape(pool_size=8192, fields=4, methods=4),
+    "many_methods": ClassShape(pool_size=1024, fields=64, methods=512),
+    "big_code": ClassShape(methods=8, code_size=16384),
+    "deep_annotations": ClassShape(annotation_depth=16),
+    "no_attributes": ClassShape(attributes=frozenset()),
+}
+
+
+def bench_pipeline_run(paths: list[str], chunks: list[ChunkedJavaClass]) -> None:
+    for path in paths:
+        JavaClassDumpPipeline(path).run()
+
+
+def bench_make_constant_pool(paths: list[str], chunks: list[ChunkedJavaClass]) -> None:
+    for chunk in chunks:
+        ConstantPoolFactory.make_constant_pool(chunk.constant_pool_segment)
+
+
+def bench_attribute_factory(paths: list[str], chunks: list[ChunkedJavaClass]) -> None:
+    for chunk in chunks:
+        java_class = JavaClass(chunk)
+        factory = AttributeFactory(java_class.constant_pool)
+        factory.load_class_file_attributes(java_class.attributes_count, chunk.attributes_info_segment)
+        for field in java_class.fields:
+            factory.load_field_info_attributes(field.attributes_count, field.raw[8:])
+        for method in java_class.methods:
+            for attribute in factory.load_method_info_attributes(method.attributes_count, method.raw[8:]):
+                if isinstance(attribute, CodeAttributeInfo):
+                    factory.load_code_attributes(attribute.attributes_count, attribute.attributes_segment)
+
+
+def bench_java_class(paths: list[str], chunks: list[ChunkedJavaClass]) -> None:
+    for chunk in chunks:
+        java_class = JavaClass(chunk)
+        java_class.get_class_name()
+        java_class.get_attributes()
+        for member in (*java_class.get_fields(), *java_class.get_methods()):
+            member.attributes
+
+
+def bench_write_class(paths: list[str], chunks: list[ChunkedJavaClass]) -> None:
+    for chunk in chunks:
+        java_class = JavaClass(chunk)
+        java_class.get_attributes()
+        for member in (*java_class.get_fields(), *java_class.get_methods()):
+            member.attributes
+        class_bytes(java_class)
+
+
+def bench_compact_class(paths: list[str], chunks: list[ChunkedJavaClass]) -> None:
+    for chunk in chunks:
+        class_bytes(JavaClass(chunk), compact=True)
+
+
+BENCHMARKS: dict[str, Callable[[list[str], list[ChunkedJavaClass]], None]] = {
+    "pipeline_run": bench_pipeline_run,
+    "make_constant_pool": bench_make_constant_pool,
+    "attribute_factory": bench_attribute_factory,
+    "java_class": bench_java_class,
+    "write_class": bench_write_class,
+    "compact_class": bench_compact_class,
+}
+
+
+def run_scenario(shape: ClassShape, classes: int, repeat: int, directory: str) -> dict[str, dict]:
+    paths = []
+    total_bytes = 0
+    for i in range(classes):
+        data = generate_class(shape, f"bench/Synthetic{i}")
+        total_bytes += len(data)
+        path = os.path.join(directory, f"Synthetic{i}.class")
+        with open(path, "wb") as class_file:
+            class_file.write(data)
+        paths.append(path)
+    chunks = [JavaClassDumpPipeline(path).run() for path in paths]
+
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            bench(paths, chunks)
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        bench(paths, chunks)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[name] = {
+            "seconds": best,
+            "classes_per_second": classes / best,
+            "bytes_per_second": total_bytes / best,
+            "peak_memory": peak,
+        }
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """ Return a description of every result that regressed against the baseline. """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if result["classes_per_second"] < base["classes_per_second"] * (1 - threshold):
+            regressions.append(f"{key}: throughput {result['classes_per_second']:,.0f} classes/s, "
+                               f"baseline {base['classes_per_second']:,.0f} classes/s")
+        if result["peak_memory"] > base["peak_memory"] * (1 + threshold):
+            regressions.append(f"{key}: peak memory {result['peak_memory']:,} bytes, "
+                               f"baseline {base['peak_memory']:,} bytes")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Java class parser benchmark suite")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("-c", "--compare", help="baseline JSON file to compare against")
+    parser.add_argument("-t", "--threshold", type=float, default=0.10,
+                        help="allowed relative regression (default: 0.10)")
+    parser.add_argument("-n", "--classes", type=int, default=50, help="classes per scenario (default: 50)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="timed runs per benchmark (default: 3)")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only these scenarios")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for scenario in args.scenario or SCENARIOS:
+            for name, result in run_scenario(SCENARIOS[scenario], args.classes, args.repeat, directory).items():
+                key = f"{scenario}/{name}"
+                results[key] = result
+                print(f"{key:<36} {result['classes_per_second']:>12,.0f} classes/s "
+                      f"{result['bytes_per_second'] / 2 ** 20:>9.2f} MiB/s "
+                      f"{result['peak_memory'] / 2 ** 20:>9.2f} MiB peak")
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({
+                "python": sys.version,
+                "platform": platform.platform(),
+                "classes": args.classes,
+                "results": results,
+            }, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+""" Synthetic, valid class files for benchmarks.
+
+The shape of a generated class is controlled by ClassShape: constant pool size, member counts,
+code size, annotation nesting depth and which optional attributes are attached.
+"""
+import struct
+from dataclasses import dataclass, field
+
+ATTRIBUTE_MIX = frozenset({
+    "ConstantValue",
+    "Signature",
+    "Deprecated",
+    "Exceptions",
+    "LineNumberTable",
+    "LocalVariableTable",
+    "RuntimeVisibleAnnotations",
+    "SourceFile",
+})
+
+
+@dataclass(frozen=True)
+class ClassShape:
+    pool_size: int = 256
+    fields: int = 8
+    methods: int = 16
+    code_size: int = 64
+    annotation_depth: int = 1
+    attributes: frozenset[str] = field(default=ATTRIBUTE_MIX)
+
+
+class ConstantPoolBuilder:
+    """ Appends deduplicated constant pool entries and tracks their indexes. """
+
+    def __init__(self) -> None:
+        self.entries: list[bytes] = []
+        self.count = 1
+        self.__indexes: dict[bytes, int] = {}
+
+    def __add(self, entry: bytes, slots: int = 1) -> int:
+        index = self.__indexes.get(entry)
+        if index is None:
+            index = self.count
+            self.__indexes[entry] = index
+            self.entries.append(entry)
+            self.count += slots
+        return index
+
+    def utf8(self, string: str) -> int:
+        encoded = string.encode("utf-8")
+        return self.__add(struct.pack(">BH", 1, len(encoded)) + encoded)
+
+    def integer(self, value: int) -> int:
+        return self.__add(struct.pack(">Bi", 3, value))
+
+    def long(self, value: int) -> int:
+        return self.__add(struct.pack(">Bq", 5, value), slots=2)
+
+    def class_info(self, name: str) -> int:
+        return self.__add(struct.pack(">BH", 7, self.utf8(name)))
+
+    def string(self, value: str) -> int:
+        return self.__add(struct.pack(">BH", 8, self.utf8(value)))
+
+    def name_and_type(self, name: str, descriptor: str) -> int:
+        return self.__add(struct.pack(">BHH", 12, self.utf8(name), self.utf8(descriptor)))
+
+    def methodref(self, owner: str, name: str, descriptor: str) -> int:
+        return self.__add(struct.pack(">BHH", 10, self.class_info(owner), self.name_and_type(name, descriptor)))
+
+    def fieldref(self, owner: str, name: str, descriptor: str) -> int:
+        return self.__add(struct.pack(">BHH", 9, self.class_info(owner), self.name_and_type(name, descriptor)))
+
+    def module_info(self, name: str) -> int:
+        return self.__add(struct.pack(">BH", 19, self.utf8(name)))
+
+    def package_info(self, name: str) -> int:
+        return self.__add(struct.pack(">BH", 20, self.utf8(name)))
+
+    def to_bytes(self) -> bytes:
+        return struct.pack(">H", self.count) + b"".join(self.entries)
+
+
+def _attribute(pool: ConstantPoolBuilder, name: str, body: bytes) -> bytes:
+    return struct.pack(">HI", pool.utf8(name), len(body)) + body
+
+
+def _annotation(pool: ConstantPoolBuilder, depth: int) -> bytes:
+    """ An annotation whose single element nests `depth - 1` further annotations. """
+    type_index = pool.utf8(f"Lbench/Annotation{depth};")
+    if depth <= 1:
+        value = struct.pack(">BH", ord("I"), pool.integer(depth))
+    else:
+        value = b"@" + _annotation(pool, depth - 1)
+    return struct.pack(">HHH", type_index, 1, pool.utf8("value")) + value
+
+
+def _annotations_attribute(pool: ConstantPoolBuilder, shape: ClassShape) -> bytes:
+    return _attribute(pool, "RuntimeVisibleAnnotations",
+                      struct.pack(">H", 1) + _annotation(pool, max(shape.annotation_depth, 1)))
+
+
+def _code_attribute(pool: ConstantPoolBuilder, class_name: str, index: int, shape: ClassShape) -> bytes:
+    # A run of getstatic/pop pairs padded with nops, ending in return.
+    fieldref = pool.fieldref(class_name, "field0", "I")
+    body = bytearray()
+    while len(body) + 4 <= shape.code_size - 1:
+        body += struct.pack(">BHB", 0xB2, fieldref, 0x57)
+    body += b"\x00" * max(shape.code_size - 1 - len(body), 0)
+    body += b"\xb1"
+
+    attributes = []
+    if "LineNumberTable" in shape.attributes:
+        lines = [(pc, 10 + index + pc) for pc in range(0, len(body), 4)]
+        attributes.append(_attribute(pool, "LineNumberTable", struct.pack(">H", len(lines)) + b"".join(
+            struct.pack(">HH", pc, line) for pc, line in lines)))
+    if "LocalVariableTable" in shape.attributes:
+        attributes.append(_attribute(pool, "LocalVariableTable", struct.pack(
+            ">HHHHHH", 1, 0, len(body), pool.utf8("this"), pool.utf8(f"L{class_name};"), 0)))
+
+    code = struct.pack(">HHI", 2, 1, len(body)) + bytes(body) + struct.pack(">H", 0)
+    code += struct.pack(">H", len(attributes)) + b"".join(attributes)
+    return _attribute(pool, "Code", code)
+
+
+def _member(access_flags: int, name_index: int, descriptor_index: int, attributes: list[bytes]) -> bytes:
+    return struct.pack(">HHHH", access_flags, name_index, descriptor_index, len(attributes)) + b"".join(attributes)
+
+
+def generate_class(shape: ClassShape = ClassShape(), name: str = "bench/Synthetic") -> bytes:
+    """ Generate the bytes of a valid class file with the given shape. """
+    pool = ConstantPoolBuilder()
+    this_class = pool.class_info(name)
+    super_class = pool.class_info("java/lang/Object")
+    interface = pool.class_info("java/io/Serializable")
+
+    fields = []
+    for i in range(shape.fields):
+        attributes = []
+        if "ConstantValue" in shape.attributes:
+            attributes.append(_attribute(pool, "ConstantValue", struct.pack(">H", pool.integer(i))))
+        if "Signature" in shape.attributes:
+            attributes.append(_attribute(pool, "Signature", struct.pack(">H", pool.utf8("I"))))
+        if "Deprecated" in shape.attributes and i % 4 == 0:
+            attributes.append(_attribute(pool, "Deprecated", b""))
+        if "RuntimeVisibleAnnotations" in shape.attributes:
+            attributes.append(_annotations_attribute(pool, shape))
+        fields.append(_member(0x0019, pool.utf8(f"field{i}"), pool.utf8("I"), attributes))
+
+    methods = []
+    for i in range(shape.methods):
+        attributes = [_code_attribute(pool, name, i, shape)]
+        if "Exceptions" in shape.attributes:
+            attributes.append(_attribute(pool, "Exceptions", struct.pack(
+                ">HH", 1, pool.class_info("java/io/IOException"))))
+        if "Signature" in shape.attributes:
+            attributes.append(_attribute(pool, "Signature", struct.pack(">H", pool.utf8("()V"))))
+        if "RuntimeVisibleAnnotations" in shape.attributes:
+            attributes.append(_annotations_attribute(pool, shape))
+        methods.append(_member(0x0001, pool.utf8(f"method{i}"), pool.utf8("()V"), attributes))
+
+    class_attributes = []
+    if "SourceFile" in shape.attributes:
+        class_attributes.append(_attribute(pool, "SourceFile", struct.pack(">H", pool.utf8("Synthetic.java"))))
+    if "RuntimeVisibleAnnotations" in shape.attributes:
+        class_attributes.append(_annotations_attribute(pool, shape))
+
+    # Pad the pool with strings, longs and method refs until it reaches the requested size.
+    filler = 0
+    while pool.count < shape.pool_size - 1:
+        kind = filler % 3
+        if kind == 0:
+            pool.string(f"constant string {filler}")
+        elif kind == 1 and pool.count < shape.pool_size - 2:
+            pool.long(filler)
+        else:
+            pool.methodref(f"bench/Dependency{filler % 32}", f"call{filler}", "(I)V")
+        filler += 1
+
+    return b"".join([
+        struct.pack(">IHH", 0xCAFEBABE, 0, 61),
+        pool.to_bytes(),
+        struct.pack(">HHHHH", 0x0021, this_class, super_class, 1, interface),
+        struct.pack(">H", len(fields)), *fields,
+        struct.pack(">H", len(methods)), *methods,
+        struct.pack(">H", len(class_attributes)), *class_attributes,
+    ])
+
+
+def generate_module_info(name: str, requires: tuple[tuple[str, int], ...] = (("java.base", 0x8000),),
+                         exports: tuple[tuple[str, tuple[str, ...]], ...] = (), packages: tuple[str, ...] = (),
+                         uses: tuple[str, ...] = (), provides: tuple[tuple[str, tuple[str, ...]], ...] = (),
+                         version: str | None = None) -> bytes:
+    """ Generate a module-info.class; `exports` and `packages` use internal package names (a/b). """
+    pool = ConstantPoolBuilder()
+    this_class = pool.class_info("module-info")
+
+    def u2s(indexes: list[int]) -> bytes:
+        return struct.pack(f">H{len(indexes)}H", len(indexes), *indexes)
+
+    body = struct.pack(">HHH", pool.module_info(name), 0, 0 if version is None else pool.utf8(version))
+    body += struct.pack(">H", len(requires)) + b"".join(
+        struct.pack(">HHH", pool.module_info(module), flags, 0) for module, flags in requires)
+    body += struct.pack(">H", len(exports)) + b"".join(
+        struct.pack(">HH", pool.package_info(package), 0) + u2s([pool.module_info(target) for target in targets])
+        for package, targets in exports)
+    body += struct.pack(">H", 0)
+    body += u2s([pool.class_info(service) for service in uses])
+    body += struct.pack(">H", len(provides)) + b"".join(
+        struct.pack(">H", pool.class_info(service)) + u2s([pool.class_info(provider) for provider in providers])
+        for service, providers in provides)
+
+    attributes = [_attribute(pool, "Module", body)]
+    if packages:
+        attributes.append(_attribute(pool, "ModulePackages", u2s([pool.package_info(package) for package in packages])))
+
+    return b"".join([
+        struct.pack(">IHH", 0xCAFEBABE, 0, 53),
+        pool.to_bytes(),
+        struct.pack(">HHHH", 0x8000, this_class, 0, 0),
+        struct.pack(">HH", 0, 0),
+        struct.pack(">H", len(attributes)), *attributes,
+    ])
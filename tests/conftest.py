@@ -0,0 +1,21 @@
+import os
+import zipfile
+from typing import Callable
+
+import pytest
+
+
+@pytest.fixture
+def jar(tmp_path) -> Callable[..., str]:
+    """ Factory writing a jar into tmp_path from classes, by internal name, and text resources. Returns its path. """
+
+    def write(name: str, classes: dict[str, bytes], resources: dict[str, str] | None = None) -> str:
+        path = os.path.join(tmp_path, name)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for class_name, data in classes.items():
+                archive.writestr(f"{class_name}.class", data)
+            for resource, text in (resources or {}).items():
+                archive.writestr(resource, text)
+        return path
+
+    return write
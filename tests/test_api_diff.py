@@ -0,0 +1,52 @@
+import logging
+
+from benchmarks.synthetic import ClassShape, generate_class
+from xscripts.java.api_diff import ClassApi, diff_class, diff_jars, format_diff
+from xscripts.java.enums import MethodAccessFlags
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def test_diff_jars(jar):
+    shape = ClassShape(pool_size=32, fields=1, methods=3)
+    old = jar("old.jar", {
+        "app/Same": generate_class(shape, "app/Same"),
+        "app/Recompiled": generate_class(shape, "app/Recompiled"),
+        "app/Shrunk": generate_class(shape, "app/Shrunk"),
+        "app/Gone": generate_class(shape, "app/Gone"),
+        "app/Corrupt": generate_class(shape, "app/Corrupt"),
+    })
+    new = jar("new.jar", {
+        "app/Same": generate_class(shape, "app/Same"),
+        "app/Recompiled": generate_class(ClassShape(pool_size=32, fields=1, methods=3, code_size=128),
+                                         "app/Recompiled"),
+        "app/Shrunk": generate_class(ClassShape(pool_size=32, fields=1, methods=2), "app/Shrunk"),
+        "app/New": generate_class(shape, "app/New"),
+        "app/Corrupt": generate_class(shape, "app/Corrupt")[:40],
+    })
+
+    api_diff = diff_jars(old, new, jobs=2)
+    logger.info("Diff:\n%s", format_diff(api_diff))
+
+    assert [(diff.name, diff.status) for diff in api_diff.classes] == [
+        ("app/Corrupt", "failed"), ("app/Gone", "removed"), ("app/New", "added"), ("app/Shrunk", "changed")]
+    assert api_diff.unchanged == 2
+    assert [diff.name for diff in api_diff.failed] == ["app/Corrupt"]
+    shrunk = api_diff.classes[3]
+    assert [(member.kind, member.name, member.change) for member in shrunk.members] == [
+        ("method", "method2", "removed")]
+    assert [diff.name for diff in api_diff.breaking] == ["app/Gone", "app/Shrunk"]
+
+
+def test_diff_class_access_flags():
+    old = ClassApi("app/A", "java/lang/Object", 0x21, frozenset({"java/io/Serializable"}), {},
+                   {("run", "()V"): 0x0001, ("helper", "()V"): 0x0001})
+    new = ClassApi("app/A", "java/lang/Object", 0x31, frozenset(), {},
+                   {("run", "()V"): 0x0011, ("helper", "()V"): 0x0001})
+    assert old.fingerprint() != new.fingerprint()
+
+    diff = diff_class(old, new)
+    assert diff.removed_interfaces == ("java/io/Serializable",)
+    assert diff.members[0].new_flags == (MethodAccessFlags.PUBLIC, MethodAccessFlags.FINAL)
+    assert diff.members[0].change == "access changed" and diff.breaking
@@ -0,0 +1,116 @@
+import io
+import logging
+import os
+import zipfile
+
+from benchmarks.synthetic import ClassShape, generate_class
+from xscripts.java import classpath
+from xscripts.java.classpath import close_archives, iter_class_sources, open_archive
+from xscripts.java.classpath_index import ClasspathIndex, build_classpath_index
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def test_classpath_index(tmp_path):
+    shape = ClassShape(pool_size=32, fields=2, methods=3)
+    jar = os.path.join(tmp_path, "app.jar")
+    with zipfile.ZipFile(jar, "w") as archive:
+        for name in ("app/Main", "app/util/Strings", "app/Service", "Root"):
+            archive.writestr(f"{name}.class", generate_class(shape, name))
+    output = os.path.join(tmp_path, "classpath.idx")
+
+    assert build_classpath_index([jar, r"tests_resources"], output, jobs=2) == 6
+
+    with ClasspathIndex.open(output) as index:
+        logger.info("Index: %s", index)
+        assert len(index) == 6
+        assert index.package_classes("app") == ["app/Main", "app/Service"]
+        assert index.package_classes("") == ["Root"]
+        assert "com.zcsy.saasgateway.base.GatewayServer" in index and "app/Missing" not in index
+
+        main = index.find("app.Main")
+        assert (main.super_name, main.interfaces) == ("java/lang/Object", ("java/io/Serializable",))
+        assert [method.name for method in main.methods] == ["method0", "method1", "method2"]
+        assert main.fields[0].descriptor == "I" and main.major_version == 61
+        with zipfile.ZipFile(jar) as archive:
+            assert (main.path, main.entry, main.offset) == (jar, "app/Main.class",
+                                                            archive.getinfo("app/Main.class").header_offset)
+
+        gateway = index.find("com/zcsy/saasgateway/base/GatewayServer")
+        assert gateway.entry is None and len(gateway.fields) == 11
+        assert index.subtypes("java/io/Serializable") == ["Root", "app/Main", "app/Service", "app/util/Strings"]
+
+
+def test_multi_release_index(tmp_path):
+    jar = os.path.join(tmp_path, "mr.jar")
+    flat_jar = os.path.join(tmp_path, "flat.jar")
+    for path, manifest in ((jar, "Manifest-Version: 1.0\r\nMulti-Release: true\r\n\r\n"),
+                           (flat_jar, "Manifest-Version: 1.0\r\n\r\n")):
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("META-INF/MANIFEST.MF", manifest)
+            archive.writestr("app/Feature.class", generate_class(ClassShape(pool_size=32, fields=1), "app/Feature"))
+            for release, fields in ((11, 2), (21, 4), (17, 3)):
+                archive.writestr(f"META-INF/versions/{release}/app/Feature.class",
+                                 generate_class(ClassShape(pool_size=32, fields=fields), "app/Feature"))
+            archive.writestr("META-INF/versions/17/app/Only17.class",
+                             generate_class(ClassShape(pool_size=32), "app/Only17"))
+
+    def index(paths: list[str], release: int) -> ClasspathIndex:
+        output = os.path.join(tmp_path, f"release{release}.idx")
+        build_classpath_index(paths, output, release=release)
+        return ClasspathIndex.open(output)
+
+    with index([jar], 17) as release17:
+        feature = release17.find("app/Feature")
+        assert (len(feature.fields), feature.entry) == (3, "META-INF/versions/17/app/Feature.class")
+        assert release17.package_classes("app") == ["app/Feature", "app/Only17"]
+    with index([jar], 8) as release8, index([flat_jar], 21) as flat:
+        assert len(release8) == len(flat) == 1
+        assert release8.find("app/Feature").entry == flat.find("app/Feature").entry == "app/Feature.class"
+
+
+def test_nested_jars(tmp_path):
+    shape = ClassShape(pool_size=32)
+
+    def jar_bytes(entries: dict[str, bytes], compression: int = zipfile.ZIP_DEFLATED) -> bytes:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression) as archive:
+            for name, data in entries.items():
+                archive.writestr(name, data)
+        return buffer.getvalue()
+
+    inner = jar_bytes({"lib/inner/Deep.class": generate_class(shape, "lib/inner/Deep")})
+    dependency = jar_bytes({"lib/Dependency.class": generate_class(shape, "lib/Dependency"),
+                            "lib/inner.jar": inner}, zipfile.ZIP_STORED)
+    fat_jar = os.path.join(tmp_path, "app.jar")
+    with zipfile.ZipFile(fat_jar, "w") as archive:
+        archive.writestr("BOOT-INF/classes/app/Main.class", generate_class(shape, "app/Main"))
+        archive.writestr(zipfile.ZipInfo("BOOT-INF/lib/dependency.jar"), dependency, zipfile.ZIP_STORED)
+
+    assert [str(source) for source in iter_class_sources([fat_jar])] == [f"{fat_jar}!/BOOT-INF/classes/app/Main.class"]
+    sources = list(iter_class_sources([fat_jar], nested=True))
+    assert [source.entry_path for source in sources] == [
+        "BOOT-INF/classes/app/Main.class",
+        "BOOT-INF/lib/dependency.jar!/lib/Dependency.class",
+        "BOOT-INF/lib/dependency.jar!/lib/inner.jar!/lib/inner/Deep.class",
+    ]
+    assert sources[2].read() == generate_class(shape, "lib/inner/Deep")
+    mapped = list(classpath._NESTED_MAPS)
+    assert len(mapped) == 1 and not mapped[0].closed
+    close_archives()
+    assert mapped[0].closed and not classpath._NESTED_MAPS
+    assert sources[1].read() == generate_class(shape, "lib/Dependency")
+
+    output = os.path.join(tmp_path, "nested.idx")
+    assert build_classpath_index([fat_jar], output, jobs=2, nested=True) == 3
+    with ClasspathIndex.open(output) as index:
+        dependency_class = index.find("lib/Dependency")
+        assert dependency_class.entry == "BOOT-INF/lib/dependency.jar!/lib/Dependency.class"
+        assert dependency_class.offset == 0 and len(dependency_class.methods) == shape.methods
+        assert "lib/inner/Deep" in index
+
+    archive = open_archive(fat_jar)
+    assert build_classpath_index([fat_jar], output, nested=True) == 3
+    assert archive.fp is None and not classpath._ARCHIVES and not classpath._NESTED_MAPS
+    assert open_archive.cache_info().currsize == 0
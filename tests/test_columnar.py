@@ -0,0 +1,47 @@
+import logging
+import os
+
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.columnar import scan_class_columns
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+CLASS_FILES = [
+    r"tests_resources/DefaultPileConfigurationService.class",
+    r"tests_resources/GatewayServer.class",
+]
+
+
+def test_scan_class_columns():
+    expected = {}
+    for class_file in CLASS_FILES:
+        java_class = JavaClass(JavaClassDumpPipeline(class_file).run())
+        expected[java_class.get_class_name()] = (java_class.get_super_class_name(), java_class.get_major_version(),
+                                                 java_class.get_methods_count())
+
+    rows = 0
+    for block in scan_class_columns(CLASS_FILES * 3, jobs=2, batch_size=4):
+        with block:
+            logger.info("Block: %s", block)
+            for row in range(len(block)):
+                assert expected[block.class_name(row)] == (block.super_class_name(row),
+                                                           block.column("major_version")[row],
+                                                           block.column("methods_count")[row])
+            rows += len(block)
+
+    assert rows == len(CLASS_FILES) * 3
+
+
+def test_scan_skips_malformed_classes(tmp_path):
+    broken = os.path.join(tmp_path, "Broken.class")
+    with open(broken, "wb") as broken_file:
+        broken_file.write(b"\xca\xfe\xba\xbe\x00\x00\x00\x41\x00\x10garbage")
+
+    for jobs in (1, 2):
+        names = []
+        for block in scan_class_columns([CLASS_FILES[0], broken, CLASS_FILES[1]], jobs=jobs, batch_size=2):
+            with block:
+                names.extend(block.class_name(row) for row in range(len(block)))
+        assert sorted(names) == ["com/zcsy/saasgateway/base/GatewayServer",
+                                 "com/zcsy/saasgateway/base/service/DefaultPileConfigurationService"]
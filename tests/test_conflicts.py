@@ -0,0 +1,46 @@
+import logging
+
+from benchmarks.synthetic import ClassShape, generate_class
+from xscripts.java.conflicts import detect_conflicts, format_report
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def test_detect_conflicts(jar):
+    shape = ClassShape(pool_size=32, fields=1, methods=2)
+    first = jar("first.jar", {
+        "app/Same": generate_class(shape, "app/Same"),
+        "app/Debug": generate_class(shape, "app/Debug"),
+        "app/Changed": generate_class(shape, "app/Changed"),
+        "app/Unique": generate_class(shape, "app/Unique"),
+    })
+    second = jar("second.jar", {
+        "app/Same": generate_class(shape, "app/Same"),
+        "app/Debug": generate_class(ClassShape(pool_size=32, fields=1, methods=2, attributes=frozenset()),
+                                    "app/Debug"),
+        "app/Changed": generate_class(ClassShape(pool_size=32, fields=1, methods=3), "app/Changed"),
+        "lib/Other": generate_class(shape, "lib/Other"),
+    })
+
+    report = detect_conflicts([second, first], jobs=2)
+    logger.info("Report:\n%s", format_report(report))
+
+    conflicts = {conflict.name: conflict for conflict in report.conflicts}
+    assert sorted(conflicts) == ["app/Changed", "app/Debug", "app/Same"]
+    assert all(conflict.winner == second for conflict in report.conflicts)
+    assert conflicts["app/Same"].identical and conflicts["app/Same"].structurally_different is None
+    assert conflicts["app/Debug"].structurally_different is False
+    assert conflicts["app/Changed"].structurally_different is True
+    assert [conflict.name for conflict in report.differing] == ["app/Changed", "app/Debug"]
+    assert report.split_packages == {"app": (second, first)}
+
+
+def test_conflicts_with_malformed_copy(jar):
+    shape = ClassShape(pool_size=32, fields=1, methods=2)
+    first = jar("first.jar", {"app/Broken": generate_class(shape, "app/Broken")})
+    second = jar("second.jar", {"app/Broken": b"\xca\xfe\xba\xbe"})
+    for jobs in (1, 2):
+        report = detect_conflicts([first, second], jobs=jobs)
+        assert [(conflict.name, conflict.structurally_different) for conflict in report.conflicts] == [
+            ("app/Broken", None)]
@@ -0,0 +1,46 @@
+import io
+import logging
+
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.dependencies import DependencyGraph, build_dependency_graph, class_dependencies
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def test_class_dependencies():
+    java_class = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run())
+    dependencies = class_dependencies(java_class)
+    assert java_class.get_class_name() not in dependencies
+    # From a method descriptor only, never a class entry of the pool.
+    assert "java/net/SocketAddress" in dependencies
+    assert "io/netty/bootstrap/ServerBootstrap" in dependencies
+    assert "attributes" not in vars(java_class)
+
+
+def test_dependency_graph():
+    graph = DependencyGraph()
+    graph.add("a/A", ["b/B", "a/A2"])
+    graph.add("a/A2", ["c/C"])
+    graph.add("b/B", ["c/C"])
+    graph.add("c/C", ["a/A"])
+    graph.add("d/D", ["c/C"])
+
+    assert graph.cycles() == [["a/A", "a/A2", "b/B", "c/C"]]
+    packages = graph.packages()
+    assert packages.cycles() == [["a", "b", "c"]]
+    assert sorted(packages.iter_edges()) == [("a", "b", 1), ("a", "c", 1), ("b", "c", 1), ("c", "a", 1),
+                                             ("d", "c", 1)]
+
+    output = io.StringIO()
+    packages.to_csv(output)
+    assert output.getvalue().splitlines()[0] == "source,target,weight"
+    output = io.StringIO()
+    packages.to_dot(output)
+    assert '"d" -> "c" [weight=1];' in output.getvalue()
+
+
+def test_build_dependency_graph():
+    graph = build_dependency_graph([r"tests_resources"], jobs=2, ignore=("java/",)).packages()
+    assert "com/zcsy/saasgateway/base" in graph.names
+    assert not any(name.startswith("java/") for name in graph.names)
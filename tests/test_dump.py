@@ -0,0 +1,32 @@
+import json
+import logging
+
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.dump import DumpOptions, class_record, iter_ndjson
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def test_class_record_decodes_only_selected_sections():
+    java_class = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run())
+
+    record = class_record(java_class, DumpOptions(methods=True))
+
+    assert record["class"] == "com/zcsy/saasgateway/base/GatewayServer"
+    assert len(record["methods"]) == java_class.get_methods_count()
+    assert "fields" not in record and "attributes" not in record
+    assert "fields" not in vars(java_class) and "attributes" not in vars(java_class)
+
+
+def test_iter_ndjson():
+    lines = list(iter_ndjson([r"tests_resources"], jobs=2, options=DumpOptions(fields=True, attributes=True)))
+
+    for line in lines:
+        logger.info("Record: %s", line)
+    records = sorted((json.loads(line) for line in lines), key=lambda record: record["source"])
+    assert [record["class"] for record in records] == [
+        "com/zcsy/saasgateway/base/service/DefaultPileConfigurationService",
+        "com/zcsy/saasgateway/base/GatewayServer",
+    ]
+    assert records[1]["attributes"] == ["SourceFile", "InnerClasses", "BootstrapMethods"]
@@ -0,0 +1,67 @@
+import logging
+import os
+import tracemalloc
+import zipfile
+
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.classpath_index import build_classpath_index
+from xscripts.java.instrumentation import Instrumentation
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+CLASS_FILES = [
+    r"tests_resources/DefaultPileConfigurationService.class",
+    r"tests_resources/GatewayServer.class",
+]
+
+
+def test_instrumentation_aggregates_stages():
+    instrumentation = Instrumentation(trace_memory=True)
+
+    for class_file in CLASS_FILES:
+        java_class = JavaClass(JavaClassDumpPipeline(class_file, instrumentation).run(), instrumentation)
+        java_class.get_interfaces()
+        for member in (*java_class.get_fields(), *java_class.get_methods()):
+            member.attributes
+        java_class.get_attributes()
+
+    tracemalloc.stop()
+
+    logger.info("Report:\n%s", instrumentation.format_report())
+    report = instrumentation.report()
+    assert set(report) == {"chunk_constant_pool", "chunk_fields", "chunk_methods", "chunk_attributes",
+                           "constant_pool", "utf8_decode", "interfaces", "fields", "methods", "class_attributes",
+                           "field_attributes", "method_attributes"}
+    assert report["constant_pool"]["calls"] == len(CLASS_FILES)
+    assert report["methods"]["objects"] == report["method_attributes"]["calls"] == 18
+    assert report["chunk_constant_pool"]["bytes"] == report["constant_pool"]["bytes"] > 0
+
+    merged = Instrumentation()
+    merged.merge(instrumentation)
+    merged.merge(instrumentation)
+    assert merged.report()["fields"]["objects"] == 2 * report["fields"]["objects"]
+
+
+def test_java_class_without_instrumentation():
+    java_class = JavaClass(JavaClassDumpPipeline(CLASS_FILES[0]).run())
+
+    assert java_class.instrumentation is None
+    assert all(member.attributes is not None for member in java_class.get_methods())
+
+
+def test_scan_instrumentation(tmp_path):
+    jar = os.path.join(tmp_path, "app.jar")
+    with zipfile.ZipFile(jar, "w") as archive:
+        for class_file in CLASS_FILES:
+            archive.write(class_file, f"app/{os.path.basename(class_file)}")
+
+    reports = []
+    for jobs in (1, 2):
+        instrumentation = Instrumentation()
+        build_classpath_index([jar], os.path.join(tmp_path, f"classes{jobs}.idx"), jobs=jobs,
+                              instrumentation=instrumentation)
+        reports.append(instrumentation.report())
+    serial, parallel = reports
+    assert serial["chunk_constant_pool"]["calls"] == parallel["chunk_constant_pool"]["calls"] == len(CLASS_FILES)
+    assert serial["fields"]["objects"] == parallel["fields"]["objects"] == 13
@@ -0,0 +1,31 @@
+import logging
+import struct
+
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.attributes import BootstrapMethodsAttributeInfo
+from xscripts.java.constant_pool import ReferenceKind
+from xscripts.java.invokedynamic import index_invokedynamic
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def test_bootstrap_methods():
+    methods = [(i, tuple(range(i % 5))) for i in range(3000)]
+    body = struct.pack(">H", len(methods)) + b"".join(
+        struct.pack(f">HH{len(arguments)}H", ref, len(arguments), *arguments) for ref, arguments in methods)
+    attribute = BootstrapMethodsAttributeInfo(struct.pack(">HI", 1, len(body)) + body)
+    assert [(method.bootstrap_method_ref, method.bootstrap_arguments) for method in attribute.bootstrap_methods] \
+           == methods
+
+
+def test_index_invokedynamic():
+    java_class = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run())
+    sites = index_invokedynamic(java_class)
+    assert sorted(sites) == [65, 87]
+    site = sites[65]
+    assert site.is_lambda and site.name == "operationComplete"
+    assert site.bootstrap_method.name == "metafactory"
+    assert site.implementation.reference_kind == ReferenceKind.INVOKE_SPECIAL
+    assert (site.implementation.owner, site.implementation.name) == (java_class.get_class_name(), "lambda$start$1")
+    assert sites[87].implementation.name == "lambda$null$0"
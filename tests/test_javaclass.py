@@ -1,6 +1,15 @@
+import gc
 import logging
+import weakref
+
+import pytest
 
 from xscripts.java import JavaClassDumpPipeline, JavaClass
+from xscripts.java.attributes import AttributeContext, AttributeFactory, AttributeRegistry, DecodePolicy, \
+    RawAttributeInfo, SourceFileAttributeInfo
+from xscripts.java.attributes.policy import DECODE_NONE
+from xscripts.java.constant_pool import ClassConstantPoolInfo, ConstantPool, FieldrefConstantPoolInfo, \
+    MethodrefConstantPoolInfo, NameAndTypeConstantPoolInfo, Utf8ConstantPoolInfo
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -55,3 +64,137 @@ def test_java_class_dump_pipeline():
     # for attribute in java_clss.get_attributes():
     #     logger.info("Attribute: %s", attribute)
     # logger.info("----------- Attribute info ends -----------")
+
+
+def test_attribute_registry_dispatch():
+    java_clss = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run())
+    registry = AttributeRegistry.standard()
+
+    class VendorSourceFileAttributeInfo(SourceFileAttributeInfo):
+        pass
+
+    registry.register("SourceFile", VendorSourceFileAttributeInfo, [AttributeContext.CLASS_FILE])
+    factory = AttributeFactory(java_clss.constant_pool, registry)
+    attributes = factory.load_class_file_attributes(java_clss.get_attributes_count(),
+                                                    java_clss.chunked_java_class.attributes_info_segment)
+    assert isinstance(attributes[0], VendorSourceFileAttributeInfo)
+    assert [type(attribute) for attribute in attributes[1:]] == [type(attribute) for attribute in
+                                                                 java_clss.get_attributes()[1:]]
+
+    registry.unregister("SourceFile")
+    attributes = factory.load_class_file_attributes(java_clss.get_attributes_count(),
+                                                    java_clss.chunked_java_class.attributes_info_segment)
+    assert isinstance(attributes[0], RawAttributeInfo) and not attributes[0].is_decodable()
+
+    factory = AttributeFactory(java_clss.constant_pool, registry, DecodePolicy(strict=True))
+    with pytest.raises(ValueError, match="Unsupported ClassFile attribute type: SourceFile"):
+        factory.load_class_file_attributes(java_clss.get_attributes_count(),
+                                           java_clss.chunked_java_class.attributes_info_segment)
+
+
+def test_decode_policy():
+    java_clss = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run(),
+                          decode_policy=DecodePolicy.only("SourceFile"))
+    attributes = java_clss.get_attributes()
+    assert isinstance(attributes[0], SourceFileAttributeInfo)
+    assert all(isinstance(attribute, RawAttributeInfo) for attribute in attributes[1:])
+    assert [attribute.attribute_name for attribute in attributes[1:]] == ["InnerClasses", "BootstrapMethods"]
+
+    eager = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run()).get_attributes()
+    for raw, decoded in zip(attributes[1:], eager[1:]):
+        assert type(raw.decoded) is type(decoded)
+        assert raw.decoded.raw == decoded.raw
+
+    for method in java_clss.get_methods():
+        assert all(isinstance(attribute, RawAttributeInfo) for attribute in method.attributes)
+
+
+def test_resolve_member_refs():
+    java_clss = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run())
+    constant_pool = java_clss.constant_pool
+    refs = constant_pool.resolve_all_refs()
+    assert refs[253] == ("java/lang/invoke/LambdaMetafactory", "metafactory", refs[253].descriptor)
+    assert refs[253] is constant_pool.resolve_member_ref(253)
+    assert refs[254].owner is None and refs[254].descriptor.startswith("(")
+    for index, ref in refs.items():
+        info = constant_pool.get(index)
+        if hasattr(info, "class_index"):
+            class_info = constant_pool.get_class_constant_pool_info(info.class_index)
+            assert ref.owner == constant_pool.get_utf8_constant_pool_info(class_info.name_index).string
+    with pytest.raises(TypeError):
+        constant_pool.resolve_member_ref(java_clss.this_class)
+
+
+def test_lazy_sections():
+    java_clss = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run())
+    assert set(vars(java_clss)) == {"chunked_java_class", "instrumentation", "decode_policy"}
+
+    java_clss.get_class_name()
+    assert {"constant_pool", "this_class"} <= vars(java_clss).keys()
+    assert not {"interfaces", "fields", "methods", "attributes"} & vars(java_clss).keys()
+
+    assert tuple(java_clss.get_interfaces()) == ()
+    for section, getter, count in (("fields", java_clss.get_fields, 11), ("methods", java_clss.get_methods, 8),
+                                   ("attributes", java_clss.get_attributes, 3)):
+        assert section not in vars(java_clss)
+        assert len(getter()) == count
+        assert section in vars(java_clss)
+
+
+def test_reverse_lookup():
+    java_clss = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run())
+    constant_pool = java_clss.constant_pool
+
+    assert constant_pool.find_class(java_clss.get_class_name()) == java_clss.this_class
+    assert constant_pool.find_class("no/such/Class") is None
+    for index, info in constant_pool.pool.items():
+        if isinstance(info, Utf8ConstantPoolInfo):
+            assert constant_pool.get(constant_pool.find_utf8(info.string)).string == info.string
+            assert constant_pool.find_utf8(info.bytes) == constant_pool.find_utf8(info.string)
+
+    for index, ref in constant_pool.resolve_all_refs().items():
+        info = constant_pool.get(index)
+        if isinstance(info, (FieldrefConstantPoolInfo, MethodrefConstantPoolInfo)):
+            assert constant_pool.find_member_ref(*ref) == index
+            assert constant_pool.find_member_ref(*ref, kind=type(info)) == index
+            assert constant_pool.find_name_and_type(ref.name, ref.descriptor) == info.name_and_type_index
+    assert constant_pool.find_member_ref("java/lang/Object", "nothing", "()V") is None
+    with pytest.raises(TypeError):
+        constant_pool.find_member_ref("java/lang/Object", "<init>", "()V", kind=Utf8ConstantPoolInfo)
+
+    # Entries may reference any of several equal Utf8 (or Class) entries, and must still be found.
+    duplicated = ConstantPool([
+        Utf8ConstantPoolInfo(b"\x01\x00\x03a/A"), Utf8ConstantPoolInfo(b"\x01\x00\x03a/A"),
+        ClassConstantPoolInfo(b"\x07\x00\x02"), Utf8ConstantPoolInfo(b"\x01\x00\x01m"),
+        Utf8ConstantPoolInfo(b"\x01\x00\x03()V"), Utf8ConstantPoolInfo(b"\x01\x00\x01m"),
+        NameAndTypeConstantPoolInfo(b"\x0c\x00\x06\x00\x05"), ClassConstantPoolInfo(b"\x07\x00\x01"),
+        MethodrefConstantPoolInfo(b"\x0a\x00\x08\x00\x07"),
+    ])
+    assert duplicated.find_utf8("a/A") == 1
+    assert duplicated.find_class("a/A") == 3
+    assert duplicated.find_name_and_type("m", "()V") == 7
+    assert duplicated.find_member_ref("a/A", "m", "()V") == 9
+
+
+def test_attribute_factory_lifetime():
+    chunk = JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run()
+    java_clss = JavaClass(chunk)
+    java_clss.get_attributes()
+    pool = weakref.ref(java_clss.constant_pool)
+    factory = weakref.ref(AttributeFactory.of(java_clss.constant_pool))
+
+    del java_clss
+    gc.collect()
+    assert pool() is None and factory() is None
+
+
+def test_decode_policy_binding():
+    java_clss = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run(), decode_policy=DECODE_NONE)
+    factory = java_clss.attribute_factory
+    assert factory.policy is DECODE_NONE
+    assert all(isinstance(attribute, RawAttributeInfo) for attribute in java_clss.get_attributes())
+    assert all(isinstance(attribute, RawAttributeInfo)
+               for method in java_clss.get_methods() for attribute in method.attributes)
+    assert AttributeFactory.of(java_clss.constant_pool) is factory
+    with pytest.raises(ValueError):
+        AttributeFactory.of(java_clss.constant_pool, DecodePolicy.only("Code"))
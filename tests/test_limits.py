@@ -0,0 +1,77 @@
+import io
+import logging
+import os
+import struct
+import zipfile
+
+import pytest
+
+from benchmarks.synthetic import ClassShape, generate_class
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.attributes import RuntimeVisibleAnnotationsAttributeInfo
+from xscripts.java.classpath import iter_class_sources
+from xscripts.java.errors import ClassFormatError, LimitExceededError, TruncatedClassError
+from xscripts.java.limits import UNTRUSTED, ParseLimits
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def _dump(data: bytes, limits: ParseLimits = UNTRUSTED):
+    return JavaClassDumpPipeline.dump(io.BytesIO(data), limits=limits)
+
+
+def test_hardened_class_parsing():
+    data = generate_class(ClassShape(pool_size=64, annotation_depth=6))
+    chunk = _dump(data)
+    assert chunk == JavaClassDumpPipeline.dump(io.BytesIO(data))
+
+    with pytest.raises(TruncatedClassError):
+        _dump(data[:len(data) // 2])
+    with pytest.raises(ClassFormatError, match="Bad magic"):
+        _dump(b"\x00" + data[1:])
+    # A full constant pool of UTF-8 entries claiming 64 KiB each: fails on the first bogus length.
+    with pytest.raises(TruncatedClassError):
+        _dump(struct.pack(">IHHH", 0xCAFEBABE, 0, 61, 65535) + b"\x01\xff\xff" * 16)
+    with pytest.raises(ClassFormatError):
+        _dump(struct.pack(">IHHHB", 0xCAFEBABE, 0, 61, 2, 0xEE))
+
+    with pytest.raises(LimitExceededError) as error:
+        _dump(data, ParseLimits(max_constant_pool_entries=32))
+    assert (error.value.limit, error.value.value) == ("max_constant_pool_entries", 64)
+    with pytest.raises(LimitExceededError, match="max_class_bytes"):
+        _dump(data, ParseLimits(max_class_bytes=len(data) - 1))
+    with pytest.raises(LimitExceededError, match="max_attribute_length"):
+        _dump(data, ParseLimits(max_attribute_length=16))
+
+    limits = ParseLimits(max_annotation_depth=4)
+    java_class = JavaClass(chunk, decode_policy=limits.decode_policy())
+    annotations = next(attribute for attribute in java_class.get_attributes()
+                       if isinstance(attribute, RuntimeVisibleAnnotationsAttributeInfo))
+    with pytest.raises(LimitExceededError, match="max_annotation_depth") as excinfo:
+        annotations.annotations
+    assert excinfo.value.limit == "max_annotation_depth"
+
+
+def test_archive_limits(tmp_path):
+    shape = ClassShape(pool_size=32)
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, "w") as archive:
+        archive.writestr("lib/Inner.class", generate_class(shape, "lib/Inner"))
+    jar = os.path.join(tmp_path, "app.jar")
+    with zipfile.ZipFile(jar, "w") as archive:
+        for i in range(3):
+            archive.writestr(f"app/Main{i}.class", generate_class(shape, f"app/Main{i}"))
+        archive.writestr("BOOT-INF/lib/inner.jar", inner.getvalue())
+
+    sources = list(iter_class_sources([jar], nested=True, limits=UNTRUSTED))
+    assert len(sources) == 4
+    assert JavaClass(sources[3].load(UNTRUSTED)).get_class_name() == "lib/Inner"
+    with pytest.raises(LimitExceededError, match="max_archive_entries"):
+        list(iter_class_sources([jar], limits=ParseLimits(max_archive_entries=3)))
+    with pytest.raises(LimitExceededError, match="max_nesting_depth"):
+        list(iter_class_sources([jar], nested=True, limits=ParseLimits(max_nesting_depth=0)))
+    with pytest.raises(LimitExceededError, match="max_total_bytes"):
+        list(iter_class_sources([jar, jar], limits=ParseLimits(max_total_bytes=len(generate_class(shape)) * 4)))
+    with pytest.raises(LimitExceededError, match="max_class_bytes"):
+        sources[0].load(ParseLimits(max_class_bytes=64))
@@ -0,0 +1,67 @@
+import logging
+import os
+import zipfile
+
+from benchmarks.synthetic import generate_module_info
+from xscripts.java.enums import RequiresFlags
+from xscripts.java.modules import ModuleProblem, resolve_module_path
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+MANDATED, TRANSITIVE, STATIC = RequiresFlags.MANDATED, RequiresFlags.TRANSITIVE, RequiresFlags.STATIC_PHASE
+
+
+def _modular_jar(directory: str, name: str, **descriptor) -> str:
+    jar = os.path.join(directory, f"{name}.jar")
+    with zipfile.ZipFile(jar, "w") as archive:
+        archive.writestr("module-info.class", generate_module_info(name, **descriptor))
+    return jar
+
+
+def test_module_graph(tmp_path):
+    module_path = os.path.join(tmp_path, "mods")
+    os.mkdir(module_path)
+    _modular_jar(module_path, "java.base", requires=(), exports=(("java/lang", ()),), packages=("java/lang",))
+    _modular_jar(module_path, "lib.api", requires=(("java.base", MANDATED), ("lib.util", TRANSITIVE)),
+                 exports=(("lib/api", ()), ("lib/internal", ("app.main", "tool.gone"))), packages=("lib/api",))
+    _modular_jar(module_path, "lib.util", requires=(("java.base", MANDATED), ("lib.log", TRANSITIVE)),
+                 packages=("lib/util",))
+    _modular_jar(module_path, "lib.log", requires=(("java.base", MANDATED), ("lib.missing", 0)),
+                 packages=("lib/log",))
+    _modular_jar(module_path, "app.main", requires=(("java.base", MANDATED), ("lib.api", 0), ("lib.opt", STATIC)),
+                 packages=("app/main", "lib/util"), version="1.2")
+    _modular_jar(module_path, "cycle.a", requires=(("cycle.b", 0),))
+    _modular_jar(module_path, "cycle.b", requires=(("cycle.a", 0),))
+    with zipfile.ZipFile(os.path.join(module_path, "plain.jar"), "w") as archive:
+        archive.writestr("plain/Main.class", b"")
+
+    graph = resolve_module_path([module_path], jobs=2)
+    assert len(graph) == 7 and "plain" not in graph
+    app = graph.descriptors[graph.ids["app.main"]]
+    assert app.version == "1.2" and app.requires[2] == ("lib.opt", STATIC)
+
+    # Readability follows requires transitive through lib.api to lib.util and on to lib.log.
+    assert graph.reads("app.main") == ("java.base", "lib.api", "lib.log", "lib.util")
+    assert graph.reads("lib.log") == ("java.base",)
+    assert graph.closure(["app.main"]) == ("app.main", "java.base", "lib.api", "lib.log", "lib.util")
+
+    problems = graph.validate(["app.main"])
+    for problem in problems:
+        logger.info("Problem: %s", problem)
+    assert problems == [
+        ModuleProblem("lib.api", "unknown package", "exports lib/internal which is not in ModulePackages"),
+        ModuleProblem("lib.api", "unknown target", "exports lib/internal to tool.gone"),
+        ModuleProblem("lib.log", "missing", "requires lib.missing"),
+        ModuleProblem("app.main", "split package", "lib/util is also in lib.util"),
+    ]
+    assert ModuleProblem("cycle.a", "cycle", "cycle.a -> cycle.b") in graph.validate()
+
+
+def test_module_path_skips_malformed_descriptors(tmp_path):
+    _modular_jar(tmp_path, "java.base", requires=(), exports=(("java/lang", ()),), packages=("java/lang",))
+    with zipfile.ZipFile(os.path.join(tmp_path, "broken.jar"), "w") as archive:
+        archive.writestr("module-info.class", b"\xca\xfe\xba\xbe")
+    for jobs in (1, 2):
+        graph = resolve_module_path([str(tmp_path)], jobs=jobs)
+        assert list(graph.ids) == ["java.base"]
@@ -0,0 +1,52 @@
+import logging
+import os
+import struct
+import zipfile
+
+from benchmarks.synthetic import ClassShape, generate_class
+from xscripts.java.bytecode import Opcode, iter_instructions, opcode_stream
+from xscripts.java.opcode_stats import collect_opcode_stats, format_stats
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def test_opcode_stream():
+    code = bytes([Opcode.NOP, Opcode.TABLESWITCH, 0, 0]) + struct.pack(">iiiii", 0, 0, 1, 0, 0) \
+        + bytes([Opcode.WIDE, Opcode.IINC, 0, 1, 0, 1]) \
+        + bytes([Opcode.LOOKUPSWITCH, 0]) + struct.pack(">iiii", 0, 1, 5, 0) + bytes([Opcode.RETURN])
+    assert [pc for pc, _ in iter_instructions(code)] == [0, 1, 24, 30, 48]
+    assert opcode_stream(code) == bytes([Opcode.NOP, Opcode.TABLESWITCH, Opcode.WIDE, Opcode.LOOKUPSWITCH,
+                                         Opcode.RETURN])
+
+
+def test_collect_opcode_stats(tmp_path):
+    for i in range(3):
+        with open(os.path.join(tmp_path, f"Synthetic{i}.class"), "wb") as class_file:
+            class_file.write(generate_class(ClassShape(methods=4, code_size=13), f"bench/Synthetic{i}"))
+
+    stats = collect_opcode_stats([str(tmp_path), r"tests_resources"], by="package", jobs=2, batch_size=2)
+    logger.info("Stats:\n%s", format_stats(stats))
+
+    bench = stats["bench"]
+    assert (bench.classes, bench.methods) == (3, 12)
+    assert bench.top(3) == [("pop", 36), ("getstatic", 36), ("return", 12)]
+    assert bench.reflection == bench.boxing == bench.monitorenter == 0
+    assert stats["com/zcsy/saasgateway/base"].boxing == 3
+
+
+def test_group_by_classpath_element(tmp_path):
+    shape = ClassShape(methods=2, code_size=13)
+    classes = os.path.join(tmp_path, "classes")
+    os.makedirs(os.path.join(classes, "app"))
+    for i in range(2):
+        with open(os.path.join(classes, "app", f"Loose{i}.class"), "wb") as class_file:
+            class_file.write(generate_class(shape, f"app/Loose{i}"))
+    jar = os.path.join(tmp_path, "lib.jar")
+    with zipfile.ZipFile(jar, "w") as archive:
+        for i in range(3):
+            archive.writestr(f"lib/Packed{i}.class", generate_class(shape, f"lib/Packed{i}"))
+
+    for jobs in (1, 2):
+        stats = collect_opcode_stats([classes, jar], by="jar", jobs=jobs, batch_size=2)
+        assert {key: value.classes for key, value in stats.items()} == {classes: 2, jar: 3}
@@ -0,0 +1,36 @@
+import logging
+import random
+from array import array
+
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.pc_index import Handler, IntervalIndex
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def test_interval_index():
+    rng = random.Random(42)
+    intervals = [(start, start + rng.choice((0, 1, 5, 50, 400))) for start in
+                 (rng.randrange(1000) for _ in range(2000))]
+    index = IntervalIndex(array("I", (start for start, _ in intervals)), array("I", (end for _, end in intervals)))
+    for point in range(0, 1500, 7):
+        assert sorted(index.stab(point)) == [row for row, (start, end) in enumerate(intervals) if start <= point < end]
+    assert IntervalIndex(array("I"), array("I")).stab(0) == []
+
+
+def test_pc_index():
+    java_class = JavaClass(JavaClassDumpPipeline(r"tests_resources/GatewayServer.class").run())
+    constant_pool = java_class.constant_pool
+    stop = java_class.get_methods()[3]
+
+    def names(pc: int) -> list[str]:
+        return [constant_pool.get_utf8_constant_pool_info(local.name_index).string
+                for local in stop.pc_index.live_locals(pc)]
+
+    assert names(0) == ["this"]
+    assert names(60) == ["this", "workerShutdownFuture", "ioShutdownFuture"]
+    assert [local.index for local in stop.pc_index.live_local_types(60)] == [1, 2]
+    assert stop.pc_index.handlers(20) == [Handler(10, 84, 97, 77), Handler(10, 84, 127, 0)]
+    assert stop.pc_index.handlers(100) == [Handler(97, 114, 127, 0)]
+    assert stop.pc_index.handlers(84) == stop.pc_index.handlers(5) == []
@@ -0,0 +1,33 @@
+import logging
+
+from benchmarks.synthetic import ClassShape, generate_class
+from xscripts.java.reachability import analyze_reachability
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def test_analyze_reachability(jar):
+    small = ClassShape(pool_size=32, fields=1, methods=1)
+    # With this pool size the synthetic class refers to bench/Dependency2, among others.
+    app = jar("app.jar", {"app/Main": generate_class(ClassShape(pool_size=80, fields=1, methods=1), "app/Main")},
+              {"META-INF/services/app.Plugin": "# providers\nsvc.Provider\n"})
+    lib = jar("lib.jar", {name: generate_class(small, name) for name in ("bench/Dependency2", "bench/Dependency3")})
+    provider = jar("provider.jar", {"svc/Provider": generate_class(small, "svc/Provider")})
+    unused = jar("unused.jar", {"other/Unused": generate_class(small, "other/Unused")})
+
+    report = analyze_reachability([app, lib, provider, unused], entry_points=["app.Main"], jobs=2)
+    logger.info("Report: %s", report)
+
+    assert sorted(report.entry_points) == ["app/Main", "svc/Provider"]
+    assert report.reachable == ("app/Main", "bench/Dependency2", "svc/Provider")
+    assert report.unreachable == ("bench/Dependency3", "other/Unused")
+    assert report.unused_paths == (unused,)
+
+
+def test_reachability_skips_malformed_classes(jar):
+    app = jar("app.jar", {"app/Main": generate_class(ClassShape(pool_size=32, fields=1, methods=1), "app/Main"),
+                          "app/Broken": b"\xca\xfe\xba\xbe"})
+    for jobs in (1, 2):
+        report = analyze_reachability([app], entry_points=["app.Main"], jobs=jobs)
+        assert report.reachable == ("app/Main",) and report.unreachable == ()
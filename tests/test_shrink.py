@@ -0,0 +1,96 @@
+import io
+import logging
+import os
+import zipfile
+
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.classpath import open_archive
+from xscripts.java.shrink import DATA_DESCRIPTOR_FLAG, DEBUG_ATTRIBUTES, shrink_jars
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+CLASS_FILES = [
+    r"tests_resources/DefaultPileConfigurationService.class",
+    r"tests_resources/GatewayServer.class",
+]
+
+
+def attribute_names(data: bytes) -> set[str]:
+    java_class = JavaClass(JavaClassDumpPipeline.dump(io.BytesIO(data)))
+    constant_pool = java_class.constant_pool
+    names = {constant_pool.get_utf8_constant_pool_info(attribute.attribute_name_index).string
+             for attribute in java_class.get_attributes()}
+    for method in java_class.get_methods():
+        names.update(constant_pool.get_utf8_constant_pool_info(attribute.attribute_name_index).string
+                     for attribute in method.code_attributes)
+    return names
+
+
+class UnseekableWriter:
+    """ A write-only stream without tell(), so ZipFile writes sizes and CRCs into data descriptors. """
+
+    def __init__(self, stream) -> None:
+        self.stream = stream
+
+    def write(self, data) -> int:
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def test_shrink_jars(tmp_path):
+    jar = os.path.join(tmp_path, "app.jar")
+    with zipfile.ZipFile(jar, "w") as archive:
+        archive.writestr("META-INF/MANIFEST.MF", "Manifest-Version: 1.0\r\n\r\n", zipfile.ZIP_DEFLATED)
+        for class_file in CLASS_FILES:
+            with open(class_file, "rb") as stream:
+                archive.writestr(f"app/{os.path.basename(class_file)}", stream.read(), zipfile.ZIP_DEFLATED)
+        archive.writestr("app/broken.class", b"\xca\xfe\xba\xbe", zipfile.ZIP_STORED)
+        archive.writestr("app/messages.properties", "greeting=hello\n" * 100, zipfile.ZIP_DEFLATED)
+
+    serial = shrink_jars([jar], os.path.join(tmp_path, "serial"))[0]
+    assert open_archive.cache_info().currsize == 0
+    parallel = shrink_jars([jar], os.path.join(tmp_path, "parallel"), jobs=2)[0]
+    logger.info("Report: %s", serial)
+
+    assert (serial.classes, serial.failed) == (3, 1)
+    assert 0 < serial.saved == parallel.saved and serial.class_bytes_after < serial.class_bytes_before
+    with open(serial.output, "rb") as serial_file, open(parallel.output, "rb") as parallel_file:
+        assert serial_file.read() == parallel_file.read()
+
+    with zipfile.ZipFile(jar) as original, zipfile.ZipFile(serial.output) as shrunk:
+        assert shrunk.testzip() is None
+        assert shrunk.namelist() == original.namelist()
+        for info in original.infolist():
+            if not info.filename.endswith(".class") or info.filename == "app/broken.class":
+                shrunk_info = shrunk.getinfo(info.filename)
+                assert (shrunk_info.CRC, shrunk_info.compress_size, shrunk_info.date_time) == \
+                       (info.CRC, info.compress_size, info.date_time)
+            else:
+                assert "LineNumberTable" in attribute_names(original.read(info))
+                assert not DEBUG_ATTRIBUTES & attribute_names(shrunk.read(info.filename))
+
+
+def test_shrink_streamed_jar(tmp_path):
+    jar = os.path.join(tmp_path, "streamed.jar")
+    with open(jar, "wb") as jar_file, zipfile.ZipFile(UnseekableWriter(jar_file), "w") as archive:
+        for class_file in CLASS_FILES:
+            with open(class_file, "rb") as stream, \
+                    archive.open(f"app/{os.path.basename(class_file)}", "w") as entry:
+                entry.write(stream.read())
+        with archive.open("app/broken.class", "w") as entry:
+            entry.write(b"\xca\xfe\xba\xbe")
+        with archive.open(zipfile.ZipInfo("app/messages.properties"), "w") as entry:
+            entry.write(b"greeting=hello\n" * 100)
+    with zipfile.ZipFile(jar) as original:
+        assert all(info.flag_bits & DATA_DESCRIPTOR_FLAG for info in original.infolist())
+
+    report = shrink_jars([jar], os.path.join(tmp_path, "shrunk"))[0]
+    assert (report.classes, report.failed) == (3, 1)
+    with zipfile.ZipFile(jar) as original, zipfile.ZipFile(report.output) as shrunk:
+        assert shrunk.testzip() is None
+        assert not any(info.flag_bits & DATA_DESCRIPTOR_FLAG for info in shrunk.infolist())
+        assert shrunk.read("app/broken.class") == original.read("app/broken.class")
+        assert shrunk.read("app/messages.properties") == original.read("app/messages.properties")
@@ -0,0 +1,64 @@
+import io
+import logging
+import sqlite3
+
+import pytest
+
+from benchmarks.synthetic import ClassShape, generate_class
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.attributes.policy import DECODE_NONE
+from xscripts.java.sqlite_export import SqliteClassExporter, export_to_sqlite
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+CLASS_FILES = [
+    r"tests_resources/DefaultPileConfigurationService.class",
+    r"tests_resources/GatewayServer.class",
+]
+
+
+def test_export_to_sqlite(tmp_path):
+    database = str(tmp_path / "classes.db")
+    java_classes = (JavaClass(JavaClassDumpPipeline(class_file).run()) for class_file in CLASS_FILES)
+
+    assert export_to_sqlite(database, java_classes, batch_size=8) == len(CLASS_FILES)
+
+    with sqlite3.connect(database) as connection:
+        names = [row[0] for row in connection.execute("SELECT name FROM classes ORDER BY id")]
+        assert names == ["com/zcsy/saasgateway/base/service/DefaultPileConfigurationService",
+                         "com/zcsy/saasgateway/base/GatewayServer"]
+        assert connection.execute("SELECT COUNT(*) FROM methods").fetchone()[0] == 18
+        assert connection.execute("SELECT COUNT(*) FROM fields").fetchone()[0] == 13
+        assert connection.execute("SELECT name FROM interfaces").fetchall() == [
+            ("com/zcsy/saasgateway/base/service/PileConfigurationService",)]
+        for row in connection.execute("SELECT target_kind, target_name, type FROM annotations"):
+            logger.info("Annotation: %s", row)
+
+
+def test_export_rolls_back_on_error(tmp_path):
+    database = str(tmp_path / "classes.db")
+    with pytest.raises(RuntimeError):
+        with SqliteClassExporter(database) as exporter:
+            exporter.add(JavaClass(JavaClassDumpPipeline(CLASS_FILES[0]).run()))
+            exporter.flush()
+            raise RuntimeError("interrupted")
+
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM classes").fetchone()[0] == 0
+        assert connection.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name = 'classes_name'"
+                                  ).fetchone()[0] == 0
+
+
+def test_export_with_lazy_policy(tmp_path):
+    data = generate_class(ClassShape(pool_size=32, fields=1, methods=2), "app/Annotated")
+    rows = []
+    for name, policy in (("eager", None), ("lazy", DECODE_NONE)):
+        database = str(tmp_path / f"{name}.db")
+        export_to_sqlite(database, [JavaClass(JavaClassDumpPipeline.dump(io.BytesIO(data)), decode_policy=policy)])
+        with sqlite3.connect(database) as connection:
+            rows.append(connection.execute("SELECT target_kind, target_name, type, visible FROM annotations "
+                                           "ORDER BY rowid").fetchall())
+    eager, lazy = rows
+    logger.info("Annotations: %s", eager)
+    assert {row[0] for row in eager} == {"class", "field", "method"} and lazy == eager
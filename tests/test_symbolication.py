@@ -0,0 +1,47 @@
+import logging
+import os
+
+from benchmarks.synthetic import ClassShape, generate_class
+from xscripts.java.symbolication import LineNumberIndex, build_line_number_index
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+GATEWAY_SERVER = "com/zcsy/saasgateway/base/GatewayServer"
+
+
+def test_line_number_index(tmp_path, jar):
+    app = jar("app.jar", {"app/Main": generate_class(ClassShape(pool_size=32, methods=2), "app/Main")})
+    output = os.path.join(tmp_path, "lines.idx")
+
+    assert build_line_number_index([r"tests_resources", app], output, jobs=2) > 8
+
+    with LineNumberIndex.open(output) as index:
+        logger.info("Index: %s", index)
+        frame = index.symbolicate("com.zcsy.saasgateway.base.GatewayServer", "start", 16)
+        assert (frame.source_file, frame.line, frame.descriptor) == ("GatewayServer.java", 81, "()V")
+        assert str(frame) == "com.zcsy.saasgateway.base.GatewayServer.start(GatewayServer.java:81)"
+
+        # Without a descriptor, the first overload whose code covers the pc is chosen.
+        assert index.symbolicate(GATEWAY_SERVER, "<init>", 30).line == 45
+        bridge = index.symbolicate(GATEWAY_SERVER, "<init>", 0,
+                                   "(Lcom/zcsy/saasgateway/base/GatewayServer$Builder;"
+                                   "Lcom/zcsy/saasgateway/base/GatewayServer$1;)V")
+        assert bridge.line == 20
+
+        frames = index.symbolicate_all([(GATEWAY_SERVER, "stop", 0), (GATEWAY_SERVER, "stop", 12),
+                                        (GATEWAY_SERVER, "missing", 0), ("app/Missing", "run", 0)])
+        assert [frame and frame.line for frame in frames] == [102, 104, None, None]
+
+        main = index.symbolicate("app.Main", "method0", 0)
+        assert (main.source_file, main.line) == ("Synthetic.java", 10)
+
+
+def test_line_number_index_skips_malformed_classes(tmp_path, jar):
+    app = jar("app.jar", {"app/Main": generate_class(ClassShape(pool_size=32, methods=2), "app/Main"),
+                          "app/Broken": b"\xca\xfe\xba\xbe"})
+    for jobs in (1, 2):
+        output = os.path.join(tmp_path, f"lines{jobs}.idx")
+        assert build_line_number_index([app], output, jobs=jobs) == 2
+        with LineNumberIndex.open(output) as index:
+            assert index.symbolicate("app.Main", "method0", 0).line == 10
@@ -0,0 +1,18 @@
+from io import BytesIO
+
+from benchmarks.synthetic import ClassShape, generate_class
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+
+
+def test_generate_class():
+    shape = ClassShape(pool_size=512, fields=3, methods=5, code_size=40, annotation_depth=4)
+
+    java_class = JavaClass(JavaClassDumpPipeline.dump(BytesIO(generate_class(shape, "bench/Shape"))))
+
+    assert java_class.get_class_name() == "bench/Shape"
+    assert java_class.get_constant_pool_count() >= shape.pool_size
+    assert java_class.get_fields_count() == 3 and java_class.get_methods_count() == 5
+    for member in (*java_class.get_fields(), *java_class.get_methods()):
+        assert member.attributes
+    assert [type(attribute).__name__ for attribute in java_class.get_attributes()] == [
+        "SourceFileAttributeInfo", "RuntimeVisibleAnnotationsAttributeInfo"]
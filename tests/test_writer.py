@@ -0,0 +1,129 @@
+import logging
+from io import BytesIO
+
+import pytest
+
+from benchmarks.synthetic import ClassShape, generate_class
+from xscripts.java import JavaClass, JavaClassDumpPipeline
+from xscripts.java.attributes import SourceFileAttributeInfo
+from xscripts.java.bytecode import iter_instructions
+from xscripts.java.constant_pool import ClassConstantPoolInfo, Utf8ConstantPoolInfo
+from xscripts.java.writer import ATTRIBUTE_REFERENCES, class_bytes, write_class
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+CLASS_FILES = [
+    r"tests_resources/DefaultPileConfigurationService.class",
+    r"tests_resources/GatewayServer.class",
+]
+
+
+def load(data: bytes) -> JavaClass:
+    return JavaClass(JavaClassDumpPipeline.dump(BytesIO(data)))
+
+
+def resolved_code(java_class: JavaClass) -> list[tuple]:
+    """ Every method's instructions with pool operands replaced by the entry they resolve to. """
+    constant_pool = java_class.constant_pool
+    methods = []
+    for method in java_class.get_methods():
+        code = method.code
+        instructions = []
+        for pc, opcode in iter_instructions(code.code if code else b""):
+            if opcode in (0xB6, 0xB7, 0xB8, 0xB9):
+                instructions.append(constant_pool.resolve_member_ref(int.from_bytes(code.code[pc + 1:pc + 3], "big")))
+            elif opcode in (0xBB, 0xC0, 0xC1):
+                class_info = constant_pool.get_class_constant_pool_info(int.from_bytes(code.code[pc + 1:pc + 3], "big"))
+                instructions.append(constant_pool.get_utf8_constant_pool_info(class_info.name_index).string)
+            else:
+                instructions.append(opcode)
+        names = [constant_pool.get_utf8_constant_pool_info(attribute.attribute_name_index).string
+                 for attribute in method.code_attributes]
+        methods.append((constant_pool.get_utf8_constant_pool_info(method.name_index).string, instructions, names))
+    return methods
+
+
+def test_round_trip():
+    for class_file in CLASS_FILES:
+        with open(class_file, "rb") as stream:
+            data = stream.read()
+        java_class = load(data)
+        assert class_bytes(java_class) == data
+
+        java_class.get_interfaces()
+        java_class.get_attributes()
+        for member in (*java_class.get_fields(), *java_class.get_methods()):
+            member.attributes
+        output = BytesIO()
+        assert write_class(java_class, output) == len(data)
+        assert output.getvalue() == data
+
+
+def test_modified_class():
+    with open(CLASS_FILES[1], "rb") as stream:
+        data = stream.read()
+    java_class = load(data)
+    java_class.access_flags |= 0x1000
+    method = java_class.get_methods()[0]
+    method.access_flags |= 0x1000
+    java_class.attributes = tuple(attribute for attribute in java_class.get_attributes()
+                                  if not isinstance(attribute, SourceFileAttributeInfo))
+
+    written = load(class_bytes(java_class))
+    assert written.access_flags == java_class.access_flags
+    assert written.get_methods()[0].access_flags == method.access_flags
+    assert written.get_attributes_count() == len(java_class.attributes)
+    assert resolved_code(written) == resolved_code(load(data))
+
+    # A new interface whose Class entry references the second of two equal Utf8 entries.
+    java_class = load(generate_class(ClassShape(fields=1, methods=1), "bench/Shape"))
+    pool = java_class.constant_pool.pool
+    marker = len(pool) + 1
+    pool[marker] = pool[marker + 1] = Utf8ConstantPoolInfo(b"\x01\x00\x08x/Marker")
+    pool[marker + 2] = ClassConstantPoolInfo((marker + 1 | 0x70000).to_bytes(3, "big"))
+    java_class.interfaces = (*java_class.get_interfaces(), "x/Marker")
+    for compact in (False, True):
+        written = load(class_bytes(java_class, compact=compact))
+        assert written.get_interfaces() == java_class.interfaces
+        assert written.get_interfaces_count() == len(java_class.interfaces)
+
+
+def test_compact_constant_pool():
+    for class_file in CLASS_FILES:
+        with open(class_file, "rb") as stream:
+            original = load(stream.read())
+        java_class = load(class_bytes(original))
+        java_class.attributes = tuple(attribute for attribute in java_class.get_attributes()
+                                      if not isinstance(attribute, SourceFileAttributeInfo))
+        compacted = load(class_bytes(java_class, compact=True))
+
+        assert compacted.get_constant_pool_count() < original.get_constant_pool_count()
+        assert "SourceFile" not in {info.string for info in compacted.constant_pool
+                                    if isinstance(info, Utf8ConstantPoolInfo)}
+        assert compacted.get_class_name() == original.get_class_name()
+        assert compacted.get_super_class_name() == original.get_super_class_name()
+        assert compacted.get_interfaces() == original.get_interfaces()
+        assert resolved_code(compacted) == resolved_code(original)
+        assert class_bytes(compacted, compact=True) == class_bytes(compacted)
+
+
+def test_compact_synthetic_class():
+    shape = ClassShape(pool_size=512, fields=3, methods=5, code_size=40, annotation_depth=4)
+    data = generate_class(shape, "bench/Shape")
+    original = load(data)
+    compacted = load(class_bytes(load(data), compact=True))
+
+    assert compacted.get_constant_pool_count() < original.get_constant_pool_count()
+    assert compacted.get_class_name() == "bench/Shape"
+    assert [type(attribute) for attribute in compacted.get_attributes()] == \
+           [type(attribute) for attribute in original.get_attributes()]
+    assert resolved_code(compacted) == resolved_code(original)
+
+    # Indexes inside an attribute without a walker cannot be renumbered.
+    walker = ATTRIBUTE_REFERENCES.pop("SourceFile")
+    try:
+        with pytest.raises(ValueError, match="SourceFile"):
+            class_bytes(load(data), compact=True)
+    finally:
+        ATTRIBUTE_REFERENCES["SourceFile"] = walker
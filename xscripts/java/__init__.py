@@ -1,7 +1,13 @@
 __all__ = [
+    'ClassColumns',
     'JavaClass',
-    'JavaClassDumpPipeline'
+    'JavaClassDumpPipeline',
+    'SqliteClassExporter',
+    'export_to_sqlite',
+    'scan_class_columns'
 ]
 
+from .columnar import ClassColumns, scan_class_columns
 from .java_class import JavaClass
 from .pipeline import JavaClassDumpPipeline
+from .sqlite_export import SqliteClassExporter, export_to_sqlite
@@ -0,0 +1,338 @@
+import argparse
+import os
+import sys
+
+from .api_diff import diff_jars, format_diff
+from .classpath_index import ClasspathIndex, build_classpath_index
+from .conflicts import detect_conflicts, format_report
+from .dependencies import build_dependency_graph
+from .dump import DumpOptions, dump_ndjson
+from .limits import UNTRUSTED
+from .modules import resolve_module_path
+from .opcode_stats import GROUPINGS, collect_opcode_stats, format_stats
+from .reachability import analyze_reachability
+from .shrink import shrink_jars
+from .symbolication import LineNumberIndex, build_line_number_index
+
+
+def _add_jobs_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="number of worker processes (default: 1, 0 for all cpus)"
+    )
+
+
+def _jobs(args: argparse.Namespace) -> int:
+    return args.jobs or os.process_cpu_count() or 1
+
+
+def _init_dump_parser(dump_parser: argparse.ArgumentParser) -> None:
+    dump_parser.add_argument("paths", nargs="+", help="class files, jars or directories to scan")
+    _add_jobs_argument(dump_parser)
+    dump_parser.add_argument("--format", choices=["ndjson"], default="ndjson", help="output format (default: ndjson)")
+    dump_parser.add_argument("--fields", action="store_true", help="include fields")
+    dump_parser.add_argument("--methods", action="store_true", help="include methods")
+    dump_parser.add_argument(
+        "--attributes", action="store_true", help="include attribute names of the class and selected members"
+    )
+    dump_parser.add_argument(
+        "--untrusted", action="store_true", help="parse with the default resource limits for untrusted input"
+    )
+
+
+def _dump(args: argparse.Namespace) -> int:
+    options = DumpOptions(fields=args.fields, methods=args.methods, attributes=args.attributes,
+                          limits=UNTRUSTED if args.untrusted else None)
+    jobs = _jobs(args)
+    try:
+        dump_ndjson(args.paths, sys.stdout, jobs, options)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Downstream (e.g. `head`) stopped reading, redirect stdout to devnull so the shutdown flush does not fail.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+
+def _init_index_parser(index_parser: argparse.ArgumentParser) -> None:
+    index_parser.add_argument("paths", nargs="+", help="class files, jars or directories to index, in classpath order")
+    index_parser.add_argument("-o", "--output", required=True, help="index file to write")
+    _add_jobs_argument(index_parser)
+    index_parser.add_argument(
+        "--release", type=int, default=None,
+        help="target Java release; multi-release jars contribute the variant it would load"
+    )
+    index_parser.add_argument(
+        "--nested", action="store_true", help="also index jars inside jars, e.g. Spring Boot BOOT-INF/lib"
+    )
+
+
+def _index(args: argparse.Namespace) -> None:
+    jobs = _jobs(args)
+    count = build_classpath_index(args.paths, args.output, jobs, release=args.release, nested=args.nested)
+    print(f"Indexed {count} classes into {args.output}")
+
+
+def _init_lookup_parser(lookup_parser: argparse.ArgumentParser) -> None:
+    lookup_parser.add_argument("index", help="index file written by the index command")
+    lookup_parser.add_argument("names", nargs="+", help="class names, or package names with --package")
+    lookup_parser.add_argument("--package", action="store_true", help="list the classes of packages")
+
+
+def _lookup(args: argparse.Namespace) -> int:
+    missing = 0
+    with ClasspathIndex.open(args.index) as index:
+        for name in args.names:
+            if args.package:
+                for class_name in index.package_classes(name):
+                    print(class_name)
+                continue
+            indexed_class = index.find(name)
+            if indexed_class is None:
+                print(f"{name}: not found", file=sys.stderr)
+                missing += 1
+            else:
+                location = indexed_class.path if indexed_class.entry is None else \
+                    f"{indexed_class.path}!/{indexed_class.entry}@{indexed_class.offset}"
+                print(f"{indexed_class.name} {location}")
+    return 1 if missing else 0
+
+
+def _init_conflicts_parser(conflicts_parser: argparse.ArgumentParser) -> None:
+    conflicts_parser.add_argument("jars", nargs="+", help="jars in classpath order")
+    _add_jobs_argument(conflicts_parser)
+
+
+def _conflicts(args: argparse.Namespace) -> int:
+    jobs = _jobs(args)
+    report = detect_conflicts(args.jars, jobs)
+    if report.conflicts or report.split_packages:
+        print(format_report(report))
+    return 1 if report.differing else 0
+
+
+def _init_apidiff_parser(apidiff_parser: argparse.ArgumentParser) -> None:
+    apidiff_parser.add_argument("old", help="old version of the jar")
+    apidiff_parser.add_argument("new", help="new version of the jar")
+    _add_jobs_argument(apidiff_parser)
+
+
+def _apidiff(args: argparse.Namespace) -> int:
+    jobs = _jobs(args)
+    api_diff = diff_jars(args.old, args.new, jobs)
+    print(format_diff(api_diff))
+    return 1 if api_diff.breaking or api_diff.failed else 0
+
+
+def _init_deps_parser(deps_parser: argparse.ArgumentParser) -> None:
+    deps_parser.add_argument("paths", nargs="+", help="class files, jars or directories to scan")
+    _add_jobs_argument(deps_parser)
+    deps_parser.add_argument("--packages", action="store_true", help="aggregate class dependencies by package")
+    deps_parser.add_argument("--format", choices=["dot", "csv"], default="dot", help="output format (default: dot)")
+    deps_parser.add_argument("--ignore", action="append", default=[], help="drop dependencies with this name prefix")
+    deps_parser.add_argument("--fail-on-cycles", action="store_true", help="exit with 1 if the graph has cycles")
+
+
+def _deps(args: argparse.Namespace) -> int:
+    jobs = _jobs(args)
+    graph = build_dependency_graph(args.paths, jobs, tuple(args.ignore))
+    if args.packages:
+        graph = graph.packages()
+    if args.format == "dot":
+        graph.to_dot(sys.stdout)
+    else:
+        graph.to_csv(sys.stdout)
+
+    cycles = graph.cycles()
+    for cycle in cycles:
+        print(f"cycle: {' '.join(cycle)}", file=sys.stderr)
+    return 1 if cycles and args.fail_on_cycles else 0
+
+
+def _init_unused_parser(unused_parser: argparse.ArgumentParser) -> None:
+    unused_parser.add_argument("paths", nargs="+", help="jars or class directories in classpath order")
+    _add_jobs_argument(unused_parser)
+    unused_parser.add_argument("-e", "--entry-point", action="append", default=[], help="entry point class name")
+    unused_parser.add_argument(
+        "-a", "--annotation", action="append", default=[], help="classes with this annotation are entry points"
+    )
+    unused_parser.add_argument("--no-main", action="store_true", help="do not treat main classes as entry points")
+    unused_parser.add_argument("--no-services", action="store_true", help="ignore META-INF/services providers")
+    unused_parser.add_argument("--classes", action="store_true", help="list unreachable classes")
+
+
+def _unused(args: argparse.Namespace) -> None:
+    jobs = _jobs(args)
+    report = analyze_reachability(args.paths, args.entry_point, not args.no_main, args.annotation,
+                                  not args.no_services, jobs)
+    print(f"{len(report.entry_points)} entry points, {len(report.reachable)} reachable, "
+          f"{len(report.unreachable)} unreachable classes")
+    for path in report.unused_paths:
+        print(f"unused: {path}")
+    if args.classes:
+        for name in report.unreachable:
+            print(f"unreachable: {name}")
+
+
+def _init_opstats_parser(opstats_parser: argparse.ArgumentParser) -> None:
+    opstats_parser.add_argument("paths", nargs="+", help="class files, jars or directories to scan")
+    _add_jobs_argument(opstats_parser)
+    opstats_parser.add_argument("--by", choices=GROUPINGS, default="jar", help="grouping (default: jar)")
+    opstats_parser.add_argument("--top", type=int, default=10, help="opcodes listed per group (default: 10)")
+
+
+def _opstats(args: argparse.Namespace) -> None:
+    jobs = _jobs(args)
+    print(format_stats(collect_opcode_stats(args.paths, args.by, jobs), args.top))
+
+
+def _init_lineindex_parser(lineindex_parser: argparse.ArgumentParser) -> None:
+    lineindex_parser.add_argument(
+        "paths", nargs="+", help="class files, jars or directories to index, in classpath order"
+    )
+    lineindex_parser.add_argument("-o", "--output", required=True, help="index file to write")
+    _add_jobs_argument(lineindex_parser)
+
+
+def _lineindex(args: argparse.Namespace) -> None:
+    jobs = _jobs(args)
+    count = build_line_number_index(args.paths, args.output, jobs)
+    print(f"Indexed line numbers of {count} methods into {args.output}")
+
+
+def _init_symbolicate_parser(symbolicate_parser: argparse.ArgumentParser) -> None:
+    symbolicate_parser.add_argument("index", help="line number index file")
+    symbolicate_parser.add_argument(
+        "frames", nargs="?", type=argparse.FileType("r"), default=sys.stdin,
+        help="file of frames, one 'class method pc [descriptor]' per line (default: stdin)"
+    )
+
+
+def _symbolicate(args: argparse.Namespace) -> int:
+    missing = 0
+    with LineNumberIndex.open(args.index) as index:
+        for line in args.frames:
+            fields = line.split()
+            if not fields:
+                continue
+            if len(fields) not in (3, 4) or not fields[2].isdigit():
+                print(f"{line.strip()}: expected 'class method pc [descriptor]'", file=sys.stderr)
+                missing += 1
+                continue
+            frame = index.symbolicate(fields[0], fields[1], int(fields[2]), *fields[3:])
+            if frame is None:
+                print(f"{line.strip()}: not found", file=sys.stderr)
+                missing += 1
+            else:
+                print(frame)
+    return 1 if missing else 0
+
+
+def _init_modules_parser(modules_parser: argparse.ArgumentParser) -> None:
+    modules_parser.add_argument(
+        "paths", nargs="+", help="module path entries: modular jars, jmods, exploded modules or directories of them"
+    )
+    _add_jobs_argument(modules_parser)
+    modules_parser.add_argument(
+        "--add-modules", default=None, help="comma separated root modules (default: every module found)"
+    )
+    modules_parser.add_argument("--reads", action="store_true", help="also print what each resolved module reads")
+
+
+def _modules(args: argparse.Namespace) -> int:
+    jobs = _jobs(args)
+    graph = resolve_module_path(args.paths, jobs)
+    roots = None if args.add_modules is None else [name for name in args.add_modules.split(",") if name]
+    problems = graph.validate(roots)
+    for name in graph.closure(name for name in (graph.ids if roots is None else roots) if name in graph):
+        print(name)
+        if args.reads:
+            print(f"    reads {' '.join(graph.reads(name))}")
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    return 1 if problems else 0
+
+
+def _init_shrink_parser(shrink_parser: argparse.ArgumentParser) -> None:
+    shrink_parser.add_argument("paths", nargs="+", help="jars to shrink")
+    shrink_parser.add_argument(
+        "-o", "--output-dir", required=True, help="directory to write the shrunk jars to, under the same names"
+    )
+    _add_jobs_argument(shrink_parser)
+
+
+def _shrink(args: argparse.Namespace) -> None:
+    jobs = _jobs(args)
+    reports = shrink_jars(args.paths, args.output_dir, jobs)
+    for report in reports:
+        print(report)
+    if len(reports) > 1:
+        print(f"Saved {sum(report.saved for report in reports):,} bytes in {len(reports)} jars")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m xscripts.java", description="Java class file tools")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    dump_parser = subparsers.add_parser("dump", help="dump class metadata as one JSON object per class")
+    _init_dump_parser(dump_parser)
+
+    index_parser = subparsers.add_parser("index", help="build a memory-mappable classpath index")
+    _init_index_parser(index_parser)
+
+    lookup_parser = subparsers.add_parser("lookup", help="query a classpath index")
+    _init_lookup_parser(lookup_parser)
+
+    conflicts_parser = subparsers.add_parser("conflicts", help="find duplicate classes and split packages in jars")
+    _init_conflicts_parser(conflicts_parser)
+
+    apidiff_parser = subparsers.add_parser("apidiff", help="report API changes between two versions of a jar")
+    _init_apidiff_parser(apidiff_parser)
+
+    deps_parser = subparsers.add_parser("deps", help="class or package dependency graph from constant pools")
+    _init_deps_parser(deps_parser)
+
+    unused_parser = subparsers.add_parser("unused", help="find classes and jars unreachable from entry points")
+    _init_unused_parser(unused_parser)
+
+    opstats_parser = subparsers.add_parser("opstats", help="opcode histograms and flagged call patterns")
+    _init_opstats_parser(opstats_parser)
+
+    lineindex_parser = subparsers.add_parser("lineindex", help="build a memory-mappable line number index")
+    _init_lineindex_parser(lineindex_parser)
+
+    symbolicate_parser = subparsers.add_parser("symbolicate", help="map stack frames to source lines")
+    _init_symbolicate_parser(symbolicate_parser)
+
+    modules_parser = subparsers.add_parser("modules", help="resolve and validate the module graph of a module path")
+    _init_modules_parser(modules_parser)
+
+    shrink_parser = subparsers.add_parser("shrink", help="strip debug information from the classes of jars")
+    _init_shrink_parser(shrink_parser)
+
+    args = parser.parse_args()
+
+    if args.command == "dump":
+        sys.exit(_dump(args))
+    elif args.command == "index":
+        _index(args)
+    elif args.command == "lookup":
+        sys.exit(_lookup(args))
+    elif args.command == "conflicts":
+        sys.exit(_conflicts(args))
+    elif args.command == "apidiff":
+        sys.exit(_apidiff(args))
+    elif args.command == "deps":
+        sys.exit(_deps(args))
+    elif args.command == "unused":
+        _unused(args)
+    elif args.command == "opstats":
+        _opstats(args)
+    elif args.command == "lineindex":
+        _lineindex(args)
+    elif args.command == "symbolicate":
+        sys.exit(_symbolicate(args))
+    elif args.command == "modules":
+        sys.exit(_modules(args))
+    elif args.command == "shrink":
+        _shrink(args)
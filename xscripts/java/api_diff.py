@@ -0,0 +1,193 @@
+import hashlib
+import logging
+import zipfile
+from dataclasses import dataclass
+from typing import Iterator
+
+from .classpath import CLASS_SUFFIX, ClassSource, map_sources
+from .classpath_index import IndexedClass, IndexedMember, index_class
+from .enums import ClassAccessFlags, FieldAccessFlags, MethodAccessFlags
+from .instrumentation import Instrumentation
+from .java_class import JavaClass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ClassApi:
+    """ The binary-compatibility relevant view of a class: private and synthetic members are dropped. """
+    name: str
+    super_name: str | None
+    access_flags: int
+    interfaces: frozenset[str]
+    fields: dict[tuple[str, str], int]
+    methods: dict[tuple[str, str], int]
+
+    @classmethod
+    def of(cls, indexed_class: IndexedClass) -> "ClassApi":
+        def members(items: tuple[IndexedMember, ...], flags_type) -> dict[tuple[str, str], int]:
+            return {(member.name, member.descriptor): member.access_flags for member in items
+                    if not flags_type.is_private(member.access_flags)
+                    and not flags_type.is_synthetic(member.access_flags)}
+
+        return cls(indexed_class.name, indexed_class.super_name, indexed_class.access_flags,
+                   frozenset(indexed_class.interfaces), members(indexed_class.fields, FieldAccessFlags),
+                   members(indexed_class.methods, MethodAccessFlags))
+
+    def fingerprint(self) -> bytes:
+        """ A digest of the normalized API, equal for classes that differ only in code or private members. """
+        normalized = (self.name, self.super_name, self.access_flags & ~ClassAccessFlags.SUPER,
+                      sorted(self.interfaces), sorted(self.fields.items()), sorted(self.methods.items()))
+        return hashlib.blake2b(repr(normalized).encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass(frozen=True)
+class MemberChange:
+    kind: str
+    name: str
+    descriptor: str
+    old_flags: tuple[FieldAccessFlags | MethodAccessFlags, ...] | None
+    new_flags: tuple[FieldAccessFlags | MethodAccessFlags, ...] | None
+
+    @property
+    def change(self) -> str:
+        if self.new_flags is None:
+            return "removed"
+        if self.old_flags is None:
+            return "added"
+        return "access changed"
+
+
+@dataclass(frozen=True)
+class ClassDiff:
+    """ status is "added", "removed", "changed", or "failed" if either version could not be parsed. """
+    name: str
+    status: str
+    old_super_name: str | None = None
+    new_super_name: str | None = None
+    old_access_flags: tuple[ClassAccessFlags, ...] = ()
+    new_access_flags: tuple[ClassAccessFlags, ...] = ()
+    removed_interfaces: tuple[str, ...] = ()
+    added_interfaces: tuple[str, ...] = ()
+    members: tuple[MemberChange, ...] = ()
+
+    @property
+    def breaking(self) -> bool:
+        """ Whether existing callers or subclasses may break: anything removed or changed, not just added. """
+        return self.status == "removed" or self.old_super_name != self.new_super_name \
+            or self.old_access_flags != self.new_access_flags or bool(self.removed_interfaces) \
+            or any(member.change != "added" for member in self.members)
+
+
+@dataclass(frozen=True)
+class ApiDiff:
+    classes: tuple[ClassDiff, ...]
+    unchanged: int
+
+    @property
+    def breaking(self) -> tuple[ClassDiff, ...]:
+        return tuple(diff for diff in self.classes if diff.breaking)
+
+    @property
+    def failed(self) -> tuple[ClassDiff, ...]:
+        """ Changed classes that could not be compared, so their compatibility is unknown. """
+        return tuple(diff for diff in self.classes if diff.status == "failed")
+
+
+def _member_changes(kind: str, old: dict[tuple[str, str], int], new: dict[tuple[str, str], int],
+                    flags_type) -> Iterator[MemberChange]:
+    for key in sorted(old.keys() | new.keys()):
+        old_flags, new_flags = old.get(key), new.get(key)
+        if old_flags != new_flags:
+            yield MemberChange(kind, *key,
+                               None if old_flags is None else flags_type.parse_flags(old_flags),
+                               None if new_flags is None else flags_type.parse_flags(new_flags))
+
+
+def diff_class(old: ClassApi, new: ClassApi) -> ClassDiff:
+    """ Compare the members of two versions of a class in detail. """
+    return ClassDiff(
+        old.name, "changed", old.super_name, new.super_name,
+        ClassAccessFlags.parse_flags(old.access_flags & ~ClassAccessFlags.SUPER),
+        ClassAccessFlags.parse_flags(new.access_flags & ~ClassAccessFlags.SUPER),
+        tuple(sorted(old.interfaces - new.interfaces)), tuple(sorted(new.interfaces - old.interfaces)),
+        (*_member_changes("field", old.fields, new.fields, FieldAccessFlags),
+         *_member_changes("method", old.methods, new.methods, MethodAccessFlags)))
+
+
+def _class_entries(jar: str) -> dict[str, tuple[str, int, int]]:
+    """ Map class names to (entry, CRC32, size) from the central directory of a jar. """
+    with zipfile.ZipFile(jar) as archive:
+        return {info.filename[:-len(CLASS_SUFFIX)]: (info.filename, info.CRC, info.file_size)
+                for info in archive.infolist()
+                if info.filename.endswith(CLASS_SUFFIX) and not info.filename.startswith("META-INF/")
+                and not info.filename.endswith("module-info.class")}
+
+
+def _scan(source: ClassSource, instrumentation: Instrumentation | None = None) -> tuple[ClassSource, ClassApi | None]:
+    try:
+        java_class = JavaClass(source.load(instrumentation=instrumentation), instrumentation)
+        api = ClassApi.of(index_class(java_class, source.path, source.entry))
+    except Exception:
+        logger.warning("Failed to parse %s", source, exc_info=True)
+        api = None
+    return source, api
+
+
+def diff_jars(old_jar: str, new_jar: str, jobs: int = 1, chunksize: int = 64,
+              instrumentation: Instrumentation | None = None) -> ApiDiff:
+    """ Report the API changes between two versions of a jar.
+
+    Entries with the same CRC32 and size in both jars are unchanged without being read. The rest
+    of both versions is parsed in one worker pool, and only classes whose fingerprint changed
+    are compared member by member. Classes failing to parse on either side are reported as failed.
+    """
+    old_entries, new_entries = _class_entries(old_jar), _class_entries(new_jar)
+    unchanged = 0
+    sources = []
+    for name in old_entries.keys() & new_entries.keys():
+        old_entry, new_entry = old_entries[name], new_entries[name]
+        if old_entry[1:] == new_entry[1:]:
+            unchanged += 1
+        else:
+            sources.append(ClassSource(old_jar, old_entry[0]))
+            sources.append(ClassSource(new_jar, new_entry[0]))
+    sources.sort(key=lambda source: (source.entry, source.path != old_jar))
+
+    apis = dict(map_sources(_scan, sources, jobs, chunksize, ordered=False, instrumentation=instrumentation))
+
+    diffs = [ClassDiff(name, "removed") for name in old_entries.keys() - new_entries.keys()]
+    diffs.extend(ClassDiff(name, "added") for name in new_entries.keys() - old_entries.keys())
+    for old_source, new_source in zip(sources[::2], sources[1::2]):
+        old_api, new_api = apis[old_source], apis[new_source]
+        if old_api is None or new_api is None:
+            diffs.append(ClassDiff(old_source.entry[:-len(CLASS_SUFFIX)], "failed"))
+        elif old_api.fingerprint() == new_api.fingerprint():
+            unchanged += 1
+        else:
+            diffs.append(diff_class(old_api, new_api))
+
+    return ApiDiff(tuple(sorted(diffs, key=lambda diff: diff.name)), unchanged)
+
+
+def format_diff(api_diff: ApiDiff) -> str:
+    lines = []
+    for diff in api_diff.classes:
+        lines.append(f"{diff.name}: {diff.status}{' (breaking)' if diff.breaking else ''}")
+        if diff.old_super_name != diff.new_super_name:
+            lines.append(f"    super: {diff.old_super_name} -> {diff.new_super_name}")
+        if diff.old_access_flags != diff.new_access_flags:
+            lines.append(f"    access: {' '.join(flag.name for flag in diff.old_access_flags)} -> "
+                         f"{' '.join(flag.name for flag in diff.new_access_flags)}")
+        for interface in diff.removed_interfaces:
+            lines.append(f"    interface removed: {interface}")
+        for interface in diff.added_interfaces:
+            lines.append(f"    interface added: {interface}")
+        for member in diff.members:
+            line = f"    {member.kind} {member.change}: {member.name}{member.descriptor}"
+            if member.change == "access changed":
+                line += f" {' '.join(flag.name for flag in member.old_flags)} -> " \
+                        f"{' '.join(flag.name for flag in member.new_flags)}"
+            lines.append(line)
+    lines.append(f"{api_diff.unchanged} classes unchanged, {len(api_diff.failed)} failed to parse")
+    return "\n".join(lines)
@@ -30,9 +30,17 @@ __all__ = [
     "NestMembersAttributeInfo",
     "RecordAttributeInfo",
     "PermittedSubclassesAttributeInfo",
-    "AttributesTypes"
+    "RawAttributeInfo",
+    "AttributesTypes",
+    "AttributeContext",
+    "AttributeFactory",
+    "AttributeRegistry",
+    "DecodePolicy",
+    "register_attribute_decoder"
 ]
 
 from .attr import *
-from .enums import AttributesTypes
+from .enums import AttributeContext, AttributesTypes
 from .factory import AttributeFactory
+from .policy import DecodePolicy
+from .registry import AttributeRegistry, register_attribute_decoder
@@ -29,7 +29,8 @@ __all__ = [
     "NestHostAttributeInfo",
     "NestMembersAttributeInfo",
     "RecordAttributeInfo",
-    "PermittedSubclassesAttributeInfo"
+    "PermittedSubclassesAttributeInfo",
+    "RawAttributeInfo"
 ]
 
 from .annotation_default import AnnotationDefaultAttributeInfo
@@ -51,6 +52,7 @@ from .module_packages import ModulePackagesAttributeInfo
 from .nest_host import NestHostAttributeInfo
 from .nest_members import NestMembersAttributeInfo
 from .permitted_subclasses import PermittedSubclassesAttributeInfo
+from .raw import RawAttributeInfo
 from .record import RecordAttributeInfo
 from .runtime_invisible_annotations import RuntimeInvisibleAnnotationsAttributeInfo
 from .runtime_invisible_parameter_annotations import RuntimeInvisibleParameterAnnotationsAttributeInfo
@@ -4,6 +4,7 @@ from enum import IntEnum
 from typing import Union, override
 
 from .attribute_info import AttributeInfo
+from ...errors import LimitExceededError
 
 
 class ElementValueTag(IntEnum):
@@ -144,7 +145,7 @@ class Annotation:
     element_value_pairs: tuple[ElementValuePair, ...]
 
 
-class AnnotationBase(metaclass=ABCMeta, AttributeInfo):
+class AnnotationBase(AttributeInfo):
     """ Represents an annotation in a Java class.
 
     Refer: https://docs.oracle.com/javase/specs/jvms/se21/html/jvms-4.html#jvms-4.7.16
@@ -177,10 +178,14 @@ class AnnotationBase(metaclass=ABCMeta, AttributeInfo):
     }
     """
 
-    def __init__(self, raw_bytes: bytes) -> None:
+    # Nested annotations and arrays are parsed recursively; deeper input raises LimitExceededError.
+    DEFAULT_MAX_DEPTH = 128
+
+    def __init__(self, raw_bytes: bytes, max_depth: int | None = None) -> None:
         super().__init__(raw_bytes)
+        self.max_depth: int = self.DEFAULT_MAX_DEPTH if max_depth is None else max_depth
 
-    def _parse_annotation(self, start: int) -> tuple[int, Annotation]:
+    def _parse_annotation(self, start: int, depth: int = 0) -> tuple[int, Annotation]:
         """ Parse an annotation starting from the given byte index.
 
         annotation {
@@ -194,6 +199,8 @@ class AnnotationBase(metaclass=ABCMeta, AttributeInfo):
         Return:
             A tuple containing the size of the parsed annotation(in bytes) and the Annotation object.
         """
+        if depth > self.max_depth:
+            raise LimitExceededError("max_annotation_depth", depth, self.max_depth)
         current_pos = start
 
         # Parse type_index (u2)
@@ -212,17 +219,17 @@ class AnnotationBase(metaclass=ABCMeta, AttributeInfo):
             current_pos += 2
 
             # Parse element value
-            value_size, element_value = self._parse_element_value(current_pos)
+            value_size, element_value = self._parse_element_value(current_pos, depth)
             current_pos += value_size
 
-            element_value_pairs.append(self.ElementValuePair(element_name_index, element_value))
+            element_value_pairs.append(ElementValuePair(element_name_index, element_value))
 
         total_size = current_pos - start
-        annotation = self.Annotation(type_index, num_element_value_pairs, tuple(element_value_pairs))
+        annotation = Annotation(type_index, num_element_value_pairs, tuple(element_value_pairs))
 
         return total_size, annotation
 
-    def _parse_element_value(self, start: int) -> tuple[int, ElementValue]:
+    def _parse_element_value(self, start: int, depth: int = 0) -> tuple[int, ElementValue]:
         """ Parse an element value starting from the given byte index.
 
         Return:
@@ -236,38 +243,40 @@ class AnnotationBase(metaclass=ABCMeta, AttributeInfo):
                    ElementValueTag.SHORT, ElementValueTag.BOOLEAN, ElementValueTag.STRING]:
             # Constant value: u2 const_value_index
             const_value_index = self.parse_int(self.raw[current_pos:current_pos + 2])
-            return 3, self.ElementValue(tag, const_value_index)
+            return 3, ConstValueIndexElementValue(tag, const_value_index)
 
         elif tag == ElementValueTag.ENUM_CLASS:
             # Enum constant: u2 type_name_index, u2 const_name_index
             type_name_index = self.parse_int(self.raw[current_pos:current_pos + 2])
             const_name_index = self.parse_int(self.raw[current_pos + 2:current_pos + 4])
-            enum_value = self.EnumConstValue(type_name_index, const_name_index)
-            return 5, self.ElementValue(tag, enum_value)
+            enum_value = EnumConstValue(type_name_index, const_name_index)
+            return 5, EnumConstValueElementValue(enum_value)
 
         elif tag == ElementValueTag.CLASS:
             # Class info: u2 class_info_index
             class_info_index = self.parse_int(self.raw[current_pos:current_pos + 2])
-            return 3, self.ElementValue(tag, class_info_index)
+            return 3, ClassInfoIndexElementValue(class_info_index)
 
         elif tag == ElementValueTag.ANNOTATION_INTERFACE:
             # Nested annotation
-            annotation_size, annotation = self._parse_annotation(current_pos)
-            return 1 + annotation_size, self.ElementValue(tag, annotation)
+            annotation_size, annotation = self._parse_annotation(current_pos, depth + 1)
+            return 1 + annotation_size, AnnotationValueElementValue(annotation)
 
         elif tag == ElementValueTag.ARRAY_TYPE:
             # Array: u2 num_values, element_value values[num_values]
+            if depth + 1 > self.max_depth:
+                raise LimitExceededError("max_annotation_depth", depth + 1, self.max_depth)
             num_values = self.parse_int(self.raw[current_pos:current_pos + 2])
             current_pos += 2
             values = []
 
             for _ in range(num_values):
-                value_size, element_value = self._parse_element_value(current_pos)
+                value_size, element_value = self._parse_element_value(current_pos, depth + 1)
                 values.append(element_value)
                 current_pos += value_size
 
             total_size = current_pos - start
-            return total_size, self.ElementValue(tag, tuple(values))
+            return total_size, ArrayValueElementValue(tuple(values))
 
         else:
             raise ValueError(f"Unknown element value tag: {tag}")
@@ -15,8 +15,8 @@ class AnnotationDefaultAttributeInfo(AnnotationBase):
     }
     """
 
-    def __init__(self, raw_bytes: bytes) -> None:
-        super().__init__(raw_bytes)
+    def __init__(self, raw_bytes: bytes, max_depth: int | None = None) -> None:
+        super().__init__(raw_bytes, max_depth)
 
     @cached_property
     def default_value(self) -> "AnnotationBase.ElementValue":
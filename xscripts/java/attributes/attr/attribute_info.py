@@ -13,8 +13,8 @@ class AttributeInfo(metaclass=ABCMeta):
         return int.from_bytes(segment, byteorder='big', signed=False)
 
     def __init__(self, raw_bytes: bytes) -> None:
-        if len(raw_bytes) <= 6:
-            raise ValueError("Raw bytes must be longer than 6 bytes for attribute info.")
+        if len(raw_bytes) < 6:
+            raise ValueError("Raw bytes must be at least 6 bytes for attribute info.")
 
         length = self.parse_int(raw_bytes[2:6])
 
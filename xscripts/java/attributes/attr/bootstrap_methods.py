@@ -1,6 +1,5 @@
 from dataclasses import dataclass
 from functools import cached_property
-from io import BytesIO
 
 from .attribute_info import AttributeInfo
 
@@ -39,29 +38,21 @@ class BootstrapMethodsAttributeInfo(AttributeInfo):
 
     @cached_property
     def bootstrap_methods(self) -> tuple[BootstrapMethod, ...]:
-        """ Parses the bootstrap methods from the raw bytes.
+        """ Parses the bootstrap methods from the raw bytes in a single pass.
         """
+        raw = self.raw
         start = 8
         methods = []
         for _ in range(self.number_of_bootstrap_methods):
-            method = self.__parse_bootstrap_method(start)
-            methods.append(method)
-            start += 4 + method.num_bootstrap_arguments * 2
-        return tuple(methods)
-
-    def __parse_bootstrap_method(self, start: int) -> BootstrapMethod:
-        """ Helper method to parse a single bootstrap method.
-        """
-        with BytesIO(self.raw[start:]) as stream:
-            bootstrap_method_ref = self.parse_int(stream.read(2))
-            num_bootstrap_arguments = self.parse_int(stream.read(2))
+            bootstrap_method_ref = self.parse_int(raw[start:start + 2])
+            num_bootstrap_arguments = self.parse_int(raw[start + 2:start + 4])
+            start += 4
             bootstrap_arguments = tuple(
-                self.parse_int(stream.read(2)) for _ in range(num_bootstrap_arguments)
-            )
-
-            return BootstrapMethod(
-                bootstrap_method_ref, num_bootstrap_arguments, bootstrap_arguments
+                self.parse_int(raw[offset:offset + 2]) for offset in range(start, start + num_bootstrap_arguments * 2, 2)
             )
+            start += num_bootstrap_arguments * 2
+            methods.append(BootstrapMethod(bootstrap_method_ref, num_bootstrap_arguments, bootstrap_arguments))
+        return tuple(methods)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name_index={self.attribute_name_index}, length={self.attribute_length}, " \
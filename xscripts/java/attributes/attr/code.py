@@ -78,6 +78,11 @@ class CodeAttributeInfo(AttributeInfo):
         return self.parse_int(self.raw[
                               16 + self.code_length + self.exception_table_length * 8:18 + self.code_length + self.exception_table_length * 8])
 
+    @cached_property
+    def attributes_segment(self) -> bytes:
+        """Raw bytes of the nested attributes, see AttributeFactory.load_code_attributes."""
+        return self.raw[18 + self.code_length + self.exception_table_length * 8:]
+
     @cached_property
     def get_attributes(self) -> Iterable[AttributeInfo]:
         """Get the attributes of the code attribute."""
@@ -89,88 +89,102 @@ class ModuleAttributeInfo(AttributeInfo):
     def module_version_index(self) -> int:
         return self.parse_int(self.raw[10:12])
 
+    def __u2s(self, start: int, count: int) -> tuple[int, ...]:
+        return tuple(self.parse_int(self.raw[i:i + 2]) for i in range(start, start + count * 2, 2))
+
+    @cached_property
+    def _sections(self) -> tuple[int, int, int, int, int]:
+        """ Offsets of the requires, exports, opens, uses and provides counts, found in one walk. """
+        requires = 12
+        exports = requires + 2 + self.parse_int(self.raw[requires:requires + 2]) * 6
+        offset = exports
+        offsets = [requires, exports]
+        for _ in range(2):
+            count = self.parse_int(self.raw[offset:offset + 2])
+            offset += 2
+            for _ in range(count):
+                offset += 6 + self.parse_int(self.raw[offset + 4:offset + 6]) * 2
+            offsets.append(offset)
+        uses = offsets[-1]
+        offsets.append(uses + 2 + self.parse_int(self.raw[uses:uses + 2]) * 2)
+        return tuple(offsets)
+
+    @cached_property
+    def number_of_requires(self) -> int:
+        start = self._sections[0]
+        return self.parse_int(self.raw[start:start + 2])
+
+    @cached_property
+    def requires(self) -> tuple[Require, ...]:
+        """ Parses the requires from the raw bytes. """
+        start = self._sections[0] + 2
+        return tuple(self.Require(*self.__u2s(i, 3)) for i in range(start, start + self.number_of_requires * 6, 6))
+
     @cached_property
     def number_of_exports(self) -> int:
-        return self.parse_int(self.raw[12:14])
+        start = self._sections[1]
+        return self.parse_int(self.raw[start:start + 2])
 
     @cached_property
     def exports(self) -> tuple[Export, ...]:
         """ Parses the exports from the raw bytes. """
-        start = 14
+        start = self._sections[1] + 2
         exports = []
         for _ in range(self.number_of_exports):
-            exports_index = self.parse_int(self.raw[start:start + 2])
-            exports_flags = self.parse_int(self.raw[start + 2:start + 4])
-            exports_to_count = self.parse_int(self.raw[start + 4:start + 6])
-            exports_to_index = tuple(
-                self.parse_int(self.raw[start + 6 + i:start + 8 + i]) for i in range(0, exports_to_count * 2, 2)
-            )
-            exports.append(self.Export(exports_index, exports_flags, exports_to_count, exports_to_index))
+            exports_index, exports_flags, exports_to_count = self.__u2s(start, 3)
+            exports.append(self.Export(exports_index, exports_flags, exports_to_count,
+                                       self.__u2s(start + 6, exports_to_count)))
             start += 6 + exports_to_count * 2
         return tuple(exports)
 
     @cached_property
     def number_of_opens(self) -> int:
-        start = 14 + sum(6 + export.exports_to_count * 2 for export in self.exports)
+        start = self._sections[2]
         return self.parse_int(self.raw[start:start + 2])
 
     @cached_property
     def opens(self) -> tuple[Open, ...]:
         """ Parses the opens from the raw bytes. """
-        start = 14 + sum(6 + export.exports_to_count * 2 for export in self.exports) + 2
+        start = self._sections[2] + 2
         opens = []
         for _ in range(self.number_of_opens):
-            opens_index = self.parse_int(self.raw[start:start + 2])
-            opens_flags = self.parse_int(self.raw[start + 2:start + 4])
-            opens_to_count = self.parse_int(self.raw[start + 4:start + 6])
-            opens_to_index = tuple(
-                self.parse_int(self.raw[start + 6 + i:start + 8 + i]) for i in range(0, opens_to_count * 2, 2)
-            )
-            opens.append(self.Open(opens_index, opens_flags, opens_to_count, opens_to_index))
+            opens_index, opens_flags, opens_to_count = self.__u2s(start, 3)
+            opens.append(self.Open(opens_index, opens_flags, opens_to_count, self.__u2s(start + 6, opens_to_count)))
             start += 6 + opens_to_count * 2
         return tuple(opens)
 
     @cached_property
     def number_of_uses(self) -> int:
-        start = 14 + sum(6 + export.exports_to_count * 2 for export in self.exports) + 2 + \
-                sum(6 + open.opens_to_count * 2 for open in self.opens)
+        start = self._sections[3]
         return self.parse_int(self.raw[start:start + 2])
 
     @cached_property
     def uses(self) -> tuple[int, ...]:
         """ Parses the uses from the raw bytes. """
-        start = 14 + sum(6 + export.exports_to_count * 2 for export in self.exports) + 2 + \
-                sum(6 + open.opens_to_count * 2 for open in self.opens) + 2
-        return tuple(self.parse_int(self.raw[start + i:start + i + 2]) for i in range(0, self.number_of_uses * 2, 2))
+        return self.__u2s(self._sections[3] + 2, self.number_of_uses)
 
     @cached_property
     def number_of_provides(self) -> int:
-        start = 14 + sum(6 + export.exports_to_count * 2 for export in self.exports) + 2 + \
-                sum(6 + open.opens_to_count * 2 for open in self.opens) + 2 + \
-                self.number_of_uses * 2
+        start = self._sections[4]
         return self.parse_int(self.raw[start:start + 2])
 
     @cached_property
     def provides(self) -> tuple[Provides, ...]:
         """ Parses the provides from the raw bytes. """
-        start = 14 + sum(6 + export.exports_to_count * 2 for export in self.exports) + 2 + \
-                sum(6 + _open.opens_to_count * 2 for _open in self.opens) + 2 + \
-                self.number_of_uses * 2 + 2
+        start = self._sections[4] + 2
         provides = []
         for _ in range(self.number_of_provides):
-            provides_index = self.parse_int(self.raw[start:start + 2])
-            provides_with_count = self.parse_int(self.raw[start + 2:start + 4])
-            provides_with_index = tuple(
-                self.parse_int(self.raw[start + 4 + i:start + 6 + i]) for i in range(0, provides_with_count * 2, 2)
-            )
-            provides.append(self.Provides(provides_index, provides_with_count, provides_with_index))
+            provides_index, provides_with_count = self.__u2s(start, 2)
+            provides.append(self.Provides(provides_index, provides_with_count,
+                                          self.__u2s(start + 4, provides_with_count)))
             start += 4 + provides_with_count * 2
         return tuple(provides)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name_index={self.attribute_name_index}, length={self.attribute_length}, " \
                f"module_name_index={self.module_name_index}, module_flags={self.module_flags}, " \
-               f"module_version_index={self.module_version_index}, number_of_exports={self.number_of_exports}, " \
+               f"module_version_index={self.module_version_index}, number_of_requires={self.number_of_requires}, " \
+               f"requires={self.requires}, number_of_exports={self.number_of_exports}, " \
                f"exports={self.exports}, number_of_opens={self.number_of_opens}, opens={self.opens}, " \
                f"number_of_uses={self.number_of_uses}, uses={self.uses}, " \
                f"number_of_provides={self.number_of_provides}, provides={self.provides})"
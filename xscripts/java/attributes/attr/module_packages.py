@@ -27,6 +27,11 @@ class ModulePackagesAttributeInfo(AttributeInfo):
     def packages(self) -> bytes:
         return self.raw[8:8 + self.number_of_packages * 2]
 
+    @cached_property
+    def package_indexes(self) -> tuple[int, ...]:
+        """ The CONSTANT_Package indexes of the packages. """
+        return tuple(self.parse_int(self.raw[i:i + 2]) for i in range(8, 8 + self.number_of_packages * 2, 2))
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name_index={self.attribute_name_index}, length={self.attribute_length}, " \
                f"number_of_packages={self.number_of_packages}, packages={self.packages})"
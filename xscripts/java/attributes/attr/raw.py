@@ -0,0 +1,43 @@
+from functools import cached_property
+from typing import Callable
+
+from .attribute_info import AttributeInfo
+
+
+class RawAttributeInfo(AttributeInfo):
+    """ Represents an attribute kept as an undecoded slice of the class file.
+
+    Used for attributes without a registered decoder (e.g. vendor attributes) and for attributes
+    a DecodePolicy does not decode eagerly. If a decoder is known, `decoded` builds the real
+    AttributeInfo on first access.
+
+    attribute_info {
+        u2 attribute_name_index;
+        u4 attribute_length;
+        u1 info[attribute_length];
+    }
+    """
+
+    def __init__(self, raw_bytes: bytes | memoryview, attribute_name: str,
+                 decoder: Callable[[bytes], AttributeInfo] | None = None) -> None:
+        super().__init__(raw_bytes)
+        self.attribute_name: str = attribute_name
+        self.__decoder = decoder
+
+    @cached_property
+    def info(self) -> bytes:
+        return bytes(self.raw[6:])
+
+    def is_decodable(self) -> bool:
+        return self.__decoder is not None
+
+    @cached_property
+    def decoded(self) -> AttributeInfo:
+        """ Decode the attribute with its registered decoder. """
+        if self.__decoder is None:
+            raise ValueError(f"No decoder registered for attribute: {self.attribute_name}")
+        return self.__decoder(bytes(self.raw))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.attribute_name}, name_index={self.attribute_name_index}, " \
+               f"length={self.attribute_length})"
@@ -1,9 +1,9 @@
 from functools import cached_property
 
-from .attribute_info import AttributeInfo
+from ._annotations import Annotation, AnnotationBase
 
 
-class RuntimeInvisibleAnnotationsAttributeInfo(AttributeInfo):
+class RuntimeInvisibleAnnotationsAttributeInfo(AnnotationBase):
     """ Represents a runtime invisible annotations attribute in a Java class.
 
     Refer: https://docs.oracle.com/javase/specs/jvms/se21/html/jvms-4.html#jvms-4.7.17
@@ -16,16 +16,22 @@ class RuntimeInvisibleAnnotationsAttributeInfo(AttributeInfo):
     }
     """
 
-    def __init__(self, raw_bytes: bytes) -> None:
-        super().__init__(raw_bytes)
+    def __init__(self, raw_bytes: bytes, max_depth: int | None = None) -> None:
+        super().__init__(raw_bytes, max_depth)
 
     @cached_property
     def annotations_count(self) -> int:
         return self.parse_int(self.raw[6:8])
 
     @cached_property
-    def annotations(self) -> bytes:
-        return self.annotations
+    def annotations(self) -> tuple[Annotation, ...]:
+        start = 8
+        annotations = []
+        for _ in range(self.annotations_count):
+            size, annotation = self._parse_annotation(start)
+            annotations.append(annotation)
+            start += size
+        return tuple(annotations)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name_index={self.attribute_name_index}, length={self.attribute_length}, " \
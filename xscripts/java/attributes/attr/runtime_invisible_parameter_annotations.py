@@ -23,11 +23,11 @@ class RuntimeInvisibleParameterAnnotationsAttributeInfo(AttributeInfo):
 
     @cached_property
     def number_of_parameters(self) -> int:
-        return self.number_of_parameters
+        return self.parse_int(self.raw[6:7])
 
     @cached_property
     def parameter_annotations(self) -> bytes:
-        return self.parameter_annotations
+        return self.raw[7:]
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name_index={self.attribute_name_index}, length={self.attribute_length}, " \
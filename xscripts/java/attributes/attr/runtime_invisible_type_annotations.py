@@ -17,7 +17,7 @@ class RuntimeInvisibleTypeAnnotationsAttributeInfo(AttributeInfo):
     def __init__(self, raw_bytes: bytes) -> None:
         super().__init__(raw_bytes)
 
-        self.annotations: bytes = self.__raw[6:]
+        self.annotations: bytes = self.raw[6:]
 
     def get_annotations(self) -> bytes:
         return self.annotations
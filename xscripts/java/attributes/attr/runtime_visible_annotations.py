@@ -1,9 +1,9 @@
 from functools import cached_property
 
-from .attribute_info import AttributeInfo
+from ._annotations import Annotation, AnnotationBase
 
 
-class RuntimeVisibleAnnotationsAttributeInfo(AttributeInfo):
+class RuntimeVisibleAnnotationsAttributeInfo(AnnotationBase):
     """ Represents a runtime visible annotations attribute in a Java class.
 
     Refer: https://docs.oracle.com/javase/specs/jvms/se21/html/jvms-4.html#jvms-4.7.16
@@ -16,8 +16,8 @@ class RuntimeVisibleAnnotationsAttributeInfo(AttributeInfo):
     }
     """
 
-    def __init__(self, raw_bytes: bytes) -> None:
-        super().__init__(raw_bytes)
+    def __init__(self, raw_bytes: bytes, max_depth: int | None = None) -> None:
+        super().__init__(raw_bytes, max_depth)
 
     @cached_property
     def num_annotations(self) -> int:
@@ -28,12 +28,11 @@ class RuntimeVisibleAnnotationsAttributeInfo(AttributeInfo):
         start = 8
         annotations = []
         for _ in range(self.num_annotations):
-            annotation = self.__parse_annotation(start)
+            size, annotation = self._parse_annotation(start)
             annotations.append(annotation)
-            start += 4 + sum(
-                len(pair[1]) if isinstance(pair[1], bytes) else 0 for pair in annotation.element_value_pairs)
+            start += size
         return tuple(annotations)
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(name_index={self.attribute_name_index}, length={self.attribute_length})" \
+        return f"{self.__class__.__name__}(name_index={self.attribute_name_index}, length={self.attribute_length}" \
                f", num_annotations={self.num_annotations})"
@@ -19,8 +19,8 @@ class RuntimeVisibleParameterAnnotationsAttributeInfo(AttributeInfo):
     def __init__(self, raw_bytes: bytes) -> None:
         super().__init__(raw_bytes)
 
-        self.number_of_parameters: int = self.parse_int(self.__raw[6:8])
-        self.parameter_annotations: bytes = self.__raw[8:]
+        self.number_of_parameters: int = self.parse_int(self.raw[6:7])
+        self.parameter_annotations: bytes = self.raw[7:]
 
     def get_number_of_parameters(self) -> int:
         return self.number_of_parameters
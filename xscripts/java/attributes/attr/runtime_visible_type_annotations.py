@@ -17,8 +17,8 @@ class RuntimeVisibleTypeAnnotationsAttributeInfo(AttributeInfo):
     def __init__(self, raw_bytes: bytes) -> None:
         super().__init__(raw_bytes)
 
-        self.annotations_count: int = self.parse_int(self.__raw[6:8])
-        self.annotations: bytes = self.__raw[8:]
+        self.annotations_count: int = self.parse_int(self.raw[6:8])
+        self.annotations: bytes = self.raw[8:]
 
     def get_annotations_count(self) -> int:
         return self.annotations_count
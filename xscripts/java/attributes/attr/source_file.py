@@ -20,7 +20,7 @@ class SourceFileAttributeInfo(AttributeInfo):
 
     @cached_property
     def sourcefile_index(self) -> int:
-        return self.sourcefile_index
+        return self.parse_int(self.raw[6:8])
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name_index={self.attribute_name_index}, length={self.attribute_length}, " \
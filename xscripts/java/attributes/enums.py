@@ -34,3 +34,15 @@ class AttributesTypes(StrEnum):
     NEST_MEMBERS = "NestMembers"
     RECORD = "Record"
     PERMITTED_SUBCLASSES = "PermittedSubclasses"
+
+
+class AttributeContext(StrEnum):
+    """ Enum for the structures an attribute may appear in.
+
+    Refer: https://docs.oracle.com/javase/specs/jvms/se21/html/jvms-4.html#jvms-4.7-320
+    """
+    CLASS_FILE = "ClassFile"
+    FIELD_INFO = "field_info"
+    METHOD_INFO = "method_info"
+    CODE = "Code"
+    RECORD_COMPONENT_INFO = "record_component_info"
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DecodePolicy:
+    """ Selects which attributes AttributeFactory decodes eagerly.
+
+    Attributes named in `eager` (all attributes with a decoder when `eager` is None) are decoded
+    while loading; every other attribute is returned as a RawAttributeInfo slice that can be
+    decoded later, or never. With `strict`, attributes without a decoder in their context raise
+    ValueError instead of passing through raw. `max_annotation_depth` bounds the nesting of
+    annotation values, see AnnotationBase.
+    """
+    eager: frozenset[str] | None = None
+    strict: bool = False
+    max_annotation_depth: int | None = None
+
+    @classmethod
+    def only(cls, *names: str, strict: bool = False, max_annotation_depth: int | None = None) -> "DecodePolicy":
+        """ A policy decoding only the named attributes eagerly. """
+        return cls(frozenset(str(name) for name in names), strict, max_annotation_depth)
+
+    def is_eager(self, attribute_name: str) -> bool:
+        return self.eager is None or attribute_name in self.eager
+
+
+DECODE_ALL = DecodePolicy()
+DECODE_NONE = DecodePolicy(frozenset())
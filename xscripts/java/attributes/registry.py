@@ -0,0 +1,107 @@
+from typing import Callable, Iterable
+
+from .attr import *
+from .enums import AttributeContext, AttributesTypes
+
+AttributeDecoder = Callable[[bytes], AttributeInfo]
+
+CLASS_FILE = AttributeContext.CLASS_FILE
+FIELD_INFO = AttributeContext.FIELD_INFO
+METHOD_INFO = AttributeContext.METHOD_INFO
+CODE = AttributeContext.CODE
+RECORD_COMPONENT_INFO = AttributeContext.RECORD_COMPONENT_INFO
+
+# See: https://docs.oracle.com/javase/specs/jvms/se21/html/jvms-4.html#jvms-4.7-320
+STANDARD_ATTRIBUTES: tuple[tuple[AttributesTypes, AttributeDecoder, tuple[AttributeContext, ...]], ...] = (
+    (AttributesTypes.CONSTANT_VALUE, ConstantValueAttributeInfo, (FIELD_INFO,)),
+    (AttributesTypes.CODE, CodeAttributeInfo, (METHOD_INFO,)),
+    (AttributesTypes.STACK_MAP_TABLE, StackMapTableAttributeInfo, (CODE,)),
+    (AttributesTypes.EXCEPTIONS, ExceptionsAttributeInfo, (METHOD_INFO,)),
+    (AttributesTypes.INNER_CLASSES, InnerClassesAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.ENCLOSING_METHOD, EnclosingMethodAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.SYNTHETIC, SyntheticAttributeInfo, (CLASS_FILE, FIELD_INFO, METHOD_INFO)),
+    (AttributesTypes.SIGNATURE, SignatureAttributeInfo, (CLASS_FILE, FIELD_INFO, METHOD_INFO, RECORD_COMPONENT_INFO)),
+    (AttributesTypes.SOURCE_FILE, SourceFileAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.SOURCE_DEBUG_EXTENSION, SourceDebugExtensionAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.LINE_NUMBER_TABLE, LineNumberTableAttributeInfo, (CODE,)),
+    (AttributesTypes.LOCAL_VARIABLE_TABLE, LocalVariableTableAttributeInfo, (CODE,)),
+    (AttributesTypes.LOCAL_VARIABLE_TYPE_TABLE, LocalVariableTypeTableAttributeInfo, (CODE,)),
+    (AttributesTypes.DEPRECATED, DeprecatedAttributeInfo, (CLASS_FILE, FIELD_INFO, METHOD_INFO)),
+    (AttributesTypes.RUNTIME_VISIBLE_ANNOTATIONS, RuntimeVisibleAnnotationsAttributeInfo,
+     (CLASS_FILE, FIELD_INFO, METHOD_INFO, RECORD_COMPONENT_INFO)),
+    (AttributesTypes.RUNTIME_INVISIBLE_ANNOTATIONS, RuntimeInvisibleAnnotationsAttributeInfo,
+     (CLASS_FILE, FIELD_INFO, METHOD_INFO, RECORD_COMPONENT_INFO)),
+    (AttributesTypes.RUNTIME_VISIBLE_PARAMETER_ANNOTATIONS, RuntimeVisibleParameterAnnotationsAttributeInfo,
+     (METHOD_INFO,)),
+    (AttributesTypes.RUNTIME_INVISIBLE_PARAMETER_ANNOTATIONS, RuntimeInvisibleParameterAnnotationsAttributeInfo,
+     (METHOD_INFO,)),
+    (AttributesTypes.RUNTIME_VISIBLE_TYPE_ANNOTATIONS, RuntimeVisibleTypeAnnotationsAttributeInfo,
+     (CLASS_FILE, FIELD_INFO, METHOD_INFO, CODE, RECORD_COMPONENT_INFO)),
+    (AttributesTypes.RUNTIME_INVISIBLE_TYPE_ANNOTATIONS, RuntimeInvisibleTypeAnnotationsAttributeInfo,
+     (CLASS_FILE, FIELD_INFO, METHOD_INFO, CODE, RECORD_COMPONENT_INFO)),
+    (AttributesTypes.ANNOTATION_DEFAULT, AnnotationDefaultAttributeInfo, (METHOD_INFO,)),
+    (AttributesTypes.BOOTSTRAP_METHODS, BootstrapMethodsAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.METHOD_PARAMETERS, MethodParametersAttributeInfo, (METHOD_INFO,)),
+    (AttributesTypes.MODULE, ModuleAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.MODULE_PACKAGES, ModulePackagesAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.MODULE_MAIN_CLASS, ModuleMainClassAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.NEST_HOST, NestHostAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.NEST_MEMBERS, NestMembersAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.RECORD, RecordAttributeInfo, (CLASS_FILE,)),
+    (AttributesTypes.PERMITTED_SUBCLASSES, PermittedSubclassesAttributeInfo, (CLASS_FILE,)),
+)
+
+
+class AttributeRegistry:
+    """ Maps (attribute context, attribute name) to the decoder building the AttributeInfo.
+
+    A decoder is any callable taking the raw attribute bytes, including the 6 byte header.
+    `version` changes on every registration so resolved dispatch tables can notice they are stale.
+    """
+
+    def __init__(self) -> None:
+        self.__decoders: dict[AttributeContext, dict[str, AttributeDecoder]] = {
+            context: {} for context in AttributeContext}
+        self.version: int = 0
+
+    @classmethod
+    def standard(cls) -> "AttributeRegistry":
+        """ Create a registry with the attributes defined by the JVM specification. """
+        registry = cls()
+        for name, decoder, contexts in STANDARD_ATTRIBUTES:
+            registry.register(name, decoder, contexts)
+        return registry
+
+    def register(self, name: str, decoder: AttributeDecoder,
+                 contexts: Iterable[AttributeContext] = tuple(AttributeContext)) -> None:
+        """ Register a decoder for the named attribute in the given contexts, replacing any existing one. """
+        for context in contexts:
+            self.__decoders[AttributeContext(context)][str(name)] = decoder
+        self.version += 1
+
+    def unregister(self, name: str, contexts: Iterable[AttributeContext] = tuple(AttributeContext)) -> None:
+        for context in contexts:
+            self.__decoders[AttributeContext(context)].pop(str(name), None)
+        self.version += 1
+
+    def get(self, context: AttributeContext, name: str) -> AttributeDecoder | None:
+        return self.__decoders[context].get(name)
+
+    def copy(self) -> "AttributeRegistry":
+        registry = AttributeRegistry()
+        for context, decoders in self.__decoders.items():
+            for name, decoder in decoders.items():
+                registry.register(name, decoder, (context,))
+        return registry
+
+    def __repr__(self) -> str:
+        return f"AttributeRegistry({ {str(context): len(decoders) for context, decoders in self.__decoders.items()} })"
+
+
+DEFAULT_REGISTRY = AttributeRegistry.standard()
+
+
+def register_attribute_decoder(name: str, decoder: AttributeDecoder,
+                               contexts: Iterable[AttributeContext] = tuple(AttributeContext)) -> None:
+    """ Register a decoder, e.g. for a vendor attribute, in the default registry. """
+    DEFAULT_REGISTRY.register(name, decoder, contexts)
@@ -0,0 +1,381 @@
+import io
+import mmap
+import os
+import struct
+import weakref
+import zipfile
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from io import BytesIO
+from multiprocessing import Pool
+from typing import Callable, Iterable, Iterator, Sized, TypeVar
+
+from .instrumentation import Instrumentation
+from .limits import ParseLimits
+from .pipeline import ChunkedJavaClass, JavaClassDumpPipeline
+
+ARCHIVE_SUFFIXES = (".jar", ".war", ".ear", ".zip")
+CLASS_SUFFIX = ".class"
+MANIFEST = "META-INF/MANIFEST.MF"
+VERSIONS_PREFIX = "META-INF/versions/"
+# Versioned entries are only honoured from Java 9, the release that introduced multi-release jars.
+BASE_RELEASE = 8
+# signature, version, flags, method, time, date, crc, sizes, then the name and extra field lengths.
+LOCAL_FILE_HEADER = struct.Struct("<4s22xHH")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+# Archives opened by open_archive, and outer files mapped by _open_nested; closed by close_archives.
+_ARCHIVES: "weakref.WeakSet[zipfile.ZipFile]" = weakref.WeakSet()
+_NESTED_MAPS: "weakref.WeakSet[mmap.mmap]" = weakref.WeakSet()
+
+
+@lru_cache(maxsize=8)
+def open_archive(path: str) -> zipfile.ZipFile:
+    """Open an archive for reading, shared per process.
+
+    A few archives are kept open, since scans read many entries of the same archive in a row.
+    Callers must not close the returned ZipFile; close_archives closes them all once a scan is done.
+    """
+    archive = zipfile.ZipFile(path)
+    _ARCHIVES.add(archive)
+    return archive
+
+
+class BufferReader(io.RawIOBase):
+    """ A read-only, seekable stream over a buffer; reads slice the buffer instead of copying it whole. """
+
+    def __init__(self, buffer: memoryview) -> None:
+        super().__init__()
+        self.__buffer = buffer
+        self.__position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.__position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+        elif whence == io.SEEK_END:
+            offset += len(self.__buffer)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self.__position = offset
+        return offset
+
+    def read(self, size: int = -1) -> bytes:
+        start = self.__position
+        end = len(self.__buffer) if size is None or size < 0 else min(start + size, len(self.__buffer))
+        self.__position = max(end, start)
+        return self.__buffer[start:end].tobytes()
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def entry_window(view: memoryview, info: zipfile.ZipInfo) -> memoryview:
+    """ The stored bytes of an entry, sliced from the buffer of its archive without copying. """
+    signature, name_length, extra_length = LOCAL_FILE_HEADER.unpack_from(view, info.header_offset)
+    if signature != b"PK\x03\x04":
+        raise ValueError(f"Bad local file header for {info.filename} at offset {info.header_offset}")
+    start = info.header_offset + LOCAL_FILE_HEADER.size + name_length + extra_length
+    return view[start:start + info.compress_size]
+
+
+@lru_cache(maxsize=32)
+def _open_nested(path: str, nesting: tuple[str, ...]) -> tuple[memoryview, zipfile.ZipFile]:
+    """ Open an archive nested in other archives, as a window on the memory-mapped outer file.
+
+    STORED archives, like Spring Boot's BOOT-INF/lib jars, are opened in place; compressed ones
+    are inflated into memory. Nothing is extracted to disk.
+    """
+    if not nesting:
+        with open(path, "rb") as archive_file:
+            mapped = mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ)
+        _NESTED_MAPS.add(mapped)
+        view = memoryview(mapped)
+    else:
+        parent_view, parent = _open_nested(path, nesting[:-1])
+        info = parent.getinfo(nesting[-1])
+        if info.compress_type == zipfile.ZIP_STORED:
+            view = entry_window(parent_view, info)
+        else:
+            view = memoryview(parent.read(info))
+    return view, zipfile.ZipFile(BufferReader(view))
+
+
+def close_archives() -> None:
+    """ Close the archives shared by open_archive and _open_nested in this process.
+
+    Scans call it once they are done, see map_sources; later reads reopen what they need. A
+    mapped file stays mapped while a caller still holds a view of it, e.g. of an entry being
+    parsed, until that view is released.
+    """
+    open_archive.cache_clear()
+    for archive in list(_ARCHIVES):
+        archive.close()
+    _ARCHIVES.clear()
+    _open_nested.cache_clear()
+    for mapped in list(_NESTED_MAPS):
+        try:
+            mapped.close()
+        except BufferError:
+            # Still exported; the map is closed when its last view goes away.
+            continue
+        _NESTED_MAPS.discard(mapped)
+
+
+@dataclass(frozen=True)
+class ClassSource:
+    """ A class file on disk, or a class entry inside an archive.
+
+    `nesting` lists the entries of the archives within `path` that lead to `entry`, outermost
+    first, e.g. ("BOOT-INF/lib/dependency.jar",) for a class of a Spring Boot fat jar dependency.
+    Sources are small and picklable, so they can be handed to worker processes which then read
+    the bytes themselves.
+    """
+    path: str
+    entry: str | None = None
+    nesting: tuple[str, ...] = ()
+
+    def read(self) -> bytes:
+        if self.entry is None:
+            with open(self.path, "rb") as class_file:
+                return class_file.read()
+        if self.nesting:
+            return _open_nested(self.path, self.nesting)[1].read(self.entry)
+        return open_archive(self.path).read(self.entry)
+
+    def load(self, limits: ParseLimits | None = None, instrumentation: Instrumentation | None = None
+             ) -> ChunkedJavaClass:
+        """ Chunk the class; with limits, oversized entries are rejected before they are read. """
+        if self.entry is None:
+            return JavaClassDumpPipeline(self.path, instrumentation, limits).run()
+        if self.nesting:
+            view, archive = _open_nested(self.path, self.nesting)
+        else:
+            view, archive = None, open_archive(self.path)
+        info = archive.getinfo(self.entry)
+        if limits is not None:
+            limits.check("max_class_bytes", info.file_size)
+        if view is not None and info.compress_type == zipfile.ZIP_STORED:
+            return JavaClassDumpPipeline.dump(BufferReader(entry_window(view, info)), instrumentation, limits)
+        with BytesIO(archive.read(info)) as class_file:
+            return JavaClassDumpPipeline.dump(class_file, instrumentation, limits)
+
+    def offset(self) -> int:
+        """ Byte offset of the entry's local file header in its (innermost) archive, 0 for plain class files. """
+        if self.entry is None:
+            return 0
+        if self.nesting:
+            return _open_nested(self.path, self.nesting)[1].getinfo(self.entry).header_offset
+        return open_archive(self.path).getinfo(self.entry).header_offset
+
+    @property
+    def entry_path(self) -> str | None:
+        """ The entry with the nested archives leading to it, e.g. BOOT-INF/lib/a.jar!/a/A.class. """
+        if self.entry is None:
+            return None
+        return "!/".join((*self.nesting, self.entry))
+
+    def __str__(self) -> str:
+        return self.path if self.entry is None else f"{self.path}!/{self.entry_path}"
+
+
+def is_archive(path: str) -> bool:
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def read_manifest(archive: zipfile.ZipFile) -> dict[str, str]:
+    """ The main section attributes of a jar manifest, empty if there is none. """
+    if MANIFEST not in archive.NameToInfo:
+        return {}
+    attributes = {}
+    name = None
+    for line in archive.read(MANIFEST).decode("utf-8", errors="replace").splitlines():
+        if not line:
+            break
+        if line.startswith(" ") and name is not None:
+            attributes[name] += line[1:]
+            continue
+        name, _, value = line.partition(":")
+        attributes[name] = value.strip()
+    return attributes
+
+
+def is_multi_release(archive: zipfile.ZipFile) -> bool:
+    return read_manifest(archive).get("Multi-Release", "").lower() == "true"
+
+
+def entry_release(entry: str) -> tuple[int, str] | None:
+    """ Split META-INF/versions/<n>/<name> into (n, name); None for unversioned or malformed entries. """
+    if not entry.startswith(VERSIONS_PREFIX):
+        return None
+    version, _, name = entry[len(VERSIONS_PREFIX):].partition("/")
+    if not version.isdigit() or not name:
+        return None
+    return int(version), name
+
+
+def resolve_release_entries(archive: zipfile.ZipFile, release: int) -> dict[str, zipfile.ZipInfo]:
+    """ Map each class entry name to the entry a JVM of the given release loads it from.
+
+    Works on the central directory alone. In a multi-release jar, the highest
+    META-INF/versions/<n> overlay with BASE_RELEASE < n <= release wins over the base entry;
+    without Multi-Release: true in the manifest, versioned entries are ignored, as the JVM does.
+    Names keep the central directory order of their first entry.
+    """
+    multi_release = is_multi_release(archive)
+    chosen: dict[str, tuple[int, zipfile.ZipInfo]] = {}
+    for info in archive.infolist():
+        if info.is_dir() or not info.filename.endswith(CLASS_SUFFIX):
+            continue
+        if info.filename.startswith(VERSIONS_PREFIX):
+            versioned = entry_release(info.filename)
+            if not multi_release or versioned is None or not BASE_RELEASE < versioned[0] <= release:
+                continue
+            version, name = versioned
+        else:
+            version, name = BASE_RELEASE, info.filename
+        current = chosen.get(name)
+        if current is None or version > current[0]:
+            chosen[name] = version, info
+    return {name: info for name, (_, info) in chosen.items()}
+
+
+class _ScanBudget:
+    """ Enforces the archive limits of a ParseLimits over one scan, on central directory metadata only. """
+
+    def __init__(self, limits: ParseLimits) -> None:
+        self.limits: ParseLimits = limits
+        self.total_bytes = 0
+
+    def charge(self, size: int) -> None:
+        self.total_bytes += size
+        self.limits.check("max_total_bytes", self.total_bytes)
+
+    def check_archive(self, archive: zipfile.ZipFile, nesting: tuple[str, ...]) -> None:
+        self.limits.check("max_nesting_depth", len(nesting))
+        self.limits.check("max_archive_entries", len(archive.infolist()))
+
+
+def _iter_zip_class_sources(archive: zipfile.ZipFile, path: str, nesting: tuple[str, ...], release: int | None,
+                            nested: bool, budget: _ScanBudget | None = None) -> Iterator[ClassSource]:
+    if budget is not None:
+        budget.check_archive(archive, nesting)
+    if release is not None:
+        infos = resolve_release_entries(archive, release).values()
+    else:
+        infos = (info for info in archive.infolist() if not info.is_dir() and info.filename.endswith(CLASS_SUFFIX))
+    for info in infos:
+        if budget is not None:
+            budget.limits.check("max_class_bytes", info.file_size)
+            budget.charge(info.file_size)
+        yield ClassSource(path, info.filename, nesting)
+    if nested:
+        for info in archive.infolist():
+            if not info.is_dir() and is_archive(info.filename):
+                inner = (*nesting, info.filename)
+                if budget is not None:
+                    # Checked before the inner archive is opened, which inflates it if it is compressed.
+                    budget.limits.check("max_nesting_depth", len(inner))
+                    budget.charge(info.file_size)
+                yield from _iter_zip_class_sources(_open_nested(path, inner)[1], path, inner, release, nested, budget)
+
+
+def iter_archive_class_sources(archive_path: str, release: int | None = None, nested: bool = False,
+                               limits: ParseLimits | None = None) -> Iterator[ClassSource]:
+    """ Yield the class entries of an archive in central directory order.
+
+    With a target release, only the effective entry of each class is yielded, see resolve_release_entries.
+    With `nested`, the classes of archives inside the archive follow, at every depth, read in place.
+    With limits, entry counts, nesting depth and declared sizes raise LimitExceededError.
+    """
+    yield from _iter_archive_file(archive_path, release, nested, None if limits is None else _ScanBudget(limits))
+
+
+def _iter_archive_file(archive_path: str, release: int | None, nested: bool,
+                       budget: _ScanBudget | None) -> Iterator[ClassSource]:
+    with zipfile.ZipFile(archive_path) as archive:
+        yield from _iter_zip_class_sources(archive, archive_path, (), release, nested, budget)
+
+
+def iter_class_sources(paths: Iterable[str], release: int | None = None, nested: bool = False,
+                       limits: ParseLimits | None = None) -> Iterator[ClassSource]:
+    """ Expand class files, archives and directories (recursively, in sorted order) into class sources.
+
+    With a target release, archives yield one effective entry per class, honouring multi-release jars.
+    With `nested`, archives inside archives (e.g. BOOT-INF/lib jars) are scanned too. With limits,
+    the archive limits apply to each archive, and max_total_bytes to the whole scan.
+    """
+    budget = None if limits is None else _ScanBudget(limits)
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file_name in sorted(files):
+                    file_path = os.path.join(root, file_name)
+                    if file_name.endswith(CLASS_SUFFIX):
+                        if budget is not None:
+                            budget.charge(os.path.getsize(file_path))
+                        yield ClassSource(file_path)
+                    elif is_archive(file_name):
+                        yield from _iter_archive_file(file_path, release, nested, budget)
+        elif is_archive(path):
+            yield from _iter_archive_file(path, release, nested, budget)
+        else:
+            if budget is not None:
+                budget.charge(os.path.getsize(path))
+            yield ClassSource(path)
+
+
+class _Measured:
+    """ Worker entry: call a worker with a fresh Instrumentation and return both, to be merged by the parent. """
+
+    def __init__(self, fn: Callable[..., R], trace_memory: bool) -> None:
+        self.fn = fn
+        self.trace_memory = trace_memory
+
+    def __call__(self, item) -> tuple[R, Instrumentation]:
+        instrumentation = Instrumentation(self.trace_memory)
+        return self.fn(item, instrumentation=instrumentation), instrumentation
+
+
+def map_sources(fn: Callable[[T], R], items: Iterable[T], jobs: int = 1, chunksize: int = 1,
+                ordered: bool = True, instrumentation: Instrumentation | None = None) -> Iterator[R]:
+    """ Apply a worker function to every item, in a process pool when jobs > 1.
+
+    Items are consumed lazily. Ordered results follow the input, so e.g. the first occurrence of a
+    class on a classpath still wins; otherwise they arrive in completion order. Workers handle
+    their own per-item failures, an exception raised by `fn` ends the whole map. Once the map
+    ends, the archives the serial path opened in this process are closed; workers exit with their pool.
+
+    With instrumentation, `fn` is called with an `instrumentation` keyword; the stages measured
+    in worker processes are merged into it as their results arrive.
+    """
+    if isinstance(items, Sized):
+        jobs = min(jobs, len(items))
+    try:
+        if jobs <= 1:
+            yield from map(fn if instrumentation is None else partial(fn, instrumentation=instrumentation), items)
+            return
+        with Pool(jobs) as pool:
+            imap = pool.imap if ordered else pool.imap_unordered
+            if instrumentation is None:
+                yield from imap(fn, items, chunksize)
+                return
+            for result, measured in imap(_Measured(fn, instrumentation.trace_memory), items, chunksize):
+                instrumentation.merge(measured)
+                yield result
+    finally:
+        close_archives()
@@ -0,0 +1,377 @@
+import logging
+import mmap
+import struct
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from .classpath import ClassSource, iter_class_sources, map_sources
+from .instrumentation import Instrumentation
+from .java_class import JavaClass
+
+logger = logging.getLogger(__name__)
+
+NO_STRING = 0xFFFFFFFF
+
+
+@dataclass(frozen=True)
+class IndexedMember:
+    name: str
+    descriptor: str
+    access_flags: int
+
+
+@dataclass(frozen=True)
+class IndexedClass:
+    """ The metadata of one class kept in a classpath index. """
+    name: str
+    super_name: str | None
+    access_flags: int
+    minor_version: int
+    major_version: int
+    interfaces: tuple[str, ...]
+    fields: tuple[IndexedMember, ...]
+    methods: tuple[IndexedMember, ...]
+    path: str
+    entry: str | None
+    offset: int
+
+    @property
+    def package(self) -> str:
+        return _package(self.name)
+
+
+def _package(name: str) -> str:
+    return name.rpartition("/")[0]
+
+
+def _internal_name(name: str) -> str:
+    return name.replace(".", "/")
+
+
+class ClasspathIndex:
+    """ A classpath index file, queried in place through a read-only memory map.
+
+    Opening maps the file and reads the header; nothing else is decoded until a query touches it.
+    All strings live in one sorted table, so string ids compare like the strings themselves and
+    lookups are binary searches over fixed-size records.
+
+    Layout (little endian, every section aligned to 8 bytes):
+        header {
+            u1 magic[4];
+            u4 version;
+            u4 classes_count;
+            u4 strings_count;
+            u4 strings_size;
+            u4 interfaces_count;
+            u4 subtypes_count;
+            u4 members_count;
+        }
+        classes         class records sorted by (package, name), see RECORD
+        interfaces      u4[interfaces_count]        string ids, ranges referenced by class records
+        subtypes        {u4 super_id; u4 row}[subtypes_count]   sorted, one per super class or interface
+        members         {u4 name_id; u4 descriptor_id; u2 access_flags; u2 pad}[members_count]
+        string_offsets  u4[strings_count + 1]
+        string_data     u1[strings_size]                        UTF-8, sorted by bytes
+    """
+    MAGIC = b"XJCI"
+    VERSION = 1
+    HEADER = struct.Struct("<4sIIIIIII")
+    # name, package, super_name, access_flags, minor_version, major_version, pad, interfaces_start,
+    # interfaces_count, fields_start, fields_count, methods_start, methods_count, path, entry, offset
+    RECORD = struct.Struct("<IIIHHH2xIIIIIIIIQ")
+    PAIR = struct.Struct("<II")
+    U4 = struct.Struct("<I")
+    SUBTYPE = struct.Struct("<II")
+    MEMBER = struct.Struct("<IIH2x")
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + 7) & ~7
+
+    @classmethod
+    def layout(cls, classes_count: int, strings_count: int, interfaces_count: int, subtypes_count: int,
+               members_count: int) -> dict[str, int]:
+        """ Compute the byte offset of every section. """
+        offsets = {}
+        offset = cls._align(cls.HEADER.size)
+        for name, size in (("classes", classes_count * cls.RECORD.size),
+                           ("interfaces", interfaces_count * cls.U4.size),
+                           ("subtypes", subtypes_count * cls.SUBTYPE.size),
+                           ("members", members_count * cls.MEMBER.size),
+                           ("string_offsets", (strings_count + 1) * cls.U4.size)):
+            offsets[name] = offset
+            offset = cls._align(offset + size)
+        offsets["string_data"] = offset
+        return offsets
+
+    def __init__(self, buffer: mmap.mmap | bytes) -> None:
+        self.__buffer = buffer
+        (magic, version, classes_count, strings_count, _, interfaces_count, subtypes_count,
+         members_count) = self.HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"Not a version {self.VERSION} classpath index")
+        self.classes_count: int = classes_count
+        self.strings_count: int = strings_count
+        self.subtypes_count: int = subtypes_count
+        self.__offsets = self.layout(classes_count, strings_count, interfaces_count, subtypes_count, members_count)
+
+    @classmethod
+    def open(cls, path: str) -> "ClasspathIndex":
+        with open(path, "rb") as index_file:
+            return cls(mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def string(self, string_id: int) -> str | None:
+        if string_id == NO_STRING:
+            return None
+        return str(self.__string_bytes(string_id), "utf-8")
+
+    def __string_bytes(self, string_id: int) -> bytes:
+        start, end = self.PAIR.unpack_from(self.__buffer, self.__offsets["string_offsets"] + string_id * 4)
+        data = self.__offsets["string_data"]
+        return self.__buffer[data + start:data + end]
+
+    def string_id(self, string: str) -> int | None:
+        """ Find the id of a string by binary search over the sorted string table. """
+        target = string.encode("utf-8")
+        lo, hi = 0, self.strings_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__string_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.strings_count and self.__string_bytes(lo) == target:
+            return lo
+        return None
+
+    def __record(self, row: int) -> tuple:
+        return self.RECORD.unpack_from(self.__buffer, self.__offsets["classes"] + row * self.RECORD.size)
+
+    def __key(self, row: int) -> tuple[int, int]:
+        name_id, package_id = self.PAIR.unpack_from(self.__buffer, self.__offsets["classes"] + row * self.RECORD.size)
+        return package_id, name_id
+
+    def __lower_bound(self, key: tuple[int, int]) -> int:
+        lo, hi = 0, self.classes_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find_row(self, name: str) -> int | None:
+        """ Get the row of a class by binary or internal name. """
+        name = _internal_name(name)
+        name_id = self.string_id(name)
+        package_id = self.string_id(_package(name))
+        if name_id is None or package_id is None:
+            return None
+        row = self.__lower_bound((package_id, name_id))
+        if row < self.classes_count and self.__key(row) == (package_id, name_id):
+            return row
+        return None
+
+    def class_name(self, row: int) -> str:
+        return self.string(self.__record(row)[0])
+
+    def __members(self, start: int, count: int) -> tuple[IndexedMember, ...]:
+        offset = self.__offsets["members"]
+        return tuple(IndexedMember(self.string(name_id), self.string(descriptor_id), access_flags)
+                     for name_id, descriptor_id, access_flags in
+                     (self.MEMBER.unpack_from(self.__buffer, offset + i * self.MEMBER.size)
+                      for i in range(start, start + count)))
+
+    def get(self, row: int) -> IndexedClass:
+        """ Decode the full record of a class row. """
+        (name_id, _, super_id, access_flags, minor_version, major_version, interfaces_start, interfaces_count,
+         fields_start, fields_count, methods_start, methods_count, path_id, entry_id, offset) = self.__record(row)
+        interfaces = self.__offsets["interfaces"]
+        return IndexedClass(
+            self.string(name_id), self.string(super_id), access_flags, minor_version, major_version,
+            tuple(self.string(self.U4.unpack_from(self.__buffer, interfaces + i * 4)[0])
+                  for i in range(interfaces_start, interfaces_start + interfaces_count)),
+            self.__members(fields_start, fields_count), self.__members(methods_start, methods_count),
+            self.string(path_id), self.string(entry_id), offset)
+
+    def find(self, name: str) -> IndexedClass | None:
+        row = self.find_row(name)
+        return None if row is None else self.get(row)
+
+    def package_classes(self, package: str) -> list[str]:
+        """ List the classes of a package (not of its subpackages), sorted by name. """
+        package_id = self.string_id(_internal_name(package).strip("/"))
+        if package_id is None:
+            return []
+        row = self.__lower_bound((package_id, 0))
+        names = []
+        while row < self.classes_count and self.__key(row)[0] == package_id:
+            names.append(self.class_name(row))
+            row += 1
+        return names
+
+    def subtypes(self, name: str) -> list[str]:
+        """ List the indexed classes that directly extend or implement a class. """
+        super_id = self.string_id(_internal_name(name))
+        if super_id is None:
+            return []
+        offset = self.__offsets["subtypes"]
+        lo, hi = 0, self.subtypes_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.SUBTYPE.unpack_from(self.__buffer, offset + mid * self.SUBTYPE.size)[0] < super_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        names = []
+        while lo < self.subtypes_count:
+            edge_super_id, row = self.SUBTYPE.unpack_from(self.__buffer, offset + lo * self.SUBTYPE.size)
+            if edge_super_id != super_id:
+                break
+            names.append(self.class_name(row))
+            lo += 1
+        return names
+
+    def __len__(self) -> int:
+        return self.classes_count
+
+    def __contains__(self, name: str) -> bool:
+        return self.find_row(name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.class_name(row) for row in range(self.classes_count))
+
+    def close(self) -> None:
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+
+    def __enter__(self) -> "ClasspathIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"ClasspathIndex(classes={self.classes_count}, strings={self.strings_count})"
+
+
+class ClasspathIndexWriter:
+    """ Collects IndexedClass records and writes them out as a ClasspathIndex file. """
+
+    def __init__(self) -> None:
+        self.__classes: dict[str, IndexedClass] = {}
+
+    def add(self, indexed_class: IndexedClass) -> None:
+        """ Add a class; the first class added under a name wins, as on a classpath. """
+        self.__classes.setdefault(indexed_class.name, indexed_class)
+
+    def __len__(self) -> int:
+        return len(self.__classes)
+
+    def to_bytes(self) -> bytes:
+        classes = sorted(self.__classes.values(), key=lambda c: (c.package.encode("utf-8"), c.name.encode("utf-8")))
+
+        strings = set()
+        for indexed_class in classes:
+            strings.update((indexed_class.name, indexed_class.package, indexed_class.path, *indexed_class.interfaces))
+            strings.update(s for s in (indexed_class.super_name, indexed_class.entry) if s is not None)
+            for member in (*indexed_class.fields, *indexed_class.methods):
+                strings.update((member.name, member.descriptor))
+        encoded = sorted(string.encode("utf-8") for string in strings)
+        ids = {string.decode("utf-8"): string_id for string_id, string in enumerate(encoded)}
+
+        def string_id(string: str | None) -> int:
+            return NO_STRING if string is None else ids[string]
+
+        records, interfaces, subtypes, members = [], [], [], []
+        for row, indexed_class in enumerate(classes):
+            interfaces_start = len(interfaces)
+            interfaces.extend(ids[interface] for interface in indexed_class.interfaces)
+            fields_start = len(members)
+            members.extend(indexed_class.fields)
+            methods_start = len(members)
+            members.extend(indexed_class.methods)
+            for super_name in (indexed_class.super_name, *indexed_class.interfaces):
+                if super_name is not None:
+                    subtypes.append((ids[super_name], row))
+            records.append((ids[indexed_class.name], ids[indexed_class.package], string_id(indexed_class.super_name),
+                            indexed_class.access_flags, indexed_class.minor_version, indexed_class.major_version,
+                            interfaces_start, len(indexed_class.interfaces), fields_start, len(indexed_class.fields),
+                            methods_start, len(indexed_class.methods), ids[indexed_class.path],
+                            string_id(indexed_class.entry), indexed_class.offset))
+        subtypes.sort()
+
+        string_data = b"".join(encoded)
+        string_offsets = [0]
+        for string in encoded:
+            string_offsets.append(string_offsets[-1] + len(string))
+
+        offsets = ClasspathIndex.layout(len(records), len(encoded), len(interfaces), len(subtypes), len(members))
+        buffer = bytearray(offsets["string_data"] + len(string_data))
+        ClasspathIndex.HEADER.pack_into(buffer, 0, ClasspathIndex.MAGIC, ClasspathIndex.VERSION, len(records),
+                                        len(encoded), len(string_data), len(interfaces), len(subtypes), len(members))
+        for row, record in enumerate(records):
+            ClasspathIndex.RECORD.pack_into(buffer, offsets["classes"] + row * ClasspathIndex.RECORD.size, *record)
+        struct.pack_into(f"<{len(interfaces)}I", buffer, offsets["interfaces"], *interfaces)
+        for i, subtype in enumerate(subtypes):
+            ClasspathIndex.SUBTYPE.pack_into(buffer, offsets["subtypes"] + i * ClasspathIndex.SUBTYPE.size, *subtype)
+        for i, member in enumerate(members):
+            ClasspathIndex.MEMBER.pack_into(buffer, offsets["members"] + i * ClasspathIndex.MEMBER.size,
+                                            ids[member.name], ids[member.descriptor], member.access_flags)
+        struct.pack_into(f"<{len(string_offsets)}I", buffer, offsets["string_offsets"], *string_offsets)
+        buffer[offsets["string_data"]:] = string_data
+        return bytes(buffer)
+
+    def write(self, path: str) -> None:
+        with open(path, "wb") as index_file:
+            index_file.write(self.to_bytes())
+
+
+def index_class(java_class: JavaClass, path: str, entry: str | None = None, offset: int = 0) -> IndexedClass:
+    """ Extract the indexed metadata of a parsed class. """
+    constant_pool = java_class.constant_pool
+
+    def members(items) -> tuple[IndexedMember, ...]:
+        return tuple(IndexedMember(constant_pool.get_utf8_constant_pool_info(member.name_index).string,
+                                   constant_pool.get_utf8_constant_pool_info(member.descriptor_index).string,
+                                   member.access_flags) for member in items)
+
+    return IndexedClass(
+        java_class.get_class_name(),
+        java_class.get_super_class_name() if java_class.super_class else None,
+        java_class.access_flags, java_class.get_minor_version(), java_class.get_major_version(),
+        tuple(java_class.get_interfaces()), members(java_class.get_fields()), members(java_class.get_methods()),
+        path, entry, offset)
+
+
+def _index_source(source: ClassSource, instrumentation: Instrumentation | None = None) -> IndexedClass | None:
+    try:
+        java_class = JavaClass(source.load(instrumentation=instrumentation), instrumentation)
+        return index_class(java_class, source.path, source.entry_path, source.offset())
+    except Exception:
+        logger.warning("Failed to index %s", source, exc_info=True)
+        return None
+
+
+def build_classpath_index(paths: Iterable[str], output: str, jobs: int = 1, chunksize: int = 64,
+                          release: int | None = None, nested: bool = False,
+                          instrumentation: Instrumentation | None = None) -> int:
+    """ Scan class files, archives and directories into an index file. Returns the number of classes.
+
+    When a class name occurs more than once, the first occurrence in path order is kept. With a
+    target release, multi-release jars contribute the variant that release would load. With
+    `nested`, classes of archives inside archives are indexed under entries like a.jar!/a/A.class,
+    with the offset in the innermost archive.
+    """
+    writer = ClasspathIndexWriter()
+    sources = iter_class_sources(paths, release, nested)
+
+    def add_all(results: Iterable[IndexedClass | None]) -> None:
+        for indexed_class in results:
+            if indexed_class is not None:
+                writer.add(indexed_class)
+
+    add_all(map_sources(_index_source, sources, jobs, chunksize, instrumentation=instrumentation))
+    writer.write(output)
+    return len(writer)
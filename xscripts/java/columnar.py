@@ -0,0 +1,249 @@
+import logging
+import os
+import struct
+from array import array
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, Sequence
+
+from .java_class import JavaClass
+from .pipeline import JavaClassDumpPipeline
+
+logger = logging.getLogger(__name__)
+
+NO_STRING = 0xFFFFFFFF
+
+
+class ClassColumns:
+    """ Per-class metadata of a scan batch, stored column by column in shared memory.
+
+    Worker processes write a block and hand only its name back to the parent, which maps the
+    columns zero-copy as memoryviews. Strings (class names) are interned per block; the
+    string columns hold ids into the block's string table, NO_STRING marks an absent value.
+
+    Layout (native byte order, every section aligned to 8 bytes):
+        header {
+            u1 magic[4];
+            u4 version;
+            u4 rows;
+            u4 strings_count;
+            u4 strings_size;
+        }
+        columns         one array of `rows` items per entry of COLUMNS
+        string_offsets  u4[strings_count + 1]
+        string_data     u1[strings_size]
+    """
+    MAGIC = b"XJCC"
+    VERSION = 1
+    HEADER = struct.Struct("=4sIIII")
+    COLUMNS: tuple[tuple[str, str], ...] = (
+        ("this_class", "I"),
+        ("super_class", "I"),
+        ("access_flags", "H"),
+        ("minor_version", "H"),
+        ("major_version", "H"),
+        ("interfaces_count", "H"),
+        ("fields_count", "H"),
+        ("methods_count", "H"),
+    )
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + 7) & ~7
+
+    @classmethod
+    def layout(cls, rows: int, strings_count: int) -> tuple[dict[str, int], int, int]:
+        """ Compute the byte offsets of every column, the string offsets and the string data. """
+        offset = cls._align(cls.HEADER.size)
+        offsets = {}
+        for name, typecode in cls.COLUMNS:
+            offsets[name] = offset
+            offset = cls._align(offset + rows * array(typecode).itemsize)
+        string_offsets_offset = offset
+        string_data_offset = cls._align(offset + (strings_count + 1) * array("I").itemsize)
+        return offsets, string_offsets_offset, string_data_offset
+
+    def __init__(self, shm: SharedMemory, owner: bool = True) -> None:
+        self.__shm: SharedMemory | None = shm
+        self.__owner = owner
+
+        magic, version, rows, strings_count, strings_size = self.HEADER.unpack_from(shm.buf, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"Shared memory block {shm.name} is not a version {self.VERSION} class columns block")
+
+        self.rows: int = rows
+        self.strings_count: int = strings_count
+
+        offsets, string_offsets_offset, string_data_offset = self.layout(rows, strings_count)
+        buffer = shm.buf
+        self.__columns: dict[str, memoryview] = {
+            name: buffer[offsets[name]:offsets[name] + rows * array(typecode).itemsize].cast(typecode)
+            for name, typecode in self.COLUMNS
+        }
+        self.__string_offsets: memoryview = buffer[
+            string_offsets_offset:string_offsets_offset + (strings_count + 1) * array("I").itemsize].cast("I")
+        self.__string_data: memoryview = buffer[string_data_offset:string_data_offset + strings_size]
+
+    @classmethod
+    def attach(cls, name: str, owner: bool = True) -> "ClassColumns":
+        """ Map an existing block by name. An owner unlinks the block when it is closed. """
+        return cls(SharedMemory(name=name, track=False), owner)
+
+    @property
+    def name(self) -> str:
+        if self.__shm is None:
+            raise ValueError("Class columns block is closed")
+        return self.__shm.name
+
+    def column(self, name: str) -> memoryview:
+        """ Get a column as a zero-copy memoryview over the shared memory block. """
+        return self.__columns[name]
+
+    def string(self, string_id: int) -> str | None:
+        """ Resolve an interned string id of this block. """
+        if string_id == NO_STRING:
+            return None
+        start = self.__string_offsets[string_id]
+        end = self.__string_offsets[string_id + 1]
+        return str(self.__string_data[start:end], "utf-8")
+
+    def class_name(self, row: int) -> str:
+        return self.string(self.__columns["this_class"][row])
+
+    def super_class_name(self, row: int) -> str | None:
+        return self.string(self.__columns["super_class"][row])
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self) -> None:
+        """ Release the views and the mapping, unlinking the block if this handle owns it. """
+        if self.__shm is None:
+            return
+        for view in self.__columns.values():
+            view.release()
+        self.__columns = {}
+        self.__string_offsets.release()
+        self.__string_data.release()
+        self.__shm.close()
+        if self.__owner:
+            self.__shm.unlink()
+        self.__shm = None
+
+    def __enter__(self) -> "ClassColumns":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"ClassColumns(name={self.__shm.name if self.__shm else None}, rows={self.rows})"
+
+
+class ClassColumnsWriter:
+    """ Accumulates per-class metadata and writes it out as a ClassColumns block. """
+
+    def __init__(self) -> None:
+        self.__columns: dict[str, array] = {name: array(typecode) for name, typecode in ClassColumns.COLUMNS}
+        self.__strings: dict[str, int] = {}
+        self.__string_data = bytearray()
+        self.__string_offsets = array("I", [0])
+
+    def intern(self, string: str) -> int:
+        string_id = self.__strings.get(string)
+        if string_id is None:
+            string_id = len(self.__strings)
+            self.__strings[string] = string_id
+            self.__string_data += string.encode("utf-8")
+            self.__string_offsets.append(len(self.__string_data))
+        return string_id
+
+    def append(self, java_class: JavaClass) -> None:
+        """ Add a row; the class is read completely first, so a malformed class adds nothing. """
+        class_name = java_class.get_class_name()
+        super_class_name = java_class.get_super_class_name() if java_class.super_class else None
+        row = (java_class.access_flags, java_class.get_minor_version(), java_class.get_major_version(),
+               java_class.get_interfaces_count(), java_class.get_fields_count(), java_class.get_methods_count())
+        columns = self.__columns
+        columns["this_class"].append(self.intern(class_name))
+        columns["super_class"].append(NO_STRING if super_class_name is None else self.intern(super_class_name))
+        for (name, _), value in zip(ClassColumns.COLUMNS[2:], row):
+            columns[name].append(value)
+
+    def __len__(self) -> int:
+        return len(self.__columns["this_class"])
+
+    def to_shared_memory(self) -> SharedMemory:
+        """ Write the block into a new untracked shared memory segment; the reader takes ownership. """
+        rows = len(self)
+        strings_count = len(self.__strings)
+        offsets, string_offsets_offset, string_data_offset = ClassColumns.layout(rows, strings_count)
+        size = string_data_offset + len(self.__string_data)
+
+        shm = SharedMemory(create=True, size=max(size, 1), track=False)
+        buffer = shm.buf
+        ClassColumns.HEADER.pack_into(buffer, 0, ClassColumns.MAGIC, ClassColumns.VERSION, rows, strings_count,
+                                      len(self.__string_data))
+        for name, column in self.__columns.items():
+            buffer[offsets[name]:offsets[name] + len(column) * column.itemsize] = memoryview(column).cast("B")
+        offsets_view = memoryview(self.__string_offsets).cast("B")
+        buffer[string_offsets_offset:string_offsets_offset + len(offsets_view)] = offsets_view
+        buffer[string_data_offset:size] = self.__string_data
+        shm.close()
+
+        return shm
+
+
+def _write_class_columns(class_file_paths: Sequence[str]) -> str:
+    """ Worker entry: parse a batch of class files and return the name of its columns block.
+
+    Class files that fail to parse are logged and left out of the block.
+    """
+    writer = ClassColumnsWriter()
+    for class_file_path in class_file_paths:
+        try:
+            writer.append(JavaClass(JavaClassDumpPipeline(class_file_path).run()))
+        except Exception:
+            logger.warning("Failed to parse %s", class_file_path, exc_info=True)
+    return writer.to_shared_memory().name
+
+
+def scan_class_columns(class_file_paths: Iterable[str], jobs: int | None = None,
+                       batch_size: int = 1024) -> Iterator[ClassColumns]:
+    """ Parse class files in worker processes and yield one ClassColumns block per batch.
+
+    Blocks are yielded in completion order and are owned by the caller, who must close them.
+    At most two batches per worker are in flight, so memory stays bounded for any input size.
+    """
+    paths = iter(class_file_paths)
+
+    def next_batch() -> list[str]:
+        batch = []
+        for path in paths:
+            batch.append(path)
+            if len(batch) == batch_size:
+                break
+        return batch
+
+    jobs = jobs or os.process_cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: set[Future[str]] = set()
+        done: set[Future[str]] = set()
+        try:
+            while True:
+                while len(pending) < 2 * jobs:
+                    batch = next_batch()
+                    if not batch:
+                        break
+                    pending.add(executor.submit(_write_class_columns, batch))
+                if not pending:
+                    return
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                while done:
+                    yield ClassColumns.attach(done.pop().result())
+        finally:
+            # Reclaim blocks the caller never received.
+            for future in pending | done:
+                if not future.cancel() and future.exception() is None:
+                    ClassColumns.attach(future.result()).close()
@@ -0,0 +1,133 @@
+import dataclasses
+import logging
+import zipfile
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable
+
+from .classpath import CLASS_SUFFIX, ClassSource, map_sources
+from .classpath_index import IndexedClass, index_class
+from .instrumentation import Instrumentation
+from .java_class import JavaClass
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class ClassCopy:
+    """ One copy of a class, as listed in the central directory of a jar. """
+    jar: str
+    entry: str
+    crc: int
+    size: int
+
+
+@dataclass(frozen=True)
+class ClassConflict:
+    """ A class found in more than one jar. `copies` are in classpath order, so the first one wins.
+
+    `structurally_different` is None when all copies have the same CRC32 and size and were never
+    parsed, or when a copy failed to parse; otherwise it tells whether their signatures (super
+    types, flags, members) differ.
+    """
+    name: str
+    copies: tuple[ClassCopy, ...]
+    structurally_different: bool | None
+
+    @property
+    def winner(self) -> str:
+        return self.copies[0].jar
+
+    @property
+    def identical(self) -> bool:
+        first = self.copies[0]
+        return all(copy.crc == first.crc and copy.size == first.size for copy in self.copies[1:])
+
+
+@dataclass(frozen=True)
+class ConflictReport:
+    conflicts: tuple[ClassConflict, ...]
+    split_packages: dict[str, tuple[str, ...]]
+
+    @property
+    def differing(self) -> tuple[ClassConflict, ...]:
+        return tuple(conflict for conflict in self.conflicts if not conflict.identical)
+
+
+def _is_versioned_entry(entry: str) -> bool:
+    # Multi-release variants and module descriptors legitimately repeat across jars.
+    return entry.startswith("META-INF/") or entry.endswith("module-info.class")
+
+
+def read_class_entries(jar: str) -> list[ClassCopy]:
+    """ List the class entries of a jar from its central directory, without reading any entry data. """
+    with zipfile.ZipFile(jar) as archive:
+        return [ClassCopy(jar, info.filename, info.CRC, info.file_size) for info in archive.infolist()
+                if info.filename.endswith(CLASS_SUFFIX) and not info.is_dir()
+                and not _is_versioned_entry(info.filename)]
+
+
+def _structure(copy: ClassCopy, instrumentation: Instrumentation | None = None) -> IndexedClass | None:
+    """ The location-free signature of a class copy, None if it cannot be parsed. """
+    source = ClassSource(copy.jar, copy.entry)
+    try:
+        java_class = JavaClass(source.load(instrumentation=instrumentation), instrumentation)
+        indexed_class = index_class(java_class, copy.jar, copy.entry)
+    except Exception:
+        logger.warning("Failed to parse %s", source, exc_info=True)
+        return None
+    return dataclasses.replace(indexed_class, path="", entry=None, offset=0)
+
+
+def detect_conflicts(jars: Iterable[str], jobs: int = 1,
+                     instrumentation: Instrumentation | None = None) -> ConflictReport:
+    """ Find classes present in several jars, and packages split across jars.
+
+    Jars are given in classpath order. Central directories are read in parallel; copies whose
+    CRC32 and size all match are reported as identical without being decompressed. Only copies
+    that differ are parsed, to tell a structural difference from e.g. different debug info.
+    """
+    jars = list(dict.fromkeys(jars))
+    copies_by_name: dict[str, list[ClassCopy]] = defaultdict(list)
+    jars_by_package: dict[str, dict[str, None]] = defaultdict(dict)
+    for entries in map_sources(read_class_entries, jars, jobs):
+        for copy in entries:
+            name = copy.entry[:-len(CLASS_SUFFIX)]
+            copies_by_name[name].append(copy)
+            jars_by_package[name.rpartition("/")[0]][copy.jar] = None
+
+    duplicates = {name: copies for name, copies in copies_by_name.items() if len(copies) > 1}
+    differing = [copy for copies in duplicates.values()
+                 if any((copy.crc, copy.size) != (copies[0].crc, copies[0].size) for copy in copies)
+                 for copy in copies]
+    structures = dict(zip(differing, map_sources(_structure, differing, jobs, instrumentation=instrumentation)))
+
+    conflicts = []
+    for name in sorted(duplicates):
+        copies = duplicates[name]
+        structurally_different = None
+        if copies[0] in structures and all(structures[copy] is not None for copy in copies):
+            structurally_different = len({structures[copy] for copy in copies}) > 1
+        conflicts.append(ClassConflict(name, tuple(copies), structurally_different))
+
+    split_packages = {package: tuple(package_jars) for package, package_jars in sorted(jars_by_package.items())
+                      if len(package_jars) > 1}
+    return ConflictReport(tuple(conflicts), split_packages)
+
+
+def format_report(report: ConflictReport) -> str:
+    lines = []
+    for conflict in report.conflicts:
+        if conflict.identical:
+            status = "identical"
+        elif conflict.structurally_different:
+            status = "structurally different"
+        elif conflict.structurally_different is None:
+            status = "bytes differ, failed to parse"
+        else:
+            status = "bytes differ, same structure"
+        lines.append(f"{conflict.name}: {status}, wins: {conflict.winner}")
+        for copy in conflict.copies[1:]:
+            lines.append(f"    shadowed: {copy.jar}")
+    for package, package_jars in report.split_packages.items():
+        lines.append(f"split package {package or '<default>'}: {', '.join(package_jars)}")
+    return "\n".join(lines)
@@ -4,6 +4,6 @@ from .info import ConstantPoolInfo, Utf8ConstantPoolInfo, IntegerConstantPoolInf
     NameAndTypeConstantPoolInfo, MethodHandleConstantPoolInfo, MethodTypeConstantPoolInfo, DynamicConstantPoolInfo, \
     InvokeDynamicConstantPoolInfo, ModuleConstantPoolInfo, PackageConstantPoolInfo
 
-from .enums import ConstantPoolInfoTags
-from .pool import ConstantPool
+from .enums import ConstantPoolInfoTags, ReferenceKind
+from .pool import ConstantPool, MemberRef
 from .factory import ConstantPoolFactory
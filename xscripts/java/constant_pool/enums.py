@@ -41,3 +41,19 @@ class ConstantPoolInfoTags(IntEnum):
     INVOKE_DYNAMIC = 18
     MODULE = 19
     PACKAGE = 20
+
+
+class ReferenceKind(IntEnum):
+    """ Kinds of method handles, the reference_kind item of CONSTANT_MethodHandle.
+
+    Refer: https://docs.oracle.com/javase/specs/jvms/se21/html/jvms-5.html#jvms-5.4.3.5-220
+    """
+    GET_FIELD = 1
+    GET_STATIC = 2
+    PUT_FIELD = 3
+    PUT_STATIC = 4
+    INVOKE_VIRTUAL = 5
+    INVOKE_STATIC = 6
+    INVOKE_SPECIAL = 7
+    NEW_INVOKE_SPECIAL = 8
+    INVOKE_INTERFACE = 9
@@ -35,7 +35,7 @@ class ConstantPoolFactory:
                      ConstantPoolInfoTags.MODULE, ConstantPoolInfoTags.PACKAGE):
             return 3
         elif tag in (ConstantPoolInfoTags.FIELDREF, ConstantPoolInfoTags.NAME_AND_TYPE, ConstantPoolInfoTags.METHODREF,
-                     ConstantPoolInfoTags.INVOKE_DYNAMIC, ConstantPoolInfoTags.INVOKE_DYNAMIC,
+                     ConstantPoolInfoTags.DYNAMIC, ConstantPoolInfoTags.INVOKE_DYNAMIC,
                      ConstantPoolInfoTags.INTERFACE_METHODREF):
             return 5
         elif tag is ConstantPoolInfoTags.METHOD_HANDLE:
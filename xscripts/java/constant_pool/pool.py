@@ -1,11 +1,38 @@
-from typing import Iterable, Iterator
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple
 
 from .info import *
 
+if TYPE_CHECKING:
+    from ..attributes import AttributeFactory
+
+MEMBER_REF_TYPES = (FieldrefConstantPoolInfo, MethodrefConstantPoolInfo, InterfaceMethodrefConstantPoolInfo)
+RESOLVABLE_TYPES = (*MEMBER_REF_TYPES, MethodHandleConstantPoolInfo, MethodTypeConstantPoolInfo)
+
+
+class MemberRef(NamedTuple):
+    """ A resolved member reference. MethodType entries only carry a descriptor. """
+    owner: str | None
+    name: str | None
+    descriptor: str
+
+
+class _ReverseIndex(NamedTuple):
+    """ Entries keyed by their content; references are keyed by the indexes they hold, so lookups chain. """
+    utf8s: dict[bytes, int]
+    classes: dict[int, int]
+    name_and_types: dict[tuple[int, int], int]
+    member_refs: dict[tuple[type, int, int], int]
+
 
 class ConstantPool:
     def __init__(self, pool: Iterable[ConstantPoolInfo]) -> None:
         self.pool: dict[int, ConstantPoolInfo] = dict()
+        # Resolved member references by pool index, allocated on first resolution.
+        self.__member_refs: list[MemberRef | None] | None = None
+        # The shared AttributeFactory of the pool, set by AttributeFactory.of on first use.
+        self.attribute_factory: "AttributeFactory | None" = None
+        # Reverse lookup tables, value to lowest index, built on the first find_* call.
+        self.__reverse: _ReverseIndex | None = None
 
         index = 1
         for info in pool:
@@ -146,3 +173,117 @@ class ConstantPool:
         if not isinstance(info, ModuleConstantPoolInfo):
             raise TypeError(f"Expected ModuleConstantPoolInfo at index {index}, got {type(info).__name__}.")
         return info
+
+    def resolve_member_ref(self, index: int) -> MemberRef:
+        """Resolve a Fieldref, Methodref, InterfaceMethodref, MethodHandle or MethodType entry.
+
+        Method handles resolve to the member they refer to. Results are memoized per pool, so
+        repeated resolutions are a list lookup.
+        """
+        member_refs = self.__member_refs
+        if member_refs is None:
+            member_refs = self.__member_refs = [None] * (len(self.pool) + 1)
+        if 0 < index < len(member_refs):
+            member_ref = member_refs[index]
+            if member_ref is not None:
+                return member_ref
+
+        info = self.get(index)
+        if isinstance(info, MEMBER_REF_TYPES):
+            class_info = self.get_class_constant_pool_info(info.class_index)
+            name_and_type = self.get_name_and_type_constant_pool_info(info.name_and_type_index)
+            member_ref = MemberRef(self.get_utf8_constant_pool_info(class_info.name_index).string,
+                                   self.get_utf8_constant_pool_info(name_and_type.name_index).string,
+                                   self.get_utf8_constant_pool_info(name_and_type.descriptor_index).string)
+        elif isinstance(info, MethodHandleConstantPoolInfo):
+            reference = self.get(info.reference_index)
+            if not isinstance(reference, MEMBER_REF_TYPES):
+                raise TypeError(f"Expected member reference at index {info.reference_index}, "
+                                f"got {type(reference).__name__}.")
+            member_ref = self.resolve_member_ref(info.reference_index)
+        elif isinstance(info, MethodTypeConstantPoolInfo):
+            member_ref = MemberRef(None, None, self.get_utf8_constant_pool_info(info.descriptor_index).string)
+        else:
+            raise TypeError(f"Expected member reference at index {index}, got {type(info).__name__}.")
+        member_refs[index] = member_ref
+        return member_ref
+
+    def resolve_all_refs(self) -> dict[int, MemberRef]:
+        """Resolve every member reference, method handle and method type of the pool by index."""
+        return {index: self.resolve_member_ref(index) for index, info in self.pool.items()
+                if isinstance(info, RESOLVABLE_TYPES)}
+
+    def __reverse_index(self) -> _ReverseIndex:
+        reverse = self.__reverse
+        if reverse is None:
+            reverse = self.__reverse = _ReverseIndex({}, {}, {}, {})
+            # Iterating indexes in ascending order and keeping the first hit makes duplicates resolve to the lowest.
+            # Entries may reference any duplicate, so references are mapped to that lowest index, the canonical
+            # one, before keying; the pool may also reference forward, hence one pass per level.
+            canonical: dict[int, int] = {}
+            for index, info in self.pool.items():
+                if isinstance(info, Utf8ConstantPoolInfo):
+                    canonical[index] = reverse.utf8s.setdefault(info.bytes, index)
+            for index, info in self.pool.items():
+                if isinstance(info, ClassConstantPoolInfo):
+                    name_index = canonical.get(info.name_index, info.name_index)
+                    canonical[index] = reverse.classes.setdefault(name_index, index)
+                elif isinstance(info, NameAndTypeConstantPoolInfo):
+                    key = (canonical.get(info.name_index, info.name_index),
+                           canonical.get(info.descriptor_index, info.descriptor_index))
+                    canonical[index] = reverse.name_and_types.setdefault(key, index)
+            for index, info in self.pool.items():
+                if isinstance(info, MEMBER_REF_TYPES):
+                    key = (type(info), canonical.get(info.class_index, info.class_index),
+                           canonical.get(info.name_and_type_index, info.name_and_type_index))
+                    reverse.member_refs.setdefault(key, index)
+        return reverse
+
+    def invalidate_reverse_index(self) -> None:
+        """Drop the reverse lookup tables after entries of the pool were replaced."""
+        self.__reverse = None
+
+    def find_utf8(self, value: str | bytes) -> int | None:
+        """Find the index of a Utf8 entry by its string or its encoded bytes, or None.
+
+        The first call indexes the whole pool, keyed by the entries' bytes so no string is decoded;
+        every lookup after that is a dict lookup.
+        """
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        return self.__reverse_index().utf8s.get(value)
+
+    def find_class(self, name: str) -> int | None:
+        """Find the index of the Class entry of an internal name, like java/lang/String, or None."""
+        reverse = self.__reverse_index()
+        name_index = reverse.utf8s.get(name.encode("utf-8"))
+        return None if name_index is None else reverse.classes.get(name_index)
+
+    def find_name_and_type(self, name: str, descriptor: str) -> int | None:
+        """Find the index of the NameAndType entry of a name and descriptor, or None."""
+        reverse = self.__reverse_index()
+        name_index = reverse.utf8s.get(name.encode("utf-8"))
+        descriptor_index = reverse.utf8s.get(descriptor.encode("utf-8"))
+        if name_index is None or descriptor_index is None:
+            return None
+        return reverse.name_and_types.get((name_index, descriptor_index))
+
+    def find_member_ref(self, owner: str, name: str, descriptor: str,
+                        kind: type[ConstantPoolInfo] | None = None) -> int | None:
+        """Find the index of the Fieldref, Methodref or InterfaceMethodref of a member, or None.
+
+        kind restricts the search to one of the three entry types; by default the first one found
+        in that order is returned.
+        """
+        if kind is not None and kind not in MEMBER_REF_TYPES:
+            raise TypeError(f"Expected one of {', '.join(t.__name__ for t in MEMBER_REF_TYPES)}, got {kind.__name__}.")
+        class_index = self.find_class(owner)
+        name_and_type_index = self.find_name_and_type(name, descriptor)
+        if class_index is None or name_and_type_index is None:
+            return None
+        member_refs = self.__reverse_index().member_refs
+        for ref_type in (kind,) if kind is not None else MEMBER_REF_TYPES:
+            index = member_refs.get((ref_type, class_index, name_and_type_index))
+            if index is not None:
+                return index
+        return None
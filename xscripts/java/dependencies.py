@@ -0,0 +1,182 @@
+import csv
+import logging
+import re
+from typing import Iterable, Iterator, TextIO
+
+from .classpath import ClassSource, iter_class_sources, map_sources
+from .constant_pool import ClassConstantPoolInfo, MethodTypeConstantPoolInfo, NameAndTypeConstantPoolInfo
+from .instrumentation import Instrumentation
+from .java_class import JavaClass
+
+logger = logging.getLogger(__name__)
+
+# Class names embedded in field and method descriptors, e.g. (Ljava/lang/String;[Lfoo/Bar;)V
+DESCRIPTOR_CLASS = re.compile(r"L([^;]+);")
+
+
+def class_dependencies(java_class: JavaClass) -> set[str]:
+    """ Classes a class refers to, from its constant pool and member descriptors only.
+
+    Code and attributes are never decoded: class entries (including array types) and the
+    descriptors of NameAndType, MethodType, fields and methods cover every symbolic reference.
+    """
+    constant_pool = java_class.constant_pool
+    descriptor_indexes = set()
+    names = set()
+    for info in constant_pool:
+        if isinstance(info, ClassConstantPoolInfo):
+            name = constant_pool.get_utf8_constant_pool_info(info.name_index).string
+            if name.startswith("["):
+                names.update(DESCRIPTOR_CLASS.findall(name))
+            else:
+                names.add(name)
+        elif isinstance(info, (NameAndTypeConstantPoolInfo, MethodTypeConstantPoolInfo)):
+            descriptor_indexes.add(info.descriptor_index)
+    for member in (*java_class.get_fields(), *java_class.get_methods()):
+        descriptor_indexes.add(member.descriptor_index)
+
+    for index in descriptor_indexes:
+        names.update(DESCRIPTOR_CLASS.findall(constant_pool.get_utf8_constant_pool_info(index).string))
+    names.discard(java_class.get_class_name())
+    return names
+
+
+def package_of(name: str) -> str:
+    return name.rpartition("/")[0]
+
+
+class DependencyGraph:
+    """ A sparse directed graph over interned node names, with weighted edges. """
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.__ids: dict[str, int] = {}
+        self.edges: dict[int, dict[int, int]] = {}
+
+    def node(self, name: str) -> int:
+        node_id = self.__ids.get(name)
+        if node_id is None:
+            node_id = self.__ids[name] = len(self.names)
+            self.names.append(name)
+        return node_id
+
+    def add_edge(self, source: str, target: str, weight: int = 1) -> None:
+        targets = self.edges.setdefault(self.node(source), {})
+        target_id = self.node(target)
+        targets[target_id] = targets.get(target_id, 0) + weight
+
+    def add(self, source: str, targets: Iterable[str]) -> None:
+        self.node(source)
+        for target in targets:
+            self.add_edge(source, target)
+
+    def iter_edges(self) -> Iterator[tuple[str, str, int]]:
+        for source, targets in self.edges.items():
+            for target, weight in targets.items():
+                yield self.names[source], self.names[target], weight
+
+    def packages(self) -> "DependencyGraph":
+        """ Aggregate a class graph into a package graph; weights count class-level edges. """
+        graph = DependencyGraph()
+        for name in self.names:
+            graph.node(package_of(name))
+        for source, target, weight in self.iter_edges():
+            source_package, target_package = package_of(source), package_of(target)
+            if source_package != target_package:
+                graph.add_edge(source_package, target_package, weight)
+        return graph
+
+    def strongly_connected_components(self) -> list[list[str]]:
+        """ Tarjan's algorithm, iterative so deep graphs do not hit the recursion limit. """
+        index_of = [-1] * len(self.names)
+        low_link = [0] * len(self.names)
+        on_stack = [False] * len(self.names)
+        stack: list[int] = []
+        components = []
+        counter = 0
+
+        for root in range(len(self.names)):
+            if index_of[root] != -1:
+                continue
+            work = [(root, iter(self.edges.get(root, ())))]
+            index_of[root] = low_link[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work:
+                node, successors = work[-1]
+                for successor in successors:
+                    if index_of[successor] == -1:
+                        index_of[successor] = low_link[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        work.append((successor, iter(self.edges.get(successor, ()))))
+                        break
+                    if on_stack[successor]:
+                        low_link[node] = min(low_link[node], index_of[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[node])
+                    if low_link[node] == index_of[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(self.names[member])
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
+
+    def cycles(self) -> list[list[str]]:
+        """ Components with more than one node, each sorted, largest first. """
+        return sorted((sorted(component) for component in self.strongly_connected_components() if len(component) > 1),
+                      key=lambda component: (-len(component), component))
+
+    def to_dot(self, output: TextIO, name: str = "dependencies") -> None:
+        output.write(f"digraph \"{name}\" {{\n")
+        for node in self.names:
+            output.write(f"    \"{node}\";\n")
+        for source, target, weight in self.iter_edges():
+            output.write(f"    \"{source}\" -> \"{target}\" [weight={weight}];\n")
+        output.write("}\n")
+
+    def to_csv(self, output: TextIO) -> None:
+        writer = csv.writer(output)
+        writer.writerow(("source", "target", "weight"))
+        writer.writerows(self.iter_edges())
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def _dependencies(source: ClassSource,
+                  instrumentation: Instrumentation | None = None) -> tuple[str, tuple[str, ...]] | None:
+    try:
+        java_class = JavaClass(source.load(instrumentation=instrumentation), instrumentation)
+        return java_class.get_class_name(), tuple(class_dependencies(java_class))
+    except Exception:
+        logger.warning("Failed to parse %s", source, exc_info=True)
+        return None
+
+
+def build_dependency_graph(paths: Iterable[str], jobs: int = 1, ignore: tuple[str, ...] = (),
+                           chunksize: int = 64, instrumentation: Instrumentation | None = None) -> DependencyGraph:
+    """ Scan class files, archives and directories into a class dependency graph.
+
+    Dependencies whose names start with one of the `ignore` prefixes (e.g. "java/") are dropped.
+    """
+    graph = DependencyGraph()
+
+    def add_all(results: Iterable[tuple[str, tuple[str, ...]] | None]) -> None:
+        for result in results:
+            if result is not None:
+                name, dependencies = result
+                graph.add(name, (dependency for dependency in dependencies if not dependency.startswith(ignore)))
+
+    sources = iter_class_sources(paths)
+    add_all(map_sources(_dependencies, sources, jobs, chunksize, ordered=False, instrumentation=instrumentation))
+    return graph
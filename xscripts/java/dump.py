@@ -0,0 +1,106 @@
+import json
+import logging
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterable, Iterator, TextIO
+
+from .attributes import AttributeInfo, DecodePolicy
+from .classpath import ClassSource, iter_class_sources, map_sources
+from .constant_pool import ConstantPool
+from .enums import ClassAccessFlags, FieldAccessFlags, MethodAccessFlags
+from .instrumentation import Instrumentation
+from .java_class import JavaClass
+from .limits import ParseLimits
+
+logger = logging.getLogger(__name__)
+
+# Records only carry attribute names, which are known without decoding the attributes.
+NAMES_ONLY = DecodePolicy(frozenset())
+
+
+@dataclass(frozen=True)
+class DumpOptions:
+    """ Selects the optional sections of a class record. Unselected sections are never decoded.
+
+    With limits, classes are chunked in the hardened mode of JavaClassDumpPipeline and archives
+    are checked against the archive limits, for scanning untrusted uploads.
+    """
+    fields: bool = False
+    methods: bool = False
+    attributes: bool = False
+    limits: ParseLimits | None = None
+
+
+def _attribute_names(attributes: Iterable[AttributeInfo], constant_pool: ConstantPool) -> list[str]:
+    return [constant_pool.get_utf8_constant_pool_info(attribute.attribute_name_index).string
+            for attribute in attributes]
+
+
+def class_record(java_class: JavaClass, options: DumpOptions = DumpOptions()) -> dict:
+    """ Build a JSON-serializable record of a class. """
+    constant_pool = java_class.constant_pool
+    record = {
+        "class": java_class.get_class_name(),
+        "super_class": java_class.get_super_class_name() if java_class.super_class else None,
+        "interfaces": list(java_class.get_interfaces()),
+        "access_flags": [flag.name for flag in java_class.get_access_flags()],
+        "minor_version": java_class.get_minor_version(),
+        "major_version": java_class.get_major_version(),
+    }
+
+    for section, members, flags_type in (("fields", java_class.get_fields, FieldAccessFlags),
+                                         ("methods", java_class.get_methods, MethodAccessFlags)):
+        if not getattr(options, section):
+            continue
+        member_records = []
+        for member in members():
+            member_record = {
+                "name": constant_pool.get_utf8_constant_pool_info(member.name_index).string,
+                "descriptor": constant_pool.get_utf8_constant_pool_info(member.descriptor_index).string,
+                "access_flags": [flag.name for flag in flags_type.parse_flags(member.access_flags)],
+            }
+            if options.attributes:
+                member_record["attributes"] = _attribute_names(member.attributes, constant_pool)
+            member_records.append(member_record)
+        record[section] = member_records
+
+    if options.attributes:
+        record["attributes"] = _attribute_names(java_class.get_attributes(), constant_pool)
+
+    return record
+
+
+def dump_source(source: ClassSource, options: DumpOptions = DumpOptions(),
+                instrumentation: Instrumentation | None = None) -> str:
+    """ Parse one class source into a JSON line. Failures become an error record instead of aborting the scan. """
+    try:
+        record = {"source": str(source)}
+        java_class = JavaClass(source.load(options.limits, instrumentation), instrumentation, NAMES_ONLY)
+        record.update(class_record(java_class, options))
+    except Exception as e:
+        logger.debug("Failed to dump %s", source, exc_info=True)
+        record = {"source": str(source), "error": f"{type(e).__name__}: {e}"}
+    return json.dumps(record, ensure_ascii=False)
+
+
+def iter_ndjson(paths: Iterable[str], jobs: int = 1, options: DumpOptions = DumpOptions(),
+                chunksize: int = 64, instrumentation: Instrumentation | None = None) -> Iterator[str]:
+    """ Yield one JSON line per class as soon as it is parsed.
+
+    With more than one job, classes are parsed by a process pool and lines arrive in completion order.
+    """
+    sources = iter_class_sources(paths, limits=options.limits)
+    yield from map_sources(partial(dump_source, options=options), sources, jobs, chunksize, ordered=False,
+                           instrumentation=instrumentation)
+
+
+def dump_ndjson(paths: Iterable[str], output: TextIO, jobs: int = 1, options: DumpOptions = DumpOptions(),
+                instrumentation: Instrumentation | None = None) -> int:
+    """ Write NDJSON records for every class under the paths. Returns the number of records. """
+    count = 0
+    for line in iter_ndjson(paths, jobs, options, instrumentation=instrumentation):
+        output.write(line)
+        output.write("\n")
+        output.flush()
+        count += 1
+    return count
@@ -248,3 +248,58 @@ class MethodAccessFlags(IntEnum):
     def is_synthetic(value: int) -> bool:
         """Check if the method is synthetic."""
         return (value & MethodAccessFlags.SYNTHETIC) != 0
+
+
+class ModuleFlags(IntEnum):
+    """ Flags of a module in the Module attribute.
+
+    Refer: https://docs.oracle.com/javase/specs/jvms/se21/html/jvms-4.html#jvms-4.7.25
+
+    ACC_OPEN 	    0x0020 	Indicates that this module is open.
+    ACC_SYNTHETIC 	0x1000 	Indicates that this module was not explicitly or implicitly declared.
+    ACC_MANDATED 	0x8000 	Indicates that this module was implicitly declared.
+    """
+    OPEN = 0x0020
+    SYNTHETIC = 0x1000
+    MANDATED = 0x8000
+
+    @staticmethod
+    def parse_flags(value: int) -> tuple['ModuleFlags', ...]:
+        """Get all flags that are satisfied by the given value."""
+        return tuple(flag for flag in ModuleFlags if flag & value != 0)
+
+    @staticmethod
+    def is_open(value: int) -> bool:
+        """Check if the module is open."""
+        return (value & ModuleFlags.OPEN) != 0
+
+
+class RequiresFlags(IntEnum):
+    """ Flags of a requires entry in the Module attribute.
+
+    Refer: https://docs.oracle.com/javase/specs/jvms/se21/html/jvms-4.html#jvms-4.7.25
+
+    ACC_TRANSITIVE 	    0x0020 	Any module which depends on the current module implicitly depends on this module.
+    ACC_STATIC_PHASE 	0x0040 	The dependence is mandatory in the static phase, i.e., at compile time, but optional in the dynamic phase.
+    ACC_SYNTHETIC 	    0x1000 	The dependence was not explicitly or implicitly declared.
+    ACC_MANDATED 	    0x8000 	The dependence was implicitly declared.
+    """
+    TRANSITIVE = 0x0020
+    STATIC_PHASE = 0x0040
+    SYNTHETIC = 0x1000
+    MANDATED = 0x8000
+
+    @staticmethod
+    def parse_flags(value: int) -> tuple['RequiresFlags', ...]:
+        """Get all flags that are satisfied by the given value."""
+        return tuple(flag for flag in RequiresFlags if flag & value != 0)
+
+    @staticmethod
+    def is_transitive(value: int) -> bool:
+        """Check if the dependence is transitive."""
+        return (value & RequiresFlags.TRANSITIVE) != 0
+
+    @staticmethod
+    def is_static_phase(value: int) -> bool:
+        """Check if the dependence is optional at run time."""
+        return (value & RequiresFlags.STATIC_PHASE) != 0
@@ -0,0 +1,16 @@
+class ClassFormatError(ValueError):
+    """ A class file or archive is malformed. A ValueError, so existing handlers keep working. """
+
+
+class TruncatedClassError(ClassFormatError):
+    """ A read or skip ran past the end of the input. """
+
+
+class LimitExceededError(ClassFormatError):
+    """ Input exceeded a configured ParseLimits bound; raised before the oversized data is read. """
+
+    def __init__(self, limit: str, value: int, maximum: int) -> None:
+        super().__init__(f"{limit} {value} exceeds the limit of {maximum}")
+        self.limit: str = limit
+        self.value: int = value
+        self.maximum: int = maximum
@@ -1,24 +1,10 @@
-import logging
 from functools import cached_property
-from io import BytesIO
-
-from .attributes import (
-    AttributeInfo,
-    AttributesTypes,
-    ConstantValueAttributeInfo,
-    DeprecatedAttributeInfo,
-    RuntimeInvisibleAnnotationsAttributeInfo,
-    RuntimeInvisibleTypeAnnotationsAttributeInfo,
-    RuntimeVisibleAnnotationsAttributeInfo,
-    RuntimeVisibleTypeAnnotationsAttributeInfo,
-    SignatureAttributeInfo,
-    SyntheticAttributeInfo,
-)
+
+from .attributes import AttributeFactory, AttributeInfo
 from .constant_pool import ConstantPool
 from .enums import FieldAccessFlags
-from .utils import parse_int
-
-logger = logging.getLogger(__name__)
+from .instrumentation import Instrumentation, measure
+from .utils import parse_int, split_member_info
 
 
 class Field:
@@ -35,9 +21,13 @@ class Field:
     }
     """
 
-    def __init__(self, raw_bytes: bytes, constant_pool: ConstantPool) -> None:
+    def __init__(self, raw_bytes: bytes, constant_pool: ConstantPool,
+                 instrumentation: Instrumentation | None = None,
+                 attribute_factory: AttributeFactory | None = None) -> None:
         self.__raw: bytes = raw_bytes
         self.__constant_pool: ConstantPool = constant_pool
+        self.__instrumentation: Instrumentation | None = instrumentation
+        self.__attribute_factory: AttributeFactory = attribute_factory or AttributeFactory.of(constant_pool)
 
     @cached_property
     def access_flags(self) -> int:
@@ -57,64 +47,9 @@ class Field:
 
     @cached_property
     def attributes(self) -> tuple[AttributeInfo, ...]:
-        attributes: list[AttributeInfo] = []
-
-        with BytesIO(self.raw[8:]) as reader:
-            for _ in range(self.attributes_count):
-                attribute_name_index_segment = reader.read(2)
-                attribute_name_index = AttributeInfo.parse_int(
-                    attribute_name_index_segment
-                )
-
-                attribute_name = self.__constant_pool.get_utf8_constant_pool_info(
-                    attribute_name_index
-                ).string
-
-                attribute_length_segment = reader.read(4)
-                attribute_length = AttributeInfo.parse_int(attribute_length_segment)
-
-                logger.debug(
-                    f"Processing attribute: {attribute_name}(index: {attribute_name_index}, length: {attribute_length})"
-                )
-
-                raw_attribute_bytes = (
-                    attribute_name_index_segment
-                    + attribute_length_segment
-                    + reader.read(attribute_length)
-                )
-
-                if attribute_name == AttributesTypes.CONSTANT_VALUE:
-                    attribute = ConstantValueAttributeInfo(raw_attribute_bytes)
-                elif attribute_name == AttributesTypes.SYNTHETIC:
-                    attribute = SyntheticAttributeInfo(raw_attribute_bytes)
-                elif attribute_name == AttributesTypes.DEPRECATED:
-                    attribute = DeprecatedAttributeInfo(raw_attribute_bytes)
-                elif attribute_name == AttributesTypes.SIGNATURE:
-                    attribute = SignatureAttributeInfo(raw_attribute_bytes)
-                elif attribute_name == AttributesTypes.RUNTIME_VISIBLE_ANNOTATIONS:
-                    attribute = RuntimeVisibleAnnotationsAttributeInfo(
-                        raw_attribute_bytes
-                    )
-                elif attribute_name == AttributesTypes.RUNTIME_INVISIBLE_ANNOTATIONS:
-                    attribute = RuntimeInvisibleAnnotationsAttributeInfo(
-                        raw_attribute_bytes
-                    )
-                elif attribute_name == AttributesTypes.RUNTIME_VISIBLE_TYPE_ANNOTATIONS:
-                    attribute = RuntimeVisibleTypeAnnotationsAttributeInfo(
-                        raw_attribute_bytes
-                    )
-                elif (
-                    attribute_name == AttributesTypes.RUNTIME_INVISIBLE_TYPE_ANNOTATIONS
-                ):
-                    attribute = RuntimeInvisibleTypeAnnotationsAttributeInfo(
-                        raw_attribute_bytes
-                    )
-                else:
-                    raise ValueError(f"Unsupported attribute type: {attribute_name}")
-
-                attributes.append(attribute)
-
-        return tuple(attributes)
+        return measure(self.__instrumentation, "field_attributes",
+                       self.__attribute_factory.load_field_info_attributes, self.attributes_count,
+                       self.raw[8:], nbytes=len(self.raw) - 8, objects=len)
 
     @property
     def raw(self) -> bytes:
@@ -158,6 +93,9 @@ class Field:
         )
 
 
-def load_fields(count: int, raw_bytes: bytes, constant_pool) -> tuple[Field, ...]:
+def load_fields(count: int, raw_bytes: bytes, constant_pool: ConstantPool,
+                instrumentation: Instrumentation | None = None,
+                attribute_factory: AttributeFactory | None = None) -> tuple[Field, ...]:
     """Load fields from raw bytes."""
-    ...
+    return tuple(Field(segment, constant_pool, instrumentation, attribute_factory)
+                 for segment in split_member_info(count, raw_bytes))
@@ -0,0 +1,95 @@
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+Counter = int | Callable[[Any], int]
+
+
+@dataclass
+class StageStats:
+    """ Aggregated measurements of one parsing stage. """
+    calls: int = 0
+    seconds: float = 0.0
+    bytes: int = 0
+    objects: int = 0
+    memory: int = 0
+
+    def merge(self, other: "StageStats") -> None:
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.bytes += other.bytes
+        self.objects += other.objects
+        self.memory += other.memory
+
+
+class Instrumentation:
+    """ Opt-in collector of per-stage wall time, bytes processed, object counts and memory deltas.
+
+    Pass one instance to every JavaClassDumpPipeline and JavaClass of a scan to aggregate across
+    the scan. Instances are picklable, so worker processes can return theirs to be merged.
+    With `trace_memory`, tracemalloc is started if needed and each stage records the change of
+    traced memory; this slows parsing down considerably.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.stages: dict[str, StageStats] = {}
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stats(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        return stats
+
+    def measure(self, name: str, fn: Callable[..., T], *args, nbytes: Counter = 0, objects: Counter = 0) -> T:
+        """ Call fn(*args) as stage `name`. Counters are ints, or callables applied to the result. """
+        memory_before = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+
+        stats = self.stats(name)
+        stats.calls += 1
+        stats.seconds += elapsed
+        stats.bytes += nbytes(result) if callable(nbytes) else nbytes
+        stats.objects += objects(result) if callable(objects) else objects
+        if self.trace_memory:
+            stats.memory += tracemalloc.get_traced_memory()[0] - memory_before
+        return result
+
+    def merge(self, other: "Instrumentation") -> None:
+        for name, stats in other.stages.items():
+            self.stats(name).merge(stats)
+
+    def report(self) -> dict[str, dict]:
+        """ Stage measurements ordered by total time, slowest first. """
+        return {name: asdict(stats) for name, stats in
+                sorted(self.stages.items(), key=lambda item: item[1].seconds, reverse=True)}
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w") as output:
+            json.dump(self.report(), output, indent=2)
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<24}{'calls':>10}{'seconds':>12}{'MiB':>10}{'objects':>12}{'memory MiB':>12}"]
+        for name, stats in self.report().items():
+            lines.append(f"{name:<24}{stats['calls']:>10}{stats['seconds']:>12.4f}{stats['bytes'] / 2 ** 20:>10.2f}"
+                         f"{stats['objects']:>12}{stats['memory'] / 2 ** 20:>12.2f}")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"Instrumentation(trace_memory={self.trace_memory}, stages={list(self.stages)})"
+
+
+def measure(instrumentation: Instrumentation | None, name: str, fn: Callable[..., T], *args,
+            nbytes: Counter = 0, objects: Counter = 0) -> T:
+    """ Call fn(*args), measured as stage `name` when instrumentation is enabled. """
+    if instrumentation is None:
+        return fn(*args)
+    return instrumentation.measure(name, fn, *args, nbytes=nbytes, objects=objects)
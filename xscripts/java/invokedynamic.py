@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+
+from .attributes import BootstrapMethodsAttributeInfo, RawAttributeInfo
+from .constant_pool import ConstantPool, InvokeDynamicConstantPoolInfo, MethodHandleConstantPoolInfo, ReferenceKind
+from .java_class import JavaClass
+
+LAMBDA_METAFACTORY = "java/lang/invoke/LambdaMetafactory"
+
+
+@dataclass(frozen=True)
+class MethodHandleTarget:
+    """ The member a CONSTANT_MethodHandle entry refers to. """
+    reference_kind: ReferenceKind
+    owner: str
+    name: str
+    descriptor: str
+
+
+@dataclass(frozen=True)
+class InvokeDynamicSite:
+    """ A CONSTANT_InvokeDynamic entry resolved through its bootstrap method.
+
+    `implementation` is the first method handle among the static bootstrap arguments. For
+    LambdaMetafactory call sites that is the lambda body or method reference target; bootstraps
+    such as StringConcatFactory take no method handle and leave it None.
+    """
+    index: int
+    name: str
+    descriptor: str
+    bootstrap_method_attr_index: int
+    bootstrap_method: MethodHandleTarget
+    implementation: MethodHandleTarget | None
+
+    @property
+    def is_lambda(self) -> bool:
+        return self.bootstrap_method.owner == LAMBDA_METAFACTORY
+
+
+def _resolve_method_handle(constant_pool: ConstantPool, index: int) -> MethodHandleTarget:
+    handle = constant_pool.get_method_handle_constant_pool_info(index)
+    return MethodHandleTarget(ReferenceKind(handle.reference_kind), *constant_pool.resolve_member_ref(index))
+
+
+def find_bootstrap_methods(java_class: JavaClass) -> BootstrapMethodsAttributeInfo | None:
+    """ Get the BootstrapMethods attribute of a class, decoding it if it was passed through raw. """
+    for attribute in java_class.get_attributes():
+        if isinstance(attribute, BootstrapMethodsAttributeInfo):
+            return attribute
+        if isinstance(attribute, RawAttributeInfo) and attribute.attribute_name == "BootstrapMethods":
+            return attribute.decoded
+    return None
+
+
+def index_invokedynamic(java_class: JavaClass) -> dict[int, InvokeDynamicSite]:
+    """ Resolve every invokedynamic call site of a class, keyed by constant pool index.
+
+    Bootstrap methods are decoded once and each method handle is resolved once, however many call
+    sites share it, so the index is built in time linear in the pool and attribute sizes.
+    """
+    constant_pool = java_class.constant_pool
+    call_sites = [(index, info) for index, info in constant_pool.pool.items()
+                  if isinstance(info, InvokeDynamicConstantPoolInfo)]
+    if not call_sites:
+        return {}
+
+    attribute = find_bootstrap_methods(java_class)
+    if attribute is None:
+        raise ValueError(f"Class {java_class.get_class_name()} has invokedynamic entries but no BootstrapMethods")
+    bootstrap_methods = attribute.bootstrap_methods
+
+    handles: dict[int, MethodHandleTarget] = {}
+
+    def resolve(handle_index: int) -> MethodHandleTarget:
+        target = handles.get(handle_index)
+        if target is None:
+            target = handles[handle_index] = _resolve_method_handle(constant_pool, handle_index)
+        return target
+
+    implementations: dict[int, MethodHandleTarget | None] = {}
+    sites = {}
+    for index, info in call_sites:
+        bootstrap_method_attr_index = info.bootstrap_method_attr_index
+        if bootstrap_method_attr_index >= len(bootstrap_methods):
+            raise IndexError(f"Bootstrap method index {bootstrap_method_attr_index} of constant pool entry {index} "
+                             f"out of range. Valid range is 0 to {len(bootstrap_methods) - 1}.")
+        bootstrap_method = bootstrap_methods[bootstrap_method_attr_index]
+
+        if bootstrap_method_attr_index not in implementations:
+            implementations[bootstrap_method_attr_index] = next(
+                (resolve(argument) for argument in bootstrap_method.bootstrap_arguments
+                 if isinstance(constant_pool.get(argument), MethodHandleConstantPoolInfo)), None)
+
+        name_and_type = constant_pool.get_name_and_type_constant_pool_info(info.name_and_type_index)
+        sites[index] = InvokeDynamicSite(
+            index,
+            constant_pool.get_utf8_constant_pool_info(name_and_type.name_index).string,
+            constant_pool.get_utf8_constant_pool_info(name_and_type.descriptor_index).string,
+            bootstrap_method_attr_index,
+            resolve(bootstrap_method.bootstrap_method_ref),
+            implementations[bootstrap_method_attr_index],
+        )
+    return sites
@@ -1,10 +1,12 @@
+from functools import cached_property
 from typing import Iterable
 
-from .attributes import dump_bytes as dump_attributes_bytes, AttributeInfo
-from .constant_pool import ConstantPoolFactory, ConstantPool, ConstantPoolInfo
+from .attributes import AttributeFactory, AttributeInfo, DecodePolicy
+from .constant_pool import ConstantPoolFactory, ConstantPool, ConstantPoolInfo, Utf8ConstantPoolInfo
 from .enums import ClassAccessFlags
-from .fields import dump_bytes as dump_fields_bytes, Field
-from .methods import Method, dump_bytes as dump_methods_bytes
+from .fields import load_fields, Field
+from .instrumentation import Instrumentation, measure
+from .methods import Method, load_methods
 from .pipeline import ChunkedJavaClass
 from .utils import parse_int
 
@@ -48,32 +50,111 @@ class JavaClass:
 
         return tuple(interfaces)
 
-    def __init__(self, java_class: ChunkedJavaClass) -> None:
+    @staticmethod
+    def decode_utf8_entries(constant_pool: ConstantPool) -> tuple[Utf8ConstantPoolInfo, ...]:
+        """Decode every UTF-8 entry of the pool up front."""
+        entries = tuple(info for info in constant_pool if isinstance(info, Utf8ConstantPoolInfo))
+        for info in entries:
+            info.string
+        return entries
+
+    def __init__(self, java_class: ChunkedJavaClass, instrumentation: Instrumentation | None = None,
+                 decode_policy: DecodePolicy | None = None) -> None:
+        """Nothing is decoded here: every section is parsed from its chunk on first access."""
         self.chunked_java_class: ChunkedJavaClass = java_class
-
-        self.magic: str = self.chunked_java_class.magic_segment.hex().upper()
-        self.minor_version: int = self.parse_int(self.chunked_java_class.minor_version_segment)
-        self.major_version: int = self.parse_int(self.chunked_java_class.major_version_segment)
-        self.constant_pool_count: int = self.parse_int(self.chunked_java_class.constant_pool_count_segment)
-        self.constant_pool: ConstantPool = ConstantPoolFactory.make_constant_pool(
-            self.chunked_java_class.constant_pool_segment)
-        self.access_flags: int = self.parse_int(self.chunked_java_class.access_flags_segment)
-        self.this_class: int = self.parse_int(self.chunked_java_class.this_class_segment)
-        self.super_class: int = self.parse_int(self.chunked_java_class.super_class_segment)
-        self.interfaces_count: int = self.parse_int(self.chunked_java_class.interfaces_count_segment)
-        self.interfaces: tuple[str, ...] = JavaClass.interfaces_dump_bytes(self.interfaces_count,
-                                                                           self.chunked_java_class.interfaces_segment,
-                                                                           self.constant_pool)
-        self.fields_count: int = self.parse_int(self.chunked_java_class.fields_count_segment)
-        self.fields: tuple[Field, ...] = tuple(
-            dump_fields_bytes(self.fields_count, self.chunked_java_class.fields_info_segment, self.constant_pool))
-        self.methods_count: int = self.parse_int(self.chunked_java_class.methods_count_segment)
-        self.methods: tuple[Method, ...] = tuple(
-            dump_methods_bytes(self.methods_count, self.chunked_java_class.methods_info_segment, self.constant_pool))
-        self.attributes_count: int = self.parse_int(self.chunked_java_class.attributes_count_segment)
-        self.attributes: tuple[AttributeInfo, ...] = tuple(
-            dump_attributes_bytes(self.attributes_count, self.chunked_java_class.attributes_info_segment,
-                                  self.constant_pool))
+        self.instrumentation: Instrumentation | None = instrumentation
+        self.decode_policy: DecodePolicy | None = decode_policy
+
+    @cached_property
+    def magic(self) -> str:
+        return self.chunked_java_class.magic_segment.hex().upper()
+
+    @cached_property
+    def minor_version(self) -> int:
+        return self.parse_int(self.chunked_java_class.minor_version_segment)
+
+    @cached_property
+    def major_version(self) -> int:
+        return self.parse_int(self.chunked_java_class.major_version_segment)
+
+    @cached_property
+    def constant_pool_count(self) -> int:
+        return self.parse_int(self.chunked_java_class.constant_pool_count_segment)
+
+    @cached_property
+    def constant_pool(self) -> ConstantPool:
+        """The pool is built on first access; everything else resolves names through it."""
+        instrumentation = self.instrumentation
+        segment = self.chunked_java_class.constant_pool_segment
+        constant_pool = measure(instrumentation, "constant_pool", ConstantPoolFactory.make_constant_pool, segment,
+                                nbytes=len(segment), objects=lambda pool: len(pool.pool))
+        if instrumentation is not None:
+            # Names are decoded lazily; when instrumented, decode them here so their cost gets a stage of its own.
+            instrumentation.measure("utf8_decode", self.decode_utf8_entries, constant_pool,
+                                    nbytes=lambda entries: sum(info.length for info in entries), objects=len)
+        return constant_pool
+
+    @cached_property
+    def attribute_factory(self) -> AttributeFactory:
+        """The factory decoding class and member attributes under the decode policy of this class."""
+        return AttributeFactory.of(self.constant_pool, self.decode_policy)
+
+    @cached_property
+    def access_flags(self) -> int:
+        return self.parse_int(self.chunked_java_class.access_flags_segment)
+
+    @cached_property
+    def this_class(self) -> int:
+        return self.parse_int(self.chunked_java_class.this_class_segment)
+
+    @cached_property
+    def super_class(self) -> int:
+        return self.parse_int(self.chunked_java_class.super_class_segment)
+
+    @cached_property
+    def interfaces_count(self) -> int:
+        return self.parse_int(self.chunked_java_class.interfaces_count_segment)
+
+    @cached_property
+    def interfaces(self) -> tuple[str, ...]:
+        """Interface names are only resolved on first access."""
+        segment = self.chunked_java_class.interfaces_segment
+        return measure(self.instrumentation, "interfaces", JavaClass.interfaces_dump_bytes, self.interfaces_count,
+                       segment, self.constant_pool, nbytes=len(segment), objects=len)
+
+    @cached_property
+    def fields_count(self) -> int:
+        return self.parse_int(self.chunked_java_class.fields_count_segment)
+
+    @cached_property
+    def methods_count(self) -> int:
+        return self.parse_int(self.chunked_java_class.methods_count_segment)
+
+    @cached_property
+    def attributes_count(self) -> int:
+        return self.parse_int(self.chunked_java_class.attributes_count_segment)
+
+    @cached_property
+    def fields(self) -> tuple[Field, ...]:
+        """Fields are only split and wrapped on first access."""
+        segment = self.chunked_java_class.fields_info_segment
+        return measure(self.instrumentation, "fields", load_fields, self.fields_count, segment, self.constant_pool,
+                       self.instrumentation, self.attribute_factory, nbytes=len(segment), objects=len)
+
+    @cached_property
+    def methods(self) -> tuple[Method, ...]:
+        """Methods are only split and wrapped on first access."""
+        segment = self.chunked_java_class.methods_info_segment
+        return measure(self.instrumentation, "methods", load_methods, self.methods_count, segment, self.constant_pool,
+                       self.instrumentation, self.attribute_factory, nbytes=len(segment), objects=len)
+
+    @cached_property
+    def attributes(self) -> tuple[AttributeInfo, ...]:
+        """Class attributes are only decoded on first access."""
+        segment = self.chunked_java_class.attributes_info_segment
+        return measure(self.instrumentation, "class_attributes",
+                       self.attribute_factory.load_class_file_attributes, self.attributes_count, segment,
+                       nbytes=len(segment), objects=len)
 
     def get_magic(self) -> str:
         """Get the magic number of the Java class."""
@@ -0,0 +1,41 @@
+from dataclasses import dataclass, replace
+
+from .attributes import DecodePolicy
+from .errors import LimitExceededError
+
+
+@dataclass(frozen=True)
+class ParseLimits:
+    """ Bounds for parsing untrusted class files and archives.
+
+    Class file limits are enforced by JavaClassDumpPipeline while chunking: counts and lengths are
+    checked as soon as they are read, and every read is checked against the end of the input, so
+    memory use stays proportional to max_class_bytes. Archive limits are enforced on central
+    directory metadata by iter_class_sources before any entry is read.
+    """
+    max_class_bytes: int = 16 << 20
+    max_constant_pool_entries: int = 65535
+    # Interfaces, fields and methods of a class, each.
+    max_members: int = 65535
+    # Attributes of one class, field, method or record component.
+    max_attributes: int = 1024
+    max_attribute_length: int = 16 << 20
+    max_annotation_depth: int = 32
+    max_archive_entries: int = 1 << 20
+    # Archives within archives, e.g. 1 for BOOT-INF/lib jars of a fat jar.
+    max_nesting_depth: int = 2
+    # Declared uncompressed size of every class and nested archive of one scan, together.
+    max_total_bytes: int = 4 << 30
+
+    def check(self, limit: str, value: int) -> None:
+        """ Raise LimitExceededError if `value` exceeds the limit of that name. """
+        maximum = getattr(self, limit)
+        if value > maximum:
+            raise LimitExceededError(limit, value, maximum)
+
+    def decode_policy(self, policy: DecodePolicy | None = None) -> DecodePolicy:
+        """ The policy, DECODE_ALL by default, with annotation nesting bounded by these limits. """
+        return replace(policy or DecodePolicy(), max_annotation_depth=self.max_annotation_depth)
+
+
+UNTRUSTED = ParseLimits()
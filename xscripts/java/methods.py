@@ -1,9 +1,11 @@
 from functools import cached_property
-from typing import Iterable
 
-from .attributes import AttributeInfo
+from .attributes import AttributeFactory, AttributeInfo, CodeAttributeInfo, RawAttributeInfo
+from .constant_pool import ConstantPool
 from .enums import MethodAccessFlags
-from .utils import parse_int
+from .instrumentation import Instrumentation, measure
+from .pc_index import PcIndex
+from .utils import parse_int, split_member_info
 
 
 class Method:
@@ -20,8 +22,13 @@ class Method:
     }
     """
 
-    def __init__(self, raw_bytes: bytes) -> None:
+    def __init__(self, raw_bytes: bytes, constant_pool: ConstantPool,
+                 instrumentation: Instrumentation | None = None,
+                 attribute_factory: AttributeFactory | None = None) -> None:
         self.raw = raw_bytes
+        self.__constant_pool: ConstantPool = constant_pool
+        self.__instrumentation: Instrumentation | None = instrumentation
+        self.__attribute_factory: AttributeFactory = attribute_factory or AttributeFactory.of(constant_pool)
 
     @cached_property
     def access_flags(self) -> int:
@@ -41,7 +48,35 @@ class Method:
 
     @cached_property
     def attributes(self) -> tuple[AttributeInfo, ...]:
-        ...
+        return measure(self.__instrumentation, "method_attributes",
+                       self.__attribute_factory.load_method_info_attributes, self.attributes_count,
+                       self.raw[8:], nbytes=len(self.raw) - 8, objects=len)
+
+    @cached_property
+    def code(self) -> CodeAttributeInfo | None:
+        """The Code attribute, None for abstract and native methods."""
+        for attribute in self.attributes:
+            if isinstance(attribute, CodeAttributeInfo):
+                return attribute
+            if isinstance(attribute, RawAttributeInfo) and attribute.attribute_name == "Code":
+                return attribute.decoded
+        return None
+
+    @cached_property
+    def code_attributes(self) -> tuple[AttributeInfo, ...]:
+        """The attributes nested in the Code attribute, e.g. LineNumberTable and LocalVariableTable."""
+        code = self.code
+        if code is None:
+            return ()
+        return measure(self.__instrumentation, "code_attributes",
+                       self.__attribute_factory.load_code_attributes, code.attributes_count,
+                       code.attributes_segment, nbytes=len(code.attributes_segment), objects=len)
+
+    @cached_property
+    def pc_index(self) -> PcIndex | None:
+        """Live locals and covering exception handlers by pc, None for abstract and native methods."""
+        code = self.code
+        return None if code is None else PcIndex(code, self.code_attributes)
 
     def method_access_flags(self) -> tuple[MethodAccessFlags, ...]:
         return MethodAccessFlags.parse_flags(self.access_flags)
@@ -87,6 +122,9 @@ class Method:
                f"descriptor_index={self.descriptor_index}, attributes_count={self.attributes_count})"
 
 
-def load_methods(count: int, raw_bytes: bytes, constant_pool) -> Iterable[Method]:
+def load_methods(count: int, raw_bytes: bytes, constant_pool: ConstantPool,
+                 instrumentation: Instrumentation | None = None,
+                 attribute_factory: AttributeFactory | None = None) -> tuple[Method, ...]:
     """Dump bytes into a tuple of Method objects."""
-    ...
+    return tuple(Method(segment, constant_pool, instrumentation, attribute_factory)
+                 for segment in split_member_info(count, raw_bytes))
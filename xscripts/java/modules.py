@@ -0,0 +1,270 @@
+import logging
+import os
+import zipfile
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from .attributes import DecodePolicy, ModuleAttributeInfo, ModuleMainClassAttributeInfo, ModulePackagesAttributeInfo
+from .classpath import CLASS_SUFFIX, ClassSource, is_archive, map_sources
+from .constant_pool import ConstantPool
+from .dependencies import DependencyGraph
+from .enums import ModuleFlags, RequiresFlags
+from .instrumentation import Instrumentation
+from .java_class import JavaClass
+
+logger = logging.getLogger(__name__)
+
+MODULE_INFO = "module-info" + CLASS_SUFFIX
+JMOD_SUFFIX = ".jmod"
+JMOD_MODULE_INFO = "classes/" + MODULE_INFO
+MODULE_ONLY = DecodePolicy.only("Module", "ModulePackages", "ModuleMainClass")
+
+
+@dataclass(frozen=True)
+class ModuleDescriptor:
+    """ A module-info.class with constant pool references resolved; packages and classes use internal names. """
+    name: str
+    version: str | None
+    flags: int
+    requires: tuple[tuple[str, int], ...]
+    exports: tuple[tuple[str, tuple[str, ...]], ...]
+    opens: tuple[tuple[str, tuple[str, ...]], ...]
+    uses: tuple[str, ...]
+    provides: tuple[tuple[str, tuple[str, ...]], ...]
+    packages: tuple[str, ...] | None
+    main_class: str | None
+    path: str
+
+    @property
+    def is_open(self) -> bool:
+        return ModuleFlags.is_open(self.flags)
+
+
+@dataclass(frozen=True)
+class ModuleProblem:
+    module: str
+    kind: str
+    detail: str
+
+    def __str__(self) -> str:
+        return f"{self.module}: {self.kind}: {self.detail}"
+
+
+def read_module_descriptor(java_class: JavaClass, path: str) -> ModuleDescriptor:
+    """ Resolve the Module, ModulePackages and ModuleMainClass attributes of a module-info class. """
+    constant_pool: ConstantPool = java_class.constant_pool
+
+    def utf8(index: int) -> str:
+        return constant_pool.get_utf8_constant_pool_info(index).string
+
+    def module(index: int) -> str:
+        return utf8(constant_pool.get_module_constant_pool_info(index).name_index)
+
+    def package(index: int) -> str:
+        return utf8(constant_pool.get_package_constant_pool_info(index).name_index)
+
+    def class_name(index: int) -> str:
+        return utf8(constant_pool.get_class_constant_pool_info(index).name_index)
+
+    module_attribute, packages, main_class = None, None, None
+    for attribute in java_class.get_attributes():
+        if isinstance(attribute, ModuleAttributeInfo):
+            module_attribute = attribute
+        elif isinstance(attribute, ModulePackagesAttributeInfo):
+            packages = tuple(package(index) for index in attribute.package_indexes)
+        elif isinstance(attribute, ModuleMainClassAttributeInfo):
+            main_class = class_name(attribute.main_class_index)
+    if module_attribute is None:
+        raise ValueError(f"{path} has no Module attribute")
+
+    return ModuleDescriptor(
+        module(module_attribute.module_name_index),
+        utf8(module_attribute.module_version_index) if module_attribute.module_version_index else None,
+        module_attribute.module_flags,
+        tuple((module(require.requires_index), require.requires_flags) for require in module_attribute.requires),
+        tuple((package(export.exports_index), tuple(module(index) for index in export.exports_to_index))
+              for export in module_attribute.exports),
+        tuple((package(opened.opens_index), tuple(module(index) for index in opened.opens_to_index))
+              for opened in module_attribute.opens),
+        tuple(class_name(index) for index in module_attribute.uses),
+        tuple((class_name(provided.provides_index), tuple(class_name(index) for index in provided.provides_with_index))
+              for provided in module_attribute.provides),
+        packages, main_class, path)
+
+
+def iter_module_sources(paths: Iterable[str]) -> Iterator[ClassSource]:
+    """ Find the module-info classes of a module path.
+
+    An entry is a modular jar, a jmod, an exploded module directory, or a directory holding any
+    of these, like the java --module-path option. $JAVA_HOME/jmods provides the JDK modules.
+    """
+    for path in paths:
+        if is_archive(path) or path.endswith(JMOD_SUFFIX):
+            entry = JMOD_MODULE_INFO if path.endswith(JMOD_SUFFIX) else MODULE_INFO
+            with zipfile.ZipFile(path) as archive:
+                if entry in archive.NameToInfo:
+                    yield ClassSource(path, entry)
+        elif os.path.isfile(os.path.join(path, MODULE_INFO)):
+            yield ClassSource(os.path.join(path, MODULE_INFO))
+        elif os.path.isdir(path):
+            children = (os.path.join(path, name) for name in sorted(os.listdir(path)))
+            yield from iter_module_sources(child for child in children
+                                           if is_archive(child) or child.endswith(JMOD_SUFFIX) or os.path.isdir(child))
+
+
+def _module_descriptor(source: ClassSource, instrumentation: Instrumentation | None = None) -> ModuleDescriptor | None:
+    try:
+        java_class = JavaClass(source.load(instrumentation=instrumentation), instrumentation, MODULE_ONLY)
+        return read_module_descriptor(java_class, str(source))
+    except Exception:
+        logger.warning("Failed to read module descriptor %s", source, exc_info=True)
+        return None
+
+
+class ModuleGraph:
+    """ Modules interned to integer ids, with requires edges kept as arrays of ids. """
+
+    def __init__(self) -> None:
+        self.descriptors: list[ModuleDescriptor] = []
+        self.ids: dict[str, int] = {}
+        self.__requires: list[array] | None = None
+        self.__implied: list[array | None] = []
+
+    def add(self, descriptor: ModuleDescriptor) -> None:
+        """ Add a module; the first module of a name on the module path wins. """
+        if descriptor.name not in self.ids:
+            self.ids[descriptor.name] = len(self.descriptors)
+            self.descriptors.append(descriptor)
+            self.__requires = None
+
+    def __len__(self) -> int:
+        return len(self.descriptors)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __edges(self) -> list[array]:
+        """ Per module: resolved requires ids, then the transitive and static flags packed as bits. """
+        if self.__requires is None:
+            ids = self.ids
+            self.__requires = [
+                array("I", (ids[name] << 2 | RequiresFlags.is_transitive(flags) << 1
+                            | RequiresFlags.is_static_phase(flags)
+                            for name, flags in descriptor.requires if name in ids))
+                for descriptor in self.descriptors]
+            self.__implied = [None] * len(self.descriptors)
+        return self.__requires
+
+    def __implied_readability(self, module_id: int) -> array:
+        """ Modules read by every reader of a module: its requires transitive, recursively. """
+        edges = self.__edges()
+        implied = self.__implied
+        if implied[module_id] is not None:
+            return implied[module_id]
+        marked = bytearray(len(edges))
+        worklist = [module_id]
+        found = array("I")
+        while worklist:
+            for edge in edges[worklist.pop()]:
+                target = edge >> 2
+                if edge & 2 and not marked[target]:
+                    marked[target] = 1
+                    found.append(target)
+                    worklist.append(target)
+        implied[module_id] = found
+        return found
+
+    def reads(self, name: str) -> tuple[str, ...]:
+        """ The modules a module reads: what it requires, plus what those require transitively. """
+        module_id = self.ids.get(name)
+        if module_id is None:
+            raise ValueError(f"Module {name} is not on the module path")
+        read = set()
+        for edge in self.__edges()[module_id]:
+            read.add(edge >> 2)
+            read.update(self.__implied_readability(edge >> 2))
+        read.discard(module_id)
+        return tuple(sorted(self.descriptors[target].name for target in read))
+
+    def closure(self, roots: Iterable[str], static: bool = False) -> tuple[str, ...]:
+        """ The roots and every module they need through requires; `requires static` only if asked, like jlink. """
+        edges = self.__edges()
+        marked = bytearray(len(edges))
+        worklist = []
+        for root in roots:
+            module_id = self.ids.get(root)
+            if module_id is None:
+                raise ValueError(f"Module {root} is not on the module path")
+            if not marked[module_id]:
+                marked[module_id] = 1
+                worklist.append(module_id)
+        while worklist:
+            for edge in edges[worklist.pop()]:
+                target = edge >> 2
+                if not marked[target] and (static or not edge & 1):
+                    marked[target] = 1
+                    worklist.append(target)
+        return tuple(sorted(descriptor.name for descriptor, mark in zip(self.descriptors, marked) if mark))
+
+    def validate(self, roots: Iterable[str] | None = None) -> list[ModuleProblem]:
+        """ Check the modules needed by the roots (all modules by default) for resolution and export errors.
+
+        Reported: missing required modules, requires cycles, packages exported or opened but not
+        listed in ModulePackages, qualified exports to unknown modules, and packages in more than
+        one module.
+        """
+        problems = []
+        roots = list(self.ids) if roots is None else list(roots)
+        for root in roots:
+            if root not in self.ids:
+                problems.append(ModuleProblem(root, "missing", "root module not found"))
+        names = self.closure(root for root in roots if root in self.ids)
+        descriptors = [self.descriptors[self.ids[name]] for name in names]
+
+        cycles = DependencyGraph()
+        owners: dict[str, list[str]] = {}
+        for descriptor in descriptors:
+            cycles.node(descriptor.name)
+            for required, flags in descriptor.requires:
+                if required in self.ids:
+                    cycles.add_edge(descriptor.name, required)
+                elif not RequiresFlags.is_static_phase(flags):
+                    problems.append(ModuleProblem(descriptor.name, "missing", f"requires {required}"))
+
+            packages = set(descriptor.packages or ())
+            for kind, entries in (("exports", descriptor.exports), ("opens", descriptor.opens)):
+                for package, targets in entries:
+                    if descriptor.packages is not None and package not in packages:
+                        problems.append(ModuleProblem(descriptor.name, "unknown package",
+                                                      f"{kind} {package} which is not in ModulePackages"))
+                    for target in targets:
+                        if target not in self.ids:
+                            problems.append(ModuleProblem(descriptor.name, "unknown target",
+                                                          f"{kind} {package} to {target}"))
+            for package in packages:
+                owners.setdefault(package, []).append(descriptor.name)
+
+        for cycle in cycles.cycles():
+            problems.append(ModuleProblem(cycle[0], "cycle", " -> ".join(cycle)))
+        for package, modules in sorted(owners.items()):
+            if len(modules) > 1:
+                problems.append(ModuleProblem(modules[0], "split package",
+                                              f"{package} is also in {', '.join(modules[1:])}"))
+        return problems
+
+
+def resolve_module_path(paths: Iterable[str], jobs: int = 1,
+                        instrumentation: Instrumentation | None = None) -> ModuleGraph:
+    """ Read every module-info.class of a module path into a ModuleGraph. """
+    graph = ModuleGraph()
+    sources = list(iter_module_sources(paths))
+
+    def add_all(results: Iterable[ModuleDescriptor | None]) -> None:
+        for descriptor in results:
+            if descriptor is not None:
+                graph.add(descriptor)
+
+    # In module path order, so the first module of a name still wins.
+    add_all(map_sources(_module_descriptor, sources, jobs, instrumentation=instrumentation))
+    return graph
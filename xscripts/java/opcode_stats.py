@@ -0,0 +1,202 @@
+import logging
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
+from typing import Iterable, Iterator
+
+from .attributes import CodeAttributeInfo, DecodePolicy
+from .bytecode import INVOKE_OPCODES, Opcode, iter_instructions, opcode_stream
+from .classpath import ClassSource, iter_class_sources, map_sources
+from .constant_pool import ConstantPool
+from .instrumentation import Instrumentation
+from .java_class import JavaClass
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+CODE_ONLY = DecodePolicy.only("Code")
+GROUPINGS = ("jar", "package", "class")
+# Opcode streams are counted in bulk once a group's buffer grows past this size.
+FLUSH_SIZE = 1 << 20
+
+REFLECTION_OWNERS = frozenset({"java/lang/reflect/Method", "java/lang/reflect/Field", "java/lang/reflect/Constructor"})
+REFLECTIVE_CLASS_METHODS = frozenset({
+    "forName", "newInstance", "getMethod", "getMethods", "getDeclaredMethod", "getDeclaredMethods", "getField",
+    "getFields", "getDeclaredField", "getDeclaredFields", "getConstructor", "getDeclaredConstructor",
+})
+BOXED_TYPES = frozenset({
+    "java/lang/Boolean", "java/lang/Byte", "java/lang/Character", "java/lang/Short", "java/lang/Integer",
+    "java/lang/Long", "java/lang/Float", "java/lang/Double",
+})
+# Deleting every other byte of an opcode stream leaves only its invoke instructions.
+_NOT_INVOKE = bytes(opcode for opcode in range(256) if opcode not in INVOKE_OPCODES)
+
+
+@dataclass
+class OpcodeStats:
+    """ Opcode histogram and flagged call patterns of a group of methods. """
+    counts: array = field(default_factory=lambda: array("Q", bytes(256 * 8)))
+    classes: int = 0
+    methods: int = 0
+    reflection: int = 0
+    boxing: int = 0
+
+    def add_counts(self, opcodes: bytes) -> None:
+        """ Add an opcode stream to the histogram, at C speed. """
+        counts = self.counts
+        if numpy is not None:
+            histogram = numpy.bincount(numpy.frombuffer(opcodes, dtype=numpy.uint8), minlength=256)
+            for opcode in numpy.flatnonzero(histogram).tolist():
+                counts[opcode] += int(histogram[opcode])
+        else:
+            for opcode, count in Counter(opcodes).items():
+                counts[opcode] += count
+
+    def merge(self, other: "OpcodeStats") -> None:
+        counts = self.counts
+        for opcode, count in enumerate(other.counts):
+            if count:
+                counts[opcode] += count
+        self.classes += other.classes
+        self.methods += other.methods
+        self.reflection += other.reflection
+        self.boxing += other.boxing
+
+    @property
+    def instructions(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def monitorenter(self) -> int:
+        return self.counts[Opcode.MONITORENTER]
+
+    def top(self, n: int = 10) -> list[tuple[str, int]]:
+        """ The n most frequent opcodes by name. """
+        ranked = sorted(((count, opcode) for opcode, count in enumerate(self.counts) if count),
+                        key=lambda item: (-item[0], item[1]))
+        return [(Opcode(opcode).name.lower() if opcode in Opcode else f"{opcode:#04x}", count)
+                for count, opcode in ranked[:n]]
+
+
+def _flag_calls(stats: OpcodeStats, code: bytes, constant_pool: ConstantPool) -> None:
+    for pc, opcode in iter_instructions(code):
+        if opcode not in INVOKE_OPCODES:
+            continue
+        owner, name, descriptor = constant_pool.resolve_member_ref(int.from_bytes(code[pc + 1:pc + 3], "big"))
+        if owner in REFLECTION_OWNERS or owner == "java/lang/Class" and name in REFLECTIVE_CLASS_METHODS:
+            stats.reflection += 1
+        elif owner in BOXED_TYPES and (name == "valueOf" and descriptor[1] not in "L[" or
+                                       name.endswith("Value") and descriptor.startswith("()")):
+            stats.boxing += 1
+
+
+class _Accumulator:
+    """ Per-worker stats by group, with opcode streams buffered so they are counted in bulk. """
+
+    def __init__(self) -> None:
+        self.stats: dict[str, OpcodeStats] = {}
+        self.__buffers: dict[str, bytearray] = {}
+
+    def group(self, key: str) -> OpcodeStats:
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = OpcodeStats()
+            self.__buffers[key] = bytearray()
+        return stats
+
+    def add_opcodes(self, key: str, opcodes: bytes) -> None:
+        buffer = self.__buffers[key]
+        buffer += opcodes
+        if len(buffer) >= FLUSH_SIZE:
+            self.stats[key].add_counts(bytes(buffer))
+            buffer.clear()
+
+    def finish(self) -> dict[str, OpcodeStats]:
+        for key, buffer in self.__buffers.items():
+            if buffer:
+                self.stats[key].add_counts(bytes(buffer))
+                buffer.clear()
+        return self.stats
+
+
+def group_key(by: str, path: str, class_name: str) -> str:
+    """ The group of a class; `path` is the classpath element, jar or directory, the class was found under. """
+    if by == "jar":
+        return path
+    if by == "package":
+        return class_name.rpartition("/")[0]
+    return class_name
+
+
+def _collect(items: list[tuple[ClassSource, str]], by: str,
+             instrumentation: Instrumentation | None = None) -> dict[str, OpcodeStats]:
+    """ Worker entry: accumulate the stats of a batch of classes, each with its classpath element. """
+    accumulator = _Accumulator()
+    for source, path in items:
+        try:
+            java_class = JavaClass(source.load(instrumentation=instrumentation), instrumentation, CODE_ONLY)
+            key = group_key(by, path, java_class.get_class_name())
+            stats = accumulator.group(key)
+            stats.classes += 1
+            for method in java_class.get_methods():
+                for attribute in method.attributes:
+                    if not isinstance(attribute, CodeAttributeInfo):
+                        continue
+                    stats.methods += 1
+                    opcodes = opcode_stream(attribute.code)
+                    accumulator.add_opcodes(key, opcodes)
+                    if opcodes.translate(None, _NOT_INVOKE):
+                        _flag_calls(stats, attribute.code, java_class.constant_pool)
+        except Exception:
+            logger.warning("Failed to collect opcode stats of %s", source, exc_info=True)
+    return accumulator.finish()
+
+
+def _batches(items: Iterable[tuple[ClassSource, str]], batch_size: int) -> Iterator[list[tuple[ClassSource, str]]]:
+    items = iter(items)
+    while batch := list(islice(items, batch_size)):
+        yield batch
+
+
+def collect_opcode_stats(paths: Iterable[str], by: str = "jar", jobs: int = 1,
+                         batch_size: int = 256, instrumentation: Instrumentation | None = None
+                         ) -> dict[str, OpcodeStats]:
+    """ Opcode histograms of every method under the paths, grouped by jar, package or class.
+
+    Workers accumulate batches of classes into count arrays, which are merged here. Grouping by
+    jar groups classes by the given path they were found under, so a directory is one group.
+    """
+    if by not in GROUPINGS:
+        raise ValueError(f"Unsupported grouping: {by}, expected one of {', '.join(GROUPINGS)}")
+    worker = partial(_collect, by=by)
+    # Classes are attributed to the classpath element they were found under.
+    batches = _batches(((source, path) for path in paths for source in iter_class_sources([path])), batch_size)
+
+    merged: dict[str, OpcodeStats] = {}
+
+    def merge_all(results: Iterable[dict[str, OpcodeStats]]) -> None:
+        for result in results:
+            for key, stats in result.items():
+                if key in merged:
+                    merged[key].merge(stats)
+                else:
+                    merged[key] = stats
+
+    merge_all(map_sources(worker, batches, jobs, ordered=False, instrumentation=instrumentation))
+    return dict(sorted(merged.items()))
+
+
+def format_stats(stats_by_group: dict[str, OpcodeStats], top: int = 10) -> str:
+    lines = []
+    for key, stats in stats_by_group.items():
+        lines.append(f"{key or '<default>'}: {stats.classes} classes, {stats.methods} methods, "
+                     f"{stats.instructions} instructions, monitorenter {stats.monitorenter}, "
+                     f"reflection {stats.reflection}, boxing {stats.boxing}")
+        lines.append("    " + " ".join(f"{name}={count}" for name, count in stats.top(top)))
+    return "\n".join(lines)
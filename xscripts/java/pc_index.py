@@ -0,0 +1,170 @@
+import sys
+from array import array
+from functools import cached_property
+from typing import Iterable, NamedTuple
+
+from .attributes import (AttributeInfo, CodeAttributeInfo, LocalVariableTableAttributeInfo,
+                         LocalVariableTypeTableAttributeInfo)
+
+
+class IntervalIndex:
+    """ A static centered interval tree over half-open [start, end) intervals, flattened into arrays.
+
+    Each node keeps the intervals containing its center twice: by start ascending and by end
+    descending. A stabbing query walks one root-to-leaf path and stops scanning a node's list at
+    the first interval that cannot contain the point, so it runs in O(log n + k).
+    """
+
+    def __init__(self, starts: array, ends: array) -> None:
+        self.starts: array = starts
+        self.ends: array = ends
+        self.centers: array = array("I")
+        self.left: array = array("i")
+        self.right: array = array("i")
+        self.offsets: array = array("I")
+        self.by_start: array = array("I")
+        self.by_end: array = array("I")
+        self.__build()
+
+    def __build(self) -> None:
+        starts, ends = self.starts, self.ends
+        rows = sorted((row for row in range(len(starts)) if starts[row] < ends[row]), key=starts.__getitem__)
+        if not rows:
+            return
+        # Children are linked after they are built, so the work list carries the parent slot to patch.
+        work: list[tuple[list[int], array | None, int]] = [(rows, None, 0)]
+        while work:
+            rows, links, parent = work.pop()
+            node = len(self.centers)
+            if links is not None:
+                links[parent] = node
+            center = starts[rows[len(rows) // 2]]
+            here, left, right = [], [], []
+            for row in rows:
+                if ends[row] <= center:
+                    left.append(row)
+                elif starts[row] > center:
+                    right.append(row)
+                else:
+                    here.append(row)
+            self.centers.append(center)
+            self.left.append(-1)
+            self.right.append(-1)
+            self.offsets.append(len(self.by_start))
+            # rows are sorted by start, and so are the partitions.
+            self.by_start.extend(here)
+            self.by_end.extend(sorted(here, key=ends.__getitem__, reverse=True))
+            if left:
+                work.append((left, self.left, node))
+            if right:
+                work.append((right, self.right, node))
+        self.offsets.append(len(self.by_start))
+
+    def stab(self, point: int) -> list[int]:
+        """ Rows of the intervals containing the point, in no particular order. """
+        starts, ends, centers, offsets = self.starts, self.ends, self.centers, self.offsets
+        found = []
+        node = 0 if centers else -1
+        while node != -1:
+            if point < centers[node]:
+                for row in self.by_start[offsets[node]:offsets[node + 1]]:
+                    if starts[row] > point:
+                        break
+                    found.append(row)
+                node = self.left[node]
+            else:
+                for row in self.by_end[offsets[node]:offsets[node + 1]]:
+                    if ends[row] <= point:
+                        break
+                    found.append(row)
+                node = self.right[node]
+        return found
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+def _u2_columns(segment: bytes, width: int) -> list[array]:
+    """ Split a table of big-endian u2 rows into one native array per column. """
+    values = array("H", segment)
+    if sys.byteorder == "little":
+        values.byteswap()
+    return [values[column::width] for column in range(width)]
+
+
+class LiveLocal(NamedTuple):
+    """ A LocalVariableTable or LocalVariableTypeTable row; `type_index` is the descriptor or the signature. """
+    start_pc: int
+    length: int
+    name_index: int
+    type_index: int
+    index: int
+
+
+class Handler(NamedTuple):
+    start_pc: int
+    end_pc: int
+    handler_pc: int
+    catch_type: int
+
+
+class _LocalTable:
+    """ The rows of every local variable (type) table of a method as parallel columns. """
+
+    def __init__(self, tables: Iterable[LocalVariableTableAttributeInfo | LocalVariableTypeTableAttributeInfo]) -> None:
+        columns = [array("H") for _ in range(5)]
+        for table in tables:
+            for column, values in zip(columns, _u2_columns(table.raw[8:8 + table.parse_int(table.raw[6:8]) * 10], 5)):
+                column.extend(values)
+        self.start_pc, self.length, self.name_index, self.type_index, self.index = columns
+        ends = array("I", (start + length for start, length in zip(self.start_pc, self.length)))
+        self.intervals: IntervalIndex = IntervalIndex(array("I", self.start_pc), ends)
+
+    def live(self, pc: int) -> list[LiveLocal]:
+        rows = self.intervals.stab(pc)
+        rows.sort(key=self.index.__getitem__)
+        return [LiveLocal(self.start_pc[row], self.length[row], self.name_index[row], self.type_index[row],
+                          self.index[row]) for row in rows]
+
+
+class PcIndex:
+    """ Answers which locals are live and which exception handlers cover a pc of one method.
+
+    Each table is parsed into parallel arrays straight from the raw attribute bytes and indexed
+    on first use, so methods that are never queried cost nothing.
+    """
+
+    def __init__(self, code: CodeAttributeInfo, code_attributes: Iterable[AttributeInfo]) -> None:
+        self.code: CodeAttributeInfo = code
+        self.code_attributes: tuple[AttributeInfo, ...] = tuple(code_attributes)
+
+    @cached_property
+    def _local_variables(self) -> _LocalTable:
+        return _LocalTable(attribute for attribute in self.code_attributes
+                           if isinstance(attribute, LocalVariableTableAttributeInfo))
+
+    @cached_property
+    def _local_variable_types(self) -> _LocalTable:
+        return _LocalTable(attribute for attribute in self.code_attributes
+                           if isinstance(attribute, LocalVariableTypeTableAttributeInfo))
+
+    @cached_property
+    def _exception_table(self) -> tuple[list[array], IntervalIndex]:
+        code = self.code
+        start = 16 + code.code_length
+        columns = _u2_columns(code.raw[start:start + code.exception_table_length * 8], 4)
+        return columns, IntervalIndex(array("I", columns[0]), array("I", columns[1]))
+
+    def live_locals(self, pc: int) -> list[LiveLocal]:
+        """ LocalVariableTable rows in scope at pc, by slot; `type_index` is the descriptor index. """
+        return self._local_variables.live(pc)
+
+    def live_local_types(self, pc: int) -> list[LiveLocal]:
+        """ LocalVariableTypeTable rows in scope at pc, by slot; `type_index` is the signature index. """
+        return self._local_variable_types.live(pc)
+
+    def handlers(self, pc: int) -> list[Handler]:
+        """ Exception handlers covering pc, in exception table order, which is the order the JVM tries them. """
+        (start_pc, end_pc, handler_pc, catch_type), intervals = self._exception_table
+        return [Handler(start_pc[row], end_pc[row], handler_pc[row], catch_type[row])
+                for row in sorted(intervals.stab(pc))]
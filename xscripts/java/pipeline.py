@@ -1,10 +1,16 @@
 from dataclasses import dataclass
 from io import BufferedReader
-from os import SEEK_CUR, SEEK_SET
+from typing import BinaryIO
+from os import SEEK_CUR, SEEK_END, SEEK_SET
 
 from .constant_pool import ConstantPoolFactory, ConstantPoolInfoTags
+from .errors import ClassFormatError, TruncatedClassError
+from .instrumentation import Instrumentation, measure
+from .limits import ParseLimits
 from .utils import parse_int
 
+MAGIC = b"\xca\xfe\xba\xbe"
+
 
 @dataclass
 class ChunkedJavaClass:
@@ -26,6 +32,35 @@ class ChunkedJavaClass:
     attributes_info_segment: bytes
 
 
+class BoundedReader:
+    """ A view of a class file stream that refuses to read or skip past its end.
+
+    Hardened parsing reads through it, so a bogus length raises TruncatedClassError instead of
+    reading short or allocating a buffer for data that is not there.
+    """
+
+    def __init__(self, stream: BinaryIO, limits: ParseLimits) -> None:
+        self.__stream = stream
+        self.__start = stream.tell()
+        self.__size = stream.seek(0, SEEK_END) - self.__start
+        stream.seek(self.__start, SEEK_SET)
+        limits.check("max_class_bytes", self.__size)
+
+    def tell(self) -> int:
+        return self.__stream.tell() - self.__start
+
+    def read(self, size: int) -> bytes:
+        if self.tell() + size > self.__size:
+            raise TruncatedClassError(f"Read of {size} bytes at offset {self.tell()} runs past the end ({self.__size})")
+        return self.__stream.read(size)
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        target = offset + (self.tell() if whence == SEEK_CUR else 0)
+        if target > self.__size:
+            raise TruncatedClassError(f"Skip to offset {target} runs past the end ({self.__size})")
+        return self.__stream.seek(self.__start + target, SEEK_SET) - self.__start
+
+
 class JavaClassDumpPipeline:
     @staticmethod
     def __process_constant_pool_info(count: int, reader: BufferedReader) -> bytes:
@@ -60,12 +95,14 @@ class JavaClassDumpPipeline:
         return reader.read(end_cursor - savepoint)
 
     @staticmethod
-    def __process_attributes_info(count: int, reader: BufferedReader) -> bytes:
+    def __process_attributes_info(count: int, reader: BufferedReader, limits: ParseLimits | None = None) -> bytes:
         """Process the attributes info based on the count."""
         savepoint = reader.tell()
         for _ in range(count):
             reader.seek(2, SEEK_CUR)
             attribute_length = parse_int(reader.read(4))
+            if limits is not None:
+                limits.check("max_attribute_length", attribute_length)
             reader.seek(attribute_length, SEEK_CUR)
 
         end_cursor = reader.tell()
@@ -75,17 +112,22 @@ class JavaClassDumpPipeline:
         return reader.read(end_cursor - savepoint)
 
     @staticmethod
-    def __process_fields_and_methods_info(count: int, reader: BufferedReader) -> bytes:
+    def __process_fields_and_methods_info(count: int, reader: BufferedReader,
+                                          limits: ParseLimits | None = None) -> bytes:
         savepoint = reader.tell()
         for _ in range(count):
             reader.seek(6, SEEK_CUR)
 
             attribute_count = parse_int(reader.read(2))
+            if limits is not None:
+                limits.check("max_attributes", attribute_count)
 
             for _ in range(attribute_count):
                 # Skip attribute name index and length
                 reader.seek(2, SEEK_CUR)
                 attribute_length = parse_int(reader.read(4))
+                if limits is not None:
+                    limits.check("max_attribute_length", attribute_length)
                 # Skip the attribute info
                 reader.seek(attribute_length, SEEK_CUR)
 
@@ -95,64 +137,110 @@ class JavaClassDumpPipeline:
 
         return reader.read(end_cursor - savepoint)
 
-    def __init__(self, class_file_path: str) -> None:
+    def __init__(self, class_file_path: str, instrumentation: Instrumentation | None = None,
+                 limits: ParseLimits | None = None) -> None:
         self.class_file_path = class_file_path
+        self.instrumentation = instrumentation
+        self.limits = limits
 
     def run(self) -> ChunkedJavaClass:
         with open(self.class_file_path, "rb") as class_file:
-            magic_segment = class_file.read(4)
-            minor_version_segment = class_file.read(2)
-            major_version_segment = class_file.read(2)
-            constant_pool_count_segment = class_file.read(2)
-
-            # Read constant pool
-            constant_pool_info_segment = self.__process_constant_pool_info(
-                parse_int(constant_pool_count_segment), class_file
-            )
-            access_flags_segment = class_file.read(2)
-            this_class_segment = class_file.read(2)
-            super_class_segment = class_file.read(2)
-            interfaces_count_segment = class_file.read(2)
-            interfaces_segment = class_file.read(
-                2 * parse_int(interfaces_count_segment)
-            )
-
-            # Read fields
-            fields_count_segment = class_file.read(2)
-            fields_info_segment = self.__process_fields_and_methods_info(
-                parse_int(fields_count_segment), class_file
-            )
-
-            # Read methods
-            methods_count_segment = class_file.read(2)
-            methods_info_segment = self.__process_fields_and_methods_info(
-                parse_int(methods_count_segment), class_file
-            )
-
-            # Read attributes
-            attributes_count_segment = class_file.read(2)
-            attributes_info_segment = self.__process_attributes_info(
-                parse_int(attributes_count_segment), class_file
-            )
-
-            return ChunkedJavaClass(
-                magic_segment,
-                minor_version_segment,
-                major_version_segment,
-                constant_pool_count_segment,
-                constant_pool_info_segment,
-                access_flags_segment,
-                this_class_segment,
-                super_class_segment,
-                interfaces_count_segment,
-                interfaces_segment,
-                fields_count_segment,
-                fields_info_segment,
-                methods_count_segment,
-                methods_info_segment,
-                attributes_count_segment,
-                attributes_info_segment,
-            )
+            return self.dump(class_file, self.instrumentation, self.limits)
+
+    @classmethod
+    def dump(cls, class_file: BinaryIO, instrumentation: Instrumentation | None = None,
+             limits: ParseLimits | None = None) -> ChunkedJavaClass:
+        """Chunk a class file from a seekable binary stream, e.g. a BytesIO over an archive entry.
+
+        With limits, the stream is read through a BoundedReader and counts and lengths are checked
+        as they are read; malformed input raises a ClassFormatError subclass.
+        """
+        if limits is None:
+            return cls.__dump(class_file, instrumentation)
+        try:
+            return cls.__dump(BoundedReader(class_file, limits), instrumentation, limits)
+        except ClassFormatError:
+            raise
+        except ValueError as e:
+            # e.g. an unknown constant pool tag
+            raise ClassFormatError(str(e)) from e
+
+    @classmethod
+    def __dump(cls, class_file: BinaryIO, instrumentation: Instrumentation | None = None,
+               limits: ParseLimits | None = None) -> ChunkedJavaClass:
+        magic_segment = class_file.read(4)
+        if limits is not None and magic_segment != MAGIC:
+            raise ClassFormatError(f"Bad magic {magic_segment.hex().upper()}")
+        minor_version_segment = class_file.read(2)
+        major_version_segment = class_file.read(2)
+        constant_pool_count_segment = class_file.read(2)
+
+        # Read constant pool
+        constant_pool_count = parse_int(constant_pool_count_segment)
+        if limits is not None:
+            limits.check("max_constant_pool_entries", constant_pool_count)
+        constant_pool_info_segment = measure(
+            instrumentation, "chunk_constant_pool", cls.__process_constant_pool_info,
+            constant_pool_count, class_file, nbytes=len, objects=constant_pool_count - 1
+        )
+        access_flags_segment = class_file.read(2)
+        this_class_segment = class_file.read(2)
+        super_class_segment = class_file.read(2)
+        interfaces_count_segment = class_file.read(2)
+        if limits is not None:
+            limits.check("max_members", parse_int(interfaces_count_segment))
+        interfaces_segment = class_file.read(
+            2 * parse_int(interfaces_count_segment)
+        )
+
+        # Read fields
+        fields_count_segment = class_file.read(2)
+        fields_count = parse_int(fields_count_segment)
+        if limits is not None:
+            limits.check("max_members", fields_count)
+        fields_info_segment = measure(
+            instrumentation, "chunk_fields", cls.__process_fields_and_methods_info,
+            fields_count, class_file, limits, nbytes=len, objects=fields_count
+        )
+
+        # Read methods
+        methods_count_segment = class_file.read(2)
+        methods_count = parse_int(methods_count_segment)
+        if limits is not None:
+            limits.check("max_members", methods_count)
+        methods_info_segment = measure(
+            instrumentation, "chunk_methods", cls.__process_fields_and_methods_info,
+            methods_count, class_file, limits, nbytes=len, objects=methods_count
+        )
+
+        # Read attributes
+        attributes_count_segment = class_file.read(2)
+        attributes_count = parse_int(attributes_count_segment)
+        if limits is not None:
+            limits.check("max_attributes", attributes_count)
+        attributes_info_segment = measure(
+            instrumentation, "chunk_attributes", cls.__process_attributes_info,
+            attributes_count, class_file, limits, nbytes=len, objects=attributes_count
+        )
+
+        return ChunkedJavaClass(
+            magic_segment,
+            minor_version_segment,
+            major_version_segment,
+            constant_pool_count_segment,
+            constant_pool_info_segment,
+            access_flags_segment,
+            this_class_segment,
+            super_class_segment,
+            interfaces_count_segment,
+            interfaces_segment,
+            fields_count_segment,
+            fields_info_segment,
+            methods_count_segment,
+            methods_info_segment,
+            attributes_count_segment,
+            attributes_info_segment,
+        )
 
     def __repr__(self) -> str:
         return f"JavaClassDumpPipeline(class_file_path={self.class_file_path})"
@@ -0,0 +1,172 @@
+import logging
+import os
+import zipfile
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from .attributes import DecodePolicy, RuntimeInvisibleAnnotationsAttributeInfo, RuntimeVisibleAnnotationsAttributeInfo
+from .classpath import ClassSource, is_archive, iter_class_sources, map_sources
+from .dependencies import class_dependencies
+from .enums import MethodAccessFlags
+from .instrumentation import Instrumentation
+from .java_class import JavaClass
+
+logger = logging.getLogger(__name__)
+
+SERVICES_DIRECTORY = "META-INF/services/"
+MAIN_DESCRIPTOR = "([Ljava/lang/String;)V"
+# Only class annotations are needed to find annotated entry points.
+ANNOTATIONS_ONLY = DecodePolicy.only("RuntimeVisibleAnnotations", "RuntimeInvisibleAnnotations")
+
+
+@dataclass(frozen=True)
+class ClassFacts:
+    """ What the reachability analysis needs to know about one class. """
+    name: str
+    path: str
+    dependencies: tuple[str, ...]
+    annotations: tuple[str, ...]
+    has_main: bool
+
+
+@dataclass(frozen=True)
+class ReachabilityReport:
+    entry_points: tuple[str, ...]
+    reachable: tuple[str, ...]
+    unreachable: tuple[str, ...]
+    unused_paths: tuple[str, ...]
+
+
+def class_facts(java_class: JavaClass, path: str) -> ClassFacts:
+    constant_pool = java_class.constant_pool
+    annotations = []
+    for attribute in java_class.get_attributes():
+        if isinstance(attribute, (RuntimeVisibleAnnotationsAttributeInfo, RuntimeInvisibleAnnotationsAttributeInfo)):
+            for annotation in attribute.annotations:
+                descriptor = constant_pool.get_utf8_constant_pool_info(annotation.type_index).string
+                annotations.append(descriptor[1:-1])
+
+    has_main = any(
+        MethodAccessFlags.is_static(method.access_flags) and MethodAccessFlags.is_public(method.access_flags)
+        and constant_pool.get_utf8_constant_pool_info(method.name_index).string == "main"
+        and constant_pool.get_utf8_constant_pool_info(method.descriptor_index).string == MAIN_DESCRIPTOR
+        for method in java_class.get_methods())
+    return ClassFacts(java_class.get_class_name(), path, tuple(class_dependencies(java_class)), tuple(annotations),
+                      has_main)
+
+
+def _class_facts(item: tuple[ClassSource, str], instrumentation: Instrumentation | None = None) -> ClassFacts | None:
+    source, path = item
+    try:
+        return class_facts(JavaClass(source.load(instrumentation=instrumentation), instrumentation, ANNOTATIONS_ONLY),
+                           path)
+    except Exception:
+        logger.warning("Failed to parse %s", source, exc_info=True)
+        return None
+
+
+def _parse_providers(data: bytes) -> Iterator[str]:
+    for line in data.decode("utf-8").splitlines():
+        provider = line.partition("#")[0].strip()
+        if provider:
+            yield provider.replace(".", "/")
+
+
+def iter_service_providers(paths: Iterable[str]) -> Iterator[str]:
+    """ Yield the provider classes listed in META-INF/services of archives and class directories. """
+    for path in paths:
+        if os.path.isdir(path):
+            services = os.path.join(path, *SERVICES_DIRECTORY.split("/"))
+            if os.path.isdir(services):
+                for file_name in sorted(os.listdir(services)):
+                    with open(os.path.join(services, file_name), "rb") as service_file:
+                        yield from _parse_providers(service_file.read())
+        elif is_archive(path):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if info.filename.startswith(SERVICES_DIRECTORY) and not info.is_dir():
+                        yield from _parse_providers(archive.read(info))
+
+
+class ReachabilityGraph:
+    """ Classes interned to integer ids, with dependency edges kept as arrays of ids. """
+
+    def __init__(self) -> None:
+        self.facts: list[ClassFacts] = []
+        self.ids: dict[str, int] = {}
+
+    def add(self, facts: ClassFacts) -> None:
+        """ Add a class; the first occurrence of a name on the classpath wins. """
+        if facts.name not in self.ids:
+            self.ids[facts.name] = len(self.facts)
+            self.facts.append(facts)
+
+    def successors(self) -> list[array]:
+        """ Dependency edges by class id, restricted to classes of the graph. """
+        ids = self.ids
+        return [array("I", (ids[name] for name in facts.dependencies if name in ids)) for facts in self.facts]
+
+    def reachable(self, roots: Iterable[int]) -> bytearray:
+        """ Mark every class reachable from the roots in a bitset, one bit per class id. """
+        successors = self.successors()
+        marked = bytearray((len(self.facts) + 7) >> 3)
+        worklist = []
+        for root in roots:
+            if not marked[root >> 3] & (1 << (root & 7)):
+                marked[root >> 3] |= 1 << (root & 7)
+                worklist.append(root)
+        while worklist:
+            for successor in successors[worklist.pop()]:
+                if not marked[successor >> 3] & (1 << (successor & 7)):
+                    marked[successor >> 3] |= 1 << (successor & 7)
+                    worklist.append(successor)
+        return marked
+
+
+def analyze_reachability(paths: Iterable[str], entry_points: Iterable[str] = (), main_classes: bool = True,
+                         annotations: Iterable[str] = (), services: bool = True, jobs: int = 1,
+                         chunksize: int = 64, instrumentation: Instrumentation | None = None) -> ReachabilityReport:
+    """ Find the classes and paths (jars, directories) of a classpath unreachable from its entry points.
+
+    Roots are the named entry points, classes with a public static main method, classes carrying
+    one of the given annotations and the providers listed in META-INF/services.
+    """
+    paths = list(paths)
+    graph = ReachabilityGraph()
+    # Classes are attributed to the classpath element they were found under.
+    sources = ((source, path) for path in paths for source in iter_class_sources([path]))
+
+    def add_all(results: Iterable[ClassFacts | None]) -> None:
+        for facts in results:
+            if facts is not None:
+                graph.add(facts)
+
+    # In classpath order, so shadowed duplicates are dropped consistently.
+    add_all(map_sources(_class_facts, sources, jobs, chunksize, instrumentation=instrumentation))
+
+    annotations = {annotation.replace(".", "/") for annotation in annotations}
+    roots = {name.replace(".", "/") for name in entry_points}
+    if services:
+        roots.update(iter_service_providers(paths))
+    for facts in graph.facts:
+        if main_classes and facts.has_main or annotations.intersection(facts.annotations):
+            roots.add(facts.name)
+    for name in sorted(roots - graph.ids.keys()):
+        logger.warning("Entry point %s is not on the classpath", name)
+    root_ids = sorted(graph.ids[name] for name in roots if name in graph.ids)
+
+    marked = graph.reachable(root_ids)
+    reachable, unreachable = [], []
+    used_paths = set()
+    for class_id, facts in enumerate(graph.facts):
+        if marked[class_id >> 3] & (1 << (class_id & 7)):
+            reachable.append(facts.name)
+            used_paths.add(facts.path)
+        else:
+            unreachable.append(facts.name)
+
+    return ReachabilityReport(
+        tuple(graph.facts[class_id].name for class_id in root_ids),
+        tuple(sorted(reachable)), tuple(sorted(unreachable)),
+        tuple(path for path in dict.fromkeys(paths) if path not in used_paths))
@@ -0,0 +1,222 @@
+import logging
+import mmap
+import os
+import struct
+import zipfile
+import zlib
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Callable, Iterable, Iterator
+
+from .attributes.policy import DECODE_NONE
+from .classpath import CLASS_SUFFIX, entry_window, is_archive, map_sources, open_archive
+from .java_class import JavaClass
+from .limits import UNTRUSTED
+from .pipeline import JavaClassDumpPipeline
+from .utils import parse_int
+from .writer import U2, class_bytes
+
+logger = logging.getLogger(__name__)
+
+DEBUG_ATTRIBUTES = frozenset({"LineNumberTable", "LocalVariableTable", "LocalVariableTypeTable",
+                              "SourceDebugExtension"})
+ATTRIBUTE_HEADER = struct.Struct(">HI")
+# Set when sizes and CRC follow the data in a descriptor; shrunk entries carry them in the header.
+DATA_DESCRIPTOR_FLAG = 0x08
+ENCRYPTED_FLAG = 0x01
+
+
+@dataclass(frozen=True)
+class ShrinkReport:
+    path: str
+    output: str
+    classes: int
+    failed: int
+    class_bytes_before: int
+    class_bytes_after: int
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    def __str__(self) -> str:
+        ratio = self.saved / self.bytes_before if self.bytes_before else 0.0
+        return (f"{self.path}: {self.bytes_before:,} -> {self.bytes_after:,} bytes, saved {self.saved:,} "
+                f"({ratio:.1%}); {self.classes} classes, {self.failed} kept as is")
+
+
+def _strip_code(raw: memoryview, name_of: Callable[[int], str]) -> bytes | None:
+    """ A Code attribute without its debug attributes, or None if it has none. """
+    table = 14 + parse_int(raw[10:14])
+    table += 2 + parse_int(raw[table:table + 2]) * 8
+    count = parse_int(raw[table:table + 2])
+    kept, start = [], table + 2
+    for _ in range(count):
+        end = start + 6 + parse_int(raw[start + 2:start + 6])
+        if name_of(parse_int(raw[start:start + 2])) not in DEBUG_ATTRIBUTES:
+            kept.append(raw[start:end])
+        start = end
+    if len(kept) == count:
+        return None
+    body = b"".join((raw[6:table], U2.pack(len(kept)), *kept))
+    return ATTRIBUTE_HEADER.pack(parse_int(raw[0:2]), len(body)) + body
+
+
+def strip_debug_info(data: bytes) -> bytes:
+    """ Remove the debug attributes from a class file and compact its constant pool.
+
+    LineNumberTable, LocalVariableTable and LocalVariableTypeTable are dropped from every Code
+    attribute and SourceDebugExtension from the class. A class with an attribute the writer cannot
+    renumber is stripped without compacting the pool. The class is read within the UNTRUSTED
+    limits, so a truncated class raises instead of being written back short.
+    """
+    java_class = JavaClass(JavaClassDumpPipeline.dump(BytesIO(data), limits=UNTRUSTED), decode_policy=DECODE_NONE)
+    constant_pool = java_class.constant_pool
+
+    def name_of(index: int) -> str:
+        return constant_pool.get_utf8_constant_pool_info(index).string
+
+    java_class.attributes = tuple(attribute for attribute in java_class.attributes
+                                  if attribute.attribute_name not in DEBUG_ATTRIBUTES)
+    for method in java_class.methods:
+        attributes = list(method.attributes)
+        for i, attribute in enumerate(attributes):
+            if attribute.attribute_name == "Code":
+                code = _strip_code(memoryview(attribute.raw), name_of)
+                if code is not None:
+                    attributes[i] = type(attribute)(code, attribute.attribute_name)
+        method.attributes = tuple(attributes)
+    try:
+        return class_bytes(java_class, compact=True)
+    except ValueError:
+        logger.info("Not compacting the constant pool of %s", java_class.get_class_name(), exc_info=True)
+        return class_bytes(java_class)
+
+
+def _compress_type(info: zipfile.ZipInfo) -> int:
+    """ Stored classes stay stored, compressed ones are deflated. """
+    return zipfile.ZIP_STORED if info.compress_type == zipfile.ZIP_STORED else zipfile.ZIP_DEFLATED
+
+
+def _compress(data: bytes, compress_type: int) -> bytes:
+    if compress_type == zipfile.ZIP_STORED:
+        return data
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _shrink_entry(item: tuple[str, str]) -> tuple[bytes, int, int] | None:
+    """ Worker entry: strip one class of an archive and compress it like the original entry.
+
+    Returns the stored bytes, CRC and uncompressed size, or None to copy the entry unchanged.
+    """
+    path, name = item
+    try:
+        archive = open_archive(path)
+        info = archive.getinfo(name)
+        data = strip_debug_info(archive.read(info))
+        return _compress(data, _compress_type(info)), zlib.crc32(data), len(data)
+    except Exception:
+        logger.warning("Failed to strip %s!/%s, copying it unchanged", path, name, exc_info=True)
+        return None
+
+
+def write_raw_entry(archive: zipfile.ZipFile, info: zipfile.ZipInfo, data: bytes | memoryview) -> None:
+    """ Append an entry whose data is already compressed, without compressing it again.
+
+    `info` must carry the compress_type, CRC, compress_size and file_size of `data`. The sizes and
+    CRC are written into the local header, so the data descriptor flag is cleared: entries copied
+    from a streamed archive would otherwise point at a descriptor that is not written.
+
+    zipfile has no public API for this, so this does what ZipFile.writestr does once the data is
+    compressed, with the same ZipFile internals: fp, filelist, NameToInfo, start_dir, _lock,
+    _writing and _didModify. It is the only place in the package that touches them.
+    """
+    if archive.mode not in ("w", "x", "a"):
+        raise ValueError("write_raw_entry() requires mode 'w', 'x', or 'a'")
+    with archive._lock:
+        if archive._writing:
+            raise ValueError("Can't write to the ZIP file while there is an open writing handle")
+        archive.fp.seek(archive.start_dir)
+        info.header_offset = archive.start_dir
+        info.flag_bits &= ~DATA_DESCRIPTOR_FLAG
+        archive.fp.write(info.FileHeader())
+        archive.fp.write(data)
+        archive.filelist.append(info)
+        archive.NameToInfo[info.filename] = info
+        archive.start_dir = archive.fp.tell()
+        archive._didModify = True
+
+
+def _is_class(info: zipfile.ZipInfo) -> bool:
+    return info.filename.endswith(CLASS_SUFFIX) and not info.is_dir() and not info.flag_bits & ENCRYPTED_FLAG
+
+
+def _copy_info(info: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    copy = zipfile.ZipInfo(info.filename, info.date_time)
+    for name in ("compress_type", "comment", "extra", "create_system", "create_version", "extract_version",
+                 "flag_bits", "internal_attr", "external_attr", "CRC", "compress_size", "file_size"):
+        setattr(copy, name, getattr(info, name))
+    return copy
+
+
+def _class_entries(paths: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """ The (archive, entry) of every class to strip, archive by archive in central directory order. """
+    for path in paths:
+        with zipfile.ZipFile(path) as archive:
+            yield from ((path, info.filename) for info in archive.infolist() if _is_class(info))
+
+
+def _shrink_jar(path: str, output: str, results: Iterator[tuple[bytes, int, int] | None]) -> ShrinkReport:
+    """ Copy one archive, taking the stripped classes from `results`, which are in _class_entries order. """
+    classes = failed = before = after = 0
+    with open(path, "rb") as source_file, mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+            zipfile.ZipFile(path) as source, zipfile.ZipFile(output, "w") as target:
+        infos = source.infolist()
+        if any(info.filename.startswith("META-INF/") and info.filename.endswith(".SF") for info in infos):
+            logger.warning("%s is signed; stripped classes will not match its signature", path)
+        view = memoryview(mapped)
+        for info in infos:
+            shrunk = next(results) if _is_class(info) else None
+            if _is_class(info):
+                classes += 1
+                before += info.file_size
+                failed += shrunk is None
+                after += info.file_size if shrunk is None else shrunk[2]
+            if shrunk is None:
+                with entry_window(view, info) as stored:
+                    write_raw_entry(target, _copy_info(info), stored)
+            else:
+                data, crc, size = shrunk
+                copy = _copy_info(info)
+                copy.compress_type = _compress_type(info)
+                copy.CRC, copy.file_size, copy.compress_size = crc, size, len(data)
+                write_raw_entry(target, copy, data)
+        view.release()
+    return ShrinkReport(path, output, classes, failed, before, after, os.path.getsize(path), os.path.getsize(output))
+
+
+def shrink_jars(paths: Iterable[str], output_directory: str, jobs: int = 1,
+                chunksize: int = 16) -> list[ShrinkReport]:
+    """ Write a debug-stripped copy of every archive into a directory, under the same file name.
+
+    Classes are stripped by worker processes; every other entry is copied as stored, without
+    recompressing it. Entries keep their order, names, timestamps and attributes.
+    """
+    paths = list(paths)
+    for path in paths:
+        if not is_archive(path):
+            raise ValueError(f"Not an archive: {path}")
+    os.makedirs(output_directory, exist_ok=True)
+    outputs = [os.path.join(output_directory, os.path.basename(path)) for path in paths]
+    for path, output in zip(paths, outputs):
+        if os.path.exists(output) and os.path.samefile(path, output):
+            raise ValueError(f"Output {output} would overwrite its input")
+
+    results = map_sources(_shrink_entry, _class_entries(paths), jobs, chunksize)
+    try:
+        return [_shrink_jar(path, output, results) for path, output in zip(paths, outputs)]
+    finally:
+        results.close()
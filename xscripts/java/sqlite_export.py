@@ -0,0 +1,203 @@
+import sqlite3
+from typing import Iterable
+
+from .attributes import AttributeInfo, RawAttributeInfo, RuntimeInvisibleAnnotationsAttributeInfo, \
+    RuntimeVisibleAnnotationsAttributeInfo
+from .constant_pool import ConstantPool
+from .java_class import JavaClass
+
+# Attributes exported to the annotations table; decoded here when a DecodePolicy left them raw.
+ANNOTATION_ATTRIBUTES = frozenset({"RuntimeVisibleAnnotations", "RuntimeInvisibleAnnotations"})
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS classes (
+    id            INTEGER PRIMARY KEY,
+    name          TEXT    NOT NULL,
+    super_name    TEXT,
+    access_flags  INTEGER NOT NULL,
+    minor_version INTEGER NOT NULL,
+    major_version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS interfaces (
+    class_id INTEGER NOT NULL,
+    name     TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fields (
+    class_id     INTEGER NOT NULL,
+    name         TEXT    NOT NULL,
+    descriptor   TEXT    NOT NULL,
+    access_flags INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS methods (
+    class_id     INTEGER NOT NULL,
+    name         TEXT    NOT NULL,
+    descriptor   TEXT    NOT NULL,
+    access_flags INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS annotations (
+    class_id    INTEGER NOT NULL,
+    target_kind TEXT    NOT NULL,
+    target_name TEXT,
+    type        TEXT    NOT NULL,
+    visible     INTEGER NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS classes_name ON classes (name);
+CREATE INDEX IF NOT EXISTS classes_super_name ON classes (super_name);
+CREATE INDEX IF NOT EXISTS interfaces_class_id ON interfaces (class_id);
+CREATE INDEX IF NOT EXISTS interfaces_name ON interfaces (name);
+CREATE INDEX IF NOT EXISTS fields_class_id ON fields (class_id);
+CREATE INDEX IF NOT EXISTS methods_class_id ON methods (class_id);
+CREATE INDEX IF NOT EXISTS methods_name ON methods (name);
+CREATE INDEX IF NOT EXISTS annotations_class_id ON annotations (class_id);
+CREATE INDEX IF NOT EXISTS annotations_type ON annotations (type);
+"""
+
+INSERTS = {
+    "classes": "INSERT INTO classes VALUES (?, ?, ?, ?, ?, ?)",
+    "interfaces": "INSERT INTO interfaces VALUES (?, ?)",
+    "fields": "INSERT INTO fields VALUES (?, ?, ?, ?)",
+    "methods": "INSERT INTO methods VALUES (?, ?, ?, ?)",
+    "annotations": "INSERT INTO annotations VALUES (?, ?, ?, ?, ?)",
+}
+
+
+class SqliteClassExporter:
+    """ Streams JavaClass objects into normalized SQLite tables.
+
+    Rows are buffered per table and written with executemany; a transaction is committed every
+    `transaction_size` classes. Indexes are built once loading is finished, so memory use is bounded
+    by the buffers and does not depend on the number of exported classes.
+    """
+
+    def __init__(self, database: str, batch_size: int = 10_000, transaction_size: int = 50_000) -> None:
+        self.database = database
+        self.batch_size = batch_size
+        self.transaction_size = transaction_size
+
+        self.__connection = sqlite3.connect(database, isolation_level=None)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL keeps the database consistent on a crash and only syncs at checkpoints.
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(SCHEMA)
+
+        self.__next_class_id: int = self.__connection.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM classes").fetchone()[0]
+        self.__rows: dict[str, list[tuple]] = {table: [] for table in INSERTS}
+        self.__pending_classes = 0
+
+    @staticmethod
+    def __utf8(constant_pool: ConstantPool, index: int) -> str:
+        return constant_pool.get_utf8_constant_pool_info(index).string
+
+    def __annotations(self, class_id: int, target_kind: str, target_name: str | None,
+                      attributes: tuple[AttributeInfo, ...], constant_pool: ConstantPool) -> None:
+        rows = self.__rows["annotations"]
+        for attribute in attributes:
+            if isinstance(attribute, RawAttributeInfo) and attribute.attribute_name in ANNOTATION_ATTRIBUTES \
+                    and attribute.is_decodable():
+                attribute = attribute.decoded
+            if isinstance(attribute, RuntimeVisibleAnnotationsAttributeInfo):
+                visible = 1
+            elif isinstance(attribute, RuntimeInvisibleAnnotationsAttributeInfo):
+                visible = 0
+            else:
+                continue
+            for annotation in attribute.annotations:
+                rows.append((class_id, target_kind, target_name, self.__utf8(constant_pool, annotation.type_index),
+                             visible))
+
+    def add(self, java_class: JavaClass) -> int:
+        """ Buffer the rows of one class and return its id. """
+        class_id = self.__next_class_id
+        self.__next_class_id += 1
+
+        constant_pool = java_class.constant_pool
+        class_name = java_class.get_class_name()
+        self.__rows["classes"].append((
+            class_id,
+            class_name,
+            java_class.get_super_class_name() if java_class.super_class else None,
+            java_class.access_flags,
+            java_class.get_minor_version(),
+            java_class.get_major_version(),
+        ))
+        self.__rows["interfaces"].extend((class_id, name) for name in java_class.get_interfaces())
+        self.__annotations(class_id, "class", class_name, java_class.get_attributes(), constant_pool)
+
+        for kind, members in (("field", java_class.get_fields()), ("method", java_class.get_methods())):
+            rows = self.__rows[f"{kind}s"]
+            for member in members:
+                name = self.__utf8(constant_pool, member.name_index)
+                rows.append((class_id, name, self.__utf8(constant_pool, member.descriptor_index),
+                             member.access_flags))
+                self.__annotations(class_id, kind, name, member.attributes, constant_pool)
+
+        self.__pending_classes += 1
+        if any(len(rows) >= self.batch_size for rows in self.__rows.values()):
+            self.flush()
+        if self.__pending_classes >= self.transaction_size:
+            self.commit()
+
+        return class_id
+
+    def flush(self) -> None:
+        """ Write all buffered rows inside the current transaction. """
+        if not self.__connection.in_transaction:
+            self.__connection.execute("BEGIN")
+        for table, rows in self.__rows.items():
+            if rows:
+                self.__connection.executemany(INSERTS[table], rows)
+                rows.clear()
+
+    def commit(self) -> None:
+        self.flush()
+        self.__connection.execute("COMMIT")
+        self.__pending_classes = 0
+
+    def export(self, java_classes: Iterable[JavaClass]) -> int:
+        """ Export every class of the iterable, consuming it lazily. Returns the number of classes. """
+        count = 0
+        for java_class in java_classes:
+            self.add(java_class)
+            count += 1
+        self.commit()
+        return count
+
+    def close(self) -> None:
+        """ Commit pending rows, build the indexes and close the database. """
+        self.commit()
+        self.__connection.executescript(INDEXES)
+        self.__connection.execute("PRAGMA optimize")
+        self.__connection.close()
+
+    def abort(self) -> None:
+        """ Drop the rows of the open transaction and close the database without indexing it.
+
+        Transactions committed before stay in the database.
+        """
+        for rows in self.__rows.values():
+            rows.clear()
+        if self.__connection.in_transaction:
+            self.__connection.execute("ROLLBACK")
+        self.__connection.close()
+
+    def __enter__(self) -> "SqliteClassExporter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __repr__(self) -> str:
+        return f"SqliteClassExporter(database={self.database})"
+
+
+def export_to_sqlite(database: str, java_classes: Iterable[JavaClass], batch_size: int = 10_000) -> int:
+    """ Export classes to a SQLite database and index it. Returns the number of exported classes. """
+    with SqliteClassExporter(database, batch_size=batch_size) as exporter:
+        return exporter.export(java_classes)
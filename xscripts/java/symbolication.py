@@ -0,0 +1,335 @@
+import logging
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+from .attributes import DecodePolicy, LineNumberTableAttributeInfo, SourceFileAttributeInfo
+from .classpath import ClassSource, iter_class_sources, map_sources
+from .instrumentation import Instrumentation
+from .java_class import JavaClass
+
+logger = logging.getLogger(__name__)
+
+NO_STRING = 0xFFFFFFFF
+LINES_ONLY = DecodePolicy.only("Code", "LineNumberTable", "SourceFile")
+
+
+@dataclass(frozen=True)
+class MethodLines:
+    """ The line number table of one method as parallel arrays sorted by pc. """
+    name: str
+    descriptor: str
+    code_length: int
+    pcs: array
+    lines: array
+
+
+@dataclass(frozen=True)
+class ClassLines:
+    name: str
+    source_file: str | None
+    methods: tuple[MethodLines, ...]
+
+
+@dataclass(frozen=True)
+class SourceFrame:
+    """ A symbolicated stack frame. `line` is None when the method has no line numbers. """
+    class_name: str
+    method: str
+    descriptor: str
+    source_file: str | None
+    line: int | None
+
+    def __str__(self) -> str:
+        location = self.source_file or "Unknown Source"
+        if self.line is not None:
+            location = f"{location}:{self.line}"
+        return f"{self.class_name.replace('/', '.')}.{self.method}({location})"
+
+
+def _line_table(table: LineNumberTableAttributeInfo) -> array:
+    """ The u2 start_pc/line_number pairs of a table, interleaved, in native byte order. """
+    pairs = array("H", table.raw[8:8 + table.line_number_table_length * 4])
+    if sys.byteorder == "little":
+        pairs.byteswap()
+    return pairs
+
+
+def class_lines(java_class: JavaClass) -> ClassLines:
+    """ Extract the source file and per-method line number tables of a class. """
+    constant_pool = java_class.constant_pool
+    source_file = None
+    for attribute in java_class.get_attributes():
+        if isinstance(attribute, SourceFileAttributeInfo):
+            source_file = constant_pool.get_utf8_constant_pool_info(attribute.sourcefile_index).string
+
+    methods = []
+    for method in java_class.get_methods():
+        code = method.code
+        if code is None:
+            continue
+        pairs = array("H")
+        for attribute in method.code_attributes:
+            if isinstance(attribute, LineNumberTableAttributeInfo):
+                pairs.extend(_line_table(attribute))
+        pcs, lines = pairs[0::2], pairs[1::2]
+        if any(pcs[i] > pcs[i + 1] for i in range(len(pcs) - 1)):
+            ordered = sorted(zip(pcs, lines))
+            pcs, lines = array("H", (pc for pc, _ in ordered)), array("H", (line for _, line in ordered))
+        methods.append(MethodLines(constant_pool.get_utf8_constant_pool_info(method.name_index).string,
+                                   constant_pool.get_utf8_constant_pool_info(method.descriptor_index).string,
+                                   code.code_length, pcs, lines))
+    return ClassLines(java_class.get_class_name(), source_file, tuple(methods))
+
+
+class LineNumberIndex:
+    """ Line number tables of a whole classpath, queried in place through a memory map.
+
+    Method records are stored column by column and sorted by (class, method name) string ids;
+    the string table is sorted, so ids compare like strings. Every column is a native-order
+    array viewed with memoryview.cast, so a lookup is a few bisects over the mapped file.
+
+    Layout (native byte order, every section aligned to 8 bytes):
+        header {
+            u1 magic[4];
+            u4 version;
+            u4 byte_order_mark;     0x01020304 in the writer's byte order
+            u4 methods_count;
+            u4 strings_count;
+            u4 strings_size;
+            u4 lines_count;
+            u4 pad;
+        }
+        keys            u8[methods_count]   class_id << 32 | name_id
+        descriptor      u4[methods_count]
+        source_file     u4[methods_count]
+        code_length     u4[methods_count]
+        lines_start     u4[methods_count]
+        lines_count     u4[methods_count]
+        pcs             u2[lines_count]
+        lines           u2[lines_count]
+        string_offsets  u4[strings_count + 1]
+        string_data     u1[strings_size]
+    """
+    MAGIC = b"XJLN"
+    VERSION = 1
+    BYTE_ORDER_MARK = 0x01020304
+    HEADER = struct.Struct("=4sIIIIIII")
+    COLUMNS: tuple[tuple[str, str], ...] = (
+        ("keys", "Q"),
+        ("descriptor", "I"),
+        ("source_file", "I"),
+        ("code_length", "I"),
+        ("lines_start", "I"),
+        ("lines_count", "I"),
+    )
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + 7) & ~7
+
+    @classmethod
+    def layout(cls, methods_count: int, strings_count: int, lines_count: int) -> dict[str, tuple[int, int]]:
+        """ Compute the (offset, size) of every section. """
+        sections = [(name, methods_count * array(typecode).itemsize) for name, typecode in cls.COLUMNS]
+        sections += [("pcs", lines_count * 2), ("lines", lines_count * 2), ("string_offsets", (strings_count + 1) * 4)]
+        offsets = {}
+        offset = cls._align(cls.HEADER.size)
+        for name, size in sections:
+            offsets[name] = offset, size
+            offset = cls._align(offset + size)
+        offsets["string_data"] = offset, 0
+        return offsets
+
+    def __init__(self, buffer: mmap.mmap | bytes) -> None:
+        self.__buffer = buffer
+        (magic, version, byte_order_mark, methods_count, strings_count, strings_size, lines_count,
+         _) = self.HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"Not a version {self.VERSION} line number index")
+        if byte_order_mark != self.BYTE_ORDER_MARK:
+            raise ValueError("Line number index was written on a machine with a different byte order")
+        self.methods_count: int = methods_count
+        self.strings_count: int = strings_count
+
+        view = memoryview(buffer)
+        offsets = self.layout(methods_count, strings_count, lines_count)
+        typecodes = dict(self.COLUMNS, pcs="H", lines="H", string_offsets="I")
+        self.__views: dict[str, memoryview] = {
+            name: view[offset:offset + size].cast(typecodes[name]) for name, (offset, size) in offsets.items()
+            if name != "string_data"}
+        data_offset = offsets["string_data"][0]
+        self.__string_data: memoryview = view[data_offset:data_offset + strings_size]
+        view.release()
+        self.__string_ids: dict[str, int | None] = {}
+
+    @classmethod
+    def open(cls, path: str) -> "LineNumberIndex":
+        with open(path, "rb") as index_file:
+            return cls(mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __string_bytes(self, string_id: int) -> bytes:
+        offsets = self.__views["string_offsets"]
+        return self.__string_data[offsets[string_id]:offsets[string_id + 1]].tobytes()
+
+    def string(self, string_id: int) -> str | None:
+        if string_id == NO_STRING:
+            return None
+        return self.__string_bytes(string_id).decode("utf-8")
+
+    def string_id(self, string: str) -> int | None:
+        """ Find the id of a string by binary search over the sorted string table; memoized. """
+        if string in self.__string_ids:
+            return self.__string_ids[string]
+        target = string.encode("utf-8")
+        lo, hi = 0, self.strings_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__string_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        string_id = lo if lo < self.strings_count and self.__string_bytes(lo) == target else None
+        self.__string_ids[string] = string_id
+        return string_id
+
+    def methods(self, class_name: str, method: str) -> range:
+        """ Rows of the overloads of a method. """
+        class_id, name_id = self.string_id(class_name.replace(".", "/")), self.string_id(method)
+        if class_id is None or name_id is None:
+            return range(0)
+        keys = self.__views["keys"]
+        key = class_id << 32 | name_id
+        return range(bisect_left(keys, key), bisect_right(keys, key))
+
+    def symbolicate(self, class_name: str, method: str, pc: int, descriptor: str | None = None) -> SourceFrame | None:
+        """ Map a frame to its source line. Without a descriptor, the first overload long enough for pc wins. """
+        rows = self.methods(class_name, method)
+        views = self.__views
+        for row in rows:
+            if descriptor is not None and self.string(views["descriptor"][row]) != descriptor:
+                continue
+            if descriptor is None and pc >= views["code_length"][row] and row != rows[-1]:
+                continue
+            start = views["lines_start"][row]
+            end = start + views["lines_count"][row]
+            position = bisect_right(views["pcs"], pc, start, end) - 1
+            line = views["lines"][position] if position >= start else None
+            return SourceFrame(class_name.replace(".", "/"), method, self.string(views["descriptor"][row]),
+                               self.string(views["source_file"][row]), line)
+        return None
+
+    def symbolicate_all(self, frames: Iterable[tuple[str, str, int]]) -> list[SourceFrame | None]:
+        """ Symbolicate (class, method, pc) frames in bulk. """
+        symbolicate = self.symbolicate
+        return [symbolicate(class_name, method, pc) for class_name, method, pc in frames]
+
+    def __len__(self) -> int:
+        return self.methods_count
+
+    def close(self) -> None:
+        for view in self.__views.values():
+            view.release()
+        self.__views = {}
+        self.__string_data.release()
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+
+    def __enter__(self) -> "LineNumberIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"LineNumberIndex(methods={self.methods_count}, strings={self.strings_count})"
+
+
+class LineNumberIndexWriter:
+    """ Collects ClassLines and writes them out as a LineNumberIndex file. """
+
+    def __init__(self) -> None:
+        self.__classes: dict[str, ClassLines] = {}
+
+    def add(self, lines: ClassLines) -> None:
+        """ Add a class; the first class added under a name wins, as on a classpath. """
+        self.__classes.setdefault(lines.name, lines)
+
+    def __len__(self) -> int:
+        return len(self.__classes)
+
+    def to_bytes(self) -> bytes:
+        strings = set()
+        for lines in self.__classes.values():
+            strings.add(lines.name)
+            if lines.source_file is not None:
+                strings.add(lines.source_file)
+            for method in lines.methods:
+                strings.update((method.name, method.descriptor))
+        encoded = sorted(string.encode("utf-8") for string in strings)
+        ids = {string.decode("utf-8"): string_id for string_id, string in enumerate(encoded)}
+
+        rows = sorted(((ids[lines.name] << 32 | ids[method.name], ids[method.descriptor], lines, method)
+                       for lines in self.__classes.values() for method in lines.methods),
+                      key=lambda row: (row[0], row[1]))
+        columns = {name: array(typecode) for name, typecode in LineNumberIndex.COLUMNS}
+        pcs, line_numbers = array("H"), array("H")
+        for key, descriptor_id, lines, method in rows:
+            columns["keys"].append(key)
+            columns["descriptor"].append(descriptor_id)
+            columns["source_file"].append(NO_STRING if lines.source_file is None else ids[lines.source_file])
+            columns["code_length"].append(method.code_length)
+            columns["lines_start"].append(len(pcs))
+            columns["lines_count"].append(len(method.pcs))
+            pcs.extend(method.pcs)
+            line_numbers.extend(method.lines)
+
+        string_offsets = array("I", [0])
+        for string in encoded:
+            string_offsets.append(string_offsets[-1] + len(string))
+        string_data = b"".join(encoded)
+
+        offsets = LineNumberIndex.layout(len(rows), len(encoded), len(pcs))
+        buffer = bytearray(offsets["string_data"][0] + len(string_data))
+        LineNumberIndex.HEADER.pack_into(buffer, 0, LineNumberIndex.MAGIC, LineNumberIndex.VERSION,
+                                         LineNumberIndex.BYTE_ORDER_MARK, len(rows), len(encoded), len(string_data),
+                                         len(pcs), 0)
+        for name, data in (*columns.items(), ("pcs", pcs), ("lines", line_numbers),
+                           ("string_offsets", string_offsets)):
+            offset, size = offsets[name]
+            buffer[offset:offset + size] = data.tobytes()
+        buffer[offsets["string_data"][0]:] = string_data
+        return bytes(buffer)
+
+    def write(self, path: str) -> None:
+        with open(path, "wb") as index_file:
+            index_file.write(self.to_bytes())
+
+
+def _class_lines(source: ClassSource, instrumentation: Instrumentation | None = None) -> ClassLines | None:
+    try:
+        return class_lines(JavaClass(source.load(instrumentation=instrumentation), instrumentation, LINES_ONLY))
+    except Exception:
+        logger.warning("Failed to read line numbers of %s", source, exc_info=True)
+        return None
+
+
+def build_line_number_index(paths: Sequence[str], output: str, jobs: int = 1, chunksize: int = 64,
+                            instrumentation: Instrumentation | None = None) -> int:
+    """ Scan class files, archives and directories into a line number index. Returns the number of methods. """
+    writer = LineNumberIndexWriter()
+    sources = iter_class_sources(paths)
+
+    def add_all(results: Iterable[ClassLines | None]) -> None:
+        for lines in results:
+            if lines is not None:
+                writer.add(lines)
+
+    add_all(map_sources(_class_lines, sources, jobs, chunksize, instrumentation=instrumentation))
+    writer.write(output)
+    with LineNumberIndex.open(output) as index:
+        return len(index)
@@ -3,6 +3,20 @@ def parse_int(segment: bytes) -> int:
     return int.from_bytes(segment, byteorder='big', signed=False)
 
 
+def split_member_info(count: int, raw_bytes: bytes) -> list[bytes]:
+    """Split a field_info/method_info table into the raw bytes of each member."""
+    members = []
+    start = 0
+    for _ in range(count):
+        end = start + 8
+        attributes_count = parse_int(raw_bytes[start + 6:end])
+        for _ in range(attributes_count):
+            end += 6 + parse_int(raw_bytes[end + 2:end + 6])
+        members.append(raw_bytes[start:end])
+        start = end
+    return members
+
+
 def decode_utf8(segment: bytes) -> str:
     """ Decode a java byte segment into a UTF-8 string.
 
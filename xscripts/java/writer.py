@@ -0,0 +1,533 @@
+""" Serialize a JavaClass back to class file bytes.
+
+Sections that were never decoded are written straight from the ChunkedJavaClass buffers, and
+decoded members and attributes from the raw slices they wrap, so an unmodified class is written
+without copying. With `compact`, the constant pool is rebuilt with only the entries still
+referenced, and every index held by the class, its members and its attributes is renumbered.
+
+Refer: https://docs.oracle.com/javase/specs/jvms/se21/html/jvms-4.html
+"""
+import struct
+from typing import BinaryIO, Callable, Iterable
+
+from .bytecode import INSTRUCTION_LENGTHS, Opcode, instruction_length
+from .constant_pool import ConstantPool, ConstantPoolInfoTags, DoubleConstantPoolInfo, LongConstantPoolInfo
+from .fields import Field
+from .java_class import JavaClass
+from .methods import Method
+from .utils import parse_int
+
+Buffer = bytes | bytearray | memoryview
+
+U2 = struct.Struct(">H")
+MEMBER_HEADER = struct.Struct(">HHHH")
+
+# Offsets of the pool indexes held by an entry, by tag. Dynamic entries also hold an index into
+# BootstrapMethods, which is not a pool index.
+POOL_REFERENCES: dict[int, tuple[int, ...]] = {
+    ConstantPoolInfoTags.CLASS: (1,),
+    ConstantPoolInfoTags.STRING: (1,),
+    ConstantPoolInfoTags.FIELDREF: (1, 3),
+    ConstantPoolInfoTags.METHODREF: (1, 3),
+    ConstantPoolInfoTags.INTERFACE_METHODREF: (1, 3),
+    ConstantPoolInfoTags.NAME_AND_TYPE: (1, 3),
+    ConstantPoolInfoTags.METHOD_HANDLE: (2,),
+    ConstantPoolInfoTags.METHOD_TYPE: (1,),
+    ConstantPoolInfoTags.DYNAMIC: (3,),
+    ConstantPoolInfoTags.INVOKE_DYNAMIC: (3,),
+    ConstantPoolInfoTags.MODULE: (1,),
+    ConstantPoolInfoTags.PACKAGE: (1,),
+}
+
+
+class References:
+    """ Offsets of the pool indexes in a buffer: u2 indexes, and the u1 indexes of ldc. """
+
+    def __init__(self) -> None:
+        self.wide: list[int] = []
+        self.narrow: list[int] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.wide or self.narrow)
+
+
+# Walks the body of an attribute starting at an offset and records where it holds pool indexes.
+ReferenceWalker = Callable[[memoryview, int, References, Callable[[int], str]], None]
+
+
+def _u2(data: memoryview, offset: int) -> int:
+    return data[offset] << 8 | data[offset + 1]
+
+
+def _u4(data: memoryview, offset: int) -> int:
+    return int.from_bytes(data[offset:offset + 4], byteorder="big")
+
+
+def _no_references(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    pass
+
+
+def _single(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    refs.wide.append(offset)
+
+
+def _index_table(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    refs.wide.extend(range(offset + 2, offset + 2 + _u2(data, offset) * 2, 2))
+
+
+def _inner_classes(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    for entry in range(offset + 2, offset + 2 + _u2(data, offset) * 8, 8):
+        refs.wide.extend((entry, entry + 2, entry + 4))
+
+
+def _enclosing_method(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    refs.wide.extend((offset, offset + 2))
+
+
+def _local_variables(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    for entry in range(offset + 2, offset + 2 + _u2(data, offset) * 10, 10):
+        refs.wide.extend((entry + 4, entry + 6))
+
+
+def _bootstrap_methods(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    position = offset + 2
+    for _ in range(_u2(data, offset)):
+        arguments = _u2(data, position + 2)
+        refs.wide.append(position)
+        refs.wide.extend(range(position + 4, position + 4 + arguments * 2, 2))
+        position += 4 + arguments * 2
+
+
+def _method_parameters(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    refs.wide.extend(range(offset + 1, offset + 1 + data[offset] * 4, 4))
+
+
+def _module(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    refs.wide.extend((offset, offset + 4))
+    position = offset + 6
+    for _ in range(_u2(data, position)):
+        refs.wide.extend((position + 2, position + 6))
+        position += 6
+    position += 2
+    # exports and opens share a layout: index, flags, then the modules they are qualified to.
+    for _ in range(2):
+        count, position = _u2(data, position), position + 2
+        for _ in range(count):
+            targets = _u2(data, position + 4)
+            refs.wide.append(position)
+            refs.wide.extend(range(position + 6, position + 6 + targets * 2, 2))
+            position += 6 + targets * 2
+    uses = _u2(data, position)
+    refs.wide.extend(range(position + 2, position + 2 + uses * 2, 2))
+    position += 2 + uses * 2
+    count, position = _u2(data, position), position + 2
+    for _ in range(count):
+        implementations = _u2(data, position + 2)
+        refs.wide.append(position)
+        refs.wide.extend(range(position + 4, position + 4 + implementations * 2, 2))
+        position += 4 + implementations * 2
+
+
+def _attributes(data: memoryview, offset: int, count: int, refs: References, name_of: Callable[[int], str]) -> int:
+    """ Walk a table of nested attributes, returning the offset past its end. """
+    for _ in range(count):
+        refs.wide.append(offset)
+        walker = ATTRIBUTE_REFERENCES.get(name_of(_u2(data, offset)))
+        if walker is None:
+            raise ValueError(f"No reference walker for attribute {name_of(_u2(data, offset))}")
+        walker(data, offset + 6, refs, name_of)
+        offset += 6 + _u4(data, offset + 2)
+    return offset
+
+
+def _record(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    position = offset + 2
+    for _ in range(_u2(data, offset)):
+        refs.wide.extend((position, position + 2))
+        position = _attributes(data, position + 6, _u2(data, position + 4), refs, name_of)
+
+
+# Width of the pool index operand of an instruction, 0 if it has none.
+_POOL_OPERANDS = bytearray(256)
+_POOL_OPERANDS[Opcode.LDC] = 1
+for _opcode in (Opcode.LDC_W, Opcode.LDC2_W, *range(Opcode.GETSTATIC, Opcode.INVOKEDYNAMIC + 1), Opcode.NEW,
+                Opcode.ANEWARRAY, Opcode.CHECKCAST, Opcode.INSTANCEOF, Opcode.MULTIANEWARRAY):
+    _POOL_OPERANDS[_opcode] = 2
+_POOL_OPERANDS = bytes(_POOL_OPERANDS)
+
+
+def _bytecode(data: memoryview, start: int, end: int, refs: References) -> None:
+    lengths, operands = INSTRUCTION_LENGTHS, _POOL_OPERANDS
+    code = data[start:end]
+    pc = 0
+    while pc < len(code):
+        opcode = code[pc]
+        width = operands[opcode]
+        if width == 2:
+            refs.wide.append(start + pc + 1)
+        elif width:
+            refs.narrow.append(start + pc + 1)
+        pc += lengths[opcode] or instruction_length(code, pc)
+
+
+def _code(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    code_start = offset + 8
+    code_end = code_start + _u4(data, offset + 4)
+    _bytecode(data, code_start, code_end, refs)
+    handlers = _u2(data, code_end)
+    refs.wide.extend(range(code_end + 2 + 6, code_end + 2 + handlers * 8, 8))
+    position = code_end + 2 + handlers * 8
+    _attributes(data, position + 2, _u2(data, position), refs, name_of)
+
+
+def _verification_types(data: memoryview, position: int, count: int, refs: References) -> int:
+    for _ in range(count):
+        tag = data[position]
+        if tag == 7:
+            refs.wide.append(position + 1)
+        position += 3 if tag in (7, 8) else 1
+    return position
+
+
+def _stack_map_table(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    position = offset + 2
+    for _ in range(_u2(data, offset)):
+        frame_type = data[position]
+        if frame_type < 64:
+            position += 1
+        elif frame_type < 128:
+            position = _verification_types(data, position + 1, 1, refs)
+        elif frame_type < 247:
+            raise ValueError(f"Invalid stack map frame type {frame_type}")
+        elif frame_type == 247:
+            position = _verification_types(data, position + 3, 1, refs)
+        elif frame_type < 252:
+            position += 3
+        elif frame_type < 255:
+            position = _verification_types(data, position + 3, frame_type - 251, refs)
+        else:
+            position = _verification_types(data, position + 5, _u2(data, position + 3), refs)
+            position = _verification_types(data, position + 2, _u2(data, position), refs)
+
+
+def _element_value(data: memoryview, position: int, refs: References) -> int:
+    tag = chr(data[position])
+    if tag == "e":
+        refs.wide.extend((position + 1, position + 3))
+        return position + 5
+    if tag == "@":
+        return _annotation(data, position + 1, refs)
+    if tag == "[":
+        count, position = _u2(data, position + 1), position + 3
+        for _ in range(count):
+            position = _element_value(data, position, refs)
+        return position
+    if tag not in "BCDFIJSZsc":
+        raise ValueError(f"Invalid element value tag {tag!r}")
+    refs.wide.append(position + 1)
+    return position + 3
+
+
+def _annotation(data: memoryview, position: int, refs: References) -> int:
+    refs.wide.append(position)
+    pairs, position = _u2(data, position + 2), position + 4
+    for _ in range(pairs):
+        refs.wide.append(position)
+        position = _element_value(data, position + 2, refs)
+    return position
+
+
+def _annotations(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    position = offset + 2
+    for _ in range(_u2(data, offset)):
+        position = _annotation(data, position, refs)
+
+
+def _parameter_annotations(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    position = offset + 1
+    for _ in range(data[offset]):
+        count, position = _u2(data, position), position + 2
+        for _ in range(count):
+            position = _annotation(data, position, refs)
+
+
+def _target_info_length(data: memoryview, position: int) -> int:
+    target_type = data[position]
+    if target_type in (0x00, 0x01, 0x16):
+        return 1
+    if target_type in (0x10, 0x11, 0x12, 0x17, 0x42, 0x43, 0x44, 0x45, 0x46):
+        return 2
+    if target_type in (0x13, 0x14, 0x15):
+        return 0
+    if target_type in (0x40, 0x41):
+        return 2 + _u2(data, position + 1) * 6
+    if 0x47 <= target_type <= 0x4B:
+        return 3
+    raise ValueError(f"Invalid type annotation target type {target_type:#04x}")
+
+
+def _type_annotations(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    position = offset + 2
+    for _ in range(_u2(data, offset)):
+        position += 1 + _target_info_length(data, position)
+        position += 1 + data[position] * 2
+        position = _annotation(data, position, refs)
+
+
+def _annotation_default(data: memoryview, offset: int, refs: References, name_of: Callable[[int], str]) -> None:
+    _element_value(data, offset, refs)
+
+
+# Reference walkers by attribute name; add an entry to let compaction rewrite a vendor attribute.
+ATTRIBUTE_REFERENCES: dict[str, ReferenceWalker] = {
+    "ConstantValue": _single,
+    "Code": _code,
+    "StackMapTable": _stack_map_table,
+    "Exceptions": _index_table,
+    "InnerClasses": _inner_classes,
+    "EnclosingMethod": _enclosing_method,
+    "Synthetic": _no_references,
+    "Signature": _single,
+    "SourceFile": _single,
+    "SourceDebugExtension": _no_references,
+    "LineNumberTable": _no_references,
+    "LocalVariableTable": _local_variables,
+    "LocalVariableTypeTable": _local_variables,
+    "Deprecated": _no_references,
+    "RuntimeVisibleAnnotations": _annotations,
+    "RuntimeInvisibleAnnotations": _annotations,
+    "RuntimeVisibleParameterAnnotations": _parameter_annotations,
+    "RuntimeInvisibleParameterAnnotations": _parameter_annotations,
+    "RuntimeVisibleTypeAnnotations": _type_annotations,
+    "RuntimeInvisibleTypeAnnotations": _type_annotations,
+    "AnnotationDefault": _annotation_default,
+    "BootstrapMethods": _bootstrap_methods,
+    "MethodParameters": _method_parameters,
+    "Module": _module,
+    "ModulePackages": _index_table,
+    "ModuleMainClass": _single,
+    "NestHost": _single,
+    "NestMembers": _index_table,
+    "Record": _record,
+    "PermittedSubclasses": _index_table,
+}
+
+
+def attribute_references(raw: Buffer, name_of: Callable[[int], str]) -> References:
+    """ Where an attribute, header included, holds pool indexes; name_of resolves nested attribute names. """
+    refs = References()
+    _attributes(memoryview(raw), 0, 1, refs, name_of)
+    return refs
+
+
+def _split_attributes(count: int, data: Buffer) -> list[Buffer]:
+    attributes = []
+    start = 0
+    for _ in range(count):
+        end = start + 6 + parse_int(data[start + 2:start + 6])
+        attributes.append(data[start:end])
+        start = end
+    return attributes
+
+
+def _is_changed(instance: object, names: Iterable[str]) -> bool:
+    """ Whether any of the cached properties was computed, or assigned, on the instance. """
+    state = vars(instance)
+    return any(name in state for name in names)
+
+
+def _u2_section(java_class: JavaClass, name: str, segment: bytes) -> Buffer:
+    return U2.pack(getattr(java_class, name)) if name in vars(java_class) else segment
+
+
+def _member_header(member: Field | Method, attributes_count: int) -> bytes:
+    return MEMBER_HEADER.pack(member.access_flags, member.name_index, member.descriptor_index, attributes_count)
+
+
+def _member(member: Field | Method) -> list[Buffer]:
+    if not _is_changed(member, ("access_flags", "name_index", "descriptor_index", "attributes")):
+        return [member.raw]
+    if "attributes" not in vars(member):
+        return [_member_header(member, member.attributes_count), member.raw[8:]]
+    return [_member_header(member, len(member.attributes)), *(attribute.raw for attribute in member.attributes)]
+
+
+def _members(members: tuple[Field | Method, ...]) -> list[Buffer]:
+    pieces = [U2.pack(len(members))]
+    for member in members:
+        pieces.extend(_member(member))
+    return pieces
+
+
+def _pool_entries(constant_pool: ConstantPool) -> Iterable[tuple[int, bytes]]:
+    """ The pool entries by index, once each: long and double entries take two slots. """
+    pool = constant_pool.pool
+    index = 1
+    while index in pool:
+        info = pool[index]
+        yield index, info.raw
+        index += 2 if isinstance(info, (LongConstantPoolInfo, DoubleConstantPoolInfo)) else 1
+
+
+def _interface_indexes(java_class: JavaClass) -> list[int]:
+    """ The Class entries of the interfaces; the original ones unless the interface names were replaced. """
+    segment = java_class.chunked_java_class.interfaces_segment
+    original = [parse_int(segment[i:i + 2]) for i in range(0, len(segment), 2)]
+    if "interfaces" not in vars(java_class) or java_class.interfaces == JavaClass.interfaces_dump_bytes(
+            len(original), segment, java_class.constant_pool):
+        return original
+    indexes = []
+    for name in java_class.interfaces:
+        index = java_class.constant_pool.find_class(name)
+        if index is None:
+            raise ValueError(f"Interface {name} has no Class entry in the constant pool")
+        indexes.append(index)
+    return indexes
+
+
+def class_sections(java_class: JavaClass) -> list[Buffer]:
+    """ The class file as a list of buffers, reusing the original ones for every unchanged section. """
+    chunk = java_class.chunked_java_class
+    pieces: list[Buffer] = [
+        bytes.fromhex(java_class.magic) if "magic" in vars(java_class) else chunk.magic_segment,
+        _u2_section(java_class, "minor_version", chunk.minor_version_segment),
+        _u2_section(java_class, "major_version", chunk.major_version_segment),
+    ]
+    if "constant_pool" in vars(java_class):
+        pieces.append(U2.pack(len(java_class.constant_pool.pool) + 1))
+        pieces.extend(raw for _, raw in _pool_entries(java_class.constant_pool))
+    else:
+        pieces.extend((chunk.constant_pool_count_segment, chunk.constant_pool_segment))
+    pieces.append(_u2_section(java_class, "access_flags", chunk.access_flags_segment))
+    pieces.append(_u2_section(java_class, "this_class", chunk.this_class_segment))
+    pieces.append(_u2_section(java_class, "super_class", chunk.super_class_segment))
+    if "interfaces" in vars(java_class) or "interfaces_count" in vars(java_class):
+        indexes = _interface_indexes(java_class)
+        pieces.append(struct.pack(f">H{len(indexes)}H", len(indexes), *indexes))
+    else:
+        pieces.extend((chunk.interfaces_count_segment, chunk.interfaces_segment))
+    for name, count_segment, segment in (("fields", chunk.fields_count_segment, chunk.fields_info_segment),
+                                         ("methods", chunk.methods_count_segment, chunk.methods_info_segment)):
+        if name in vars(java_class):
+            pieces.extend(_members(getattr(java_class, name)))
+        else:
+            pieces.extend((count_segment, segment))
+    if "attributes" in vars(java_class):
+        pieces.append(U2.pack(len(java_class.attributes)))
+        pieces.extend(attribute.raw for attribute in java_class.attributes)
+    else:
+        pieces.extend((chunk.attributes_count_segment, chunk.attributes_info_segment))
+    return pieces
+
+
+class _CompactMember:
+    """ A member reduced to what compaction rewrites: header indexes, raw attributes and where they hold indexes. """
+
+    def __init__(self, member: Field | Method, name_of: Callable[[int], str]) -> None:
+        self.access_flags: int = member.access_flags
+        self.name_index: int = member.name_index
+        self.descriptor_index: int = member.descriptor_index
+        if "attributes" in vars(member):
+            raws = [attribute.raw for attribute in member.attributes]
+        else:
+            raws = _split_attributes(member.attributes_count, member.raw[8:])
+        self.attributes: list[tuple[Buffer, References]] = [(raw, attribute_references(raw, name_of)) for raw in raws]
+
+
+def compact_class_sections(java_class: JavaClass) -> list[Buffer]:
+    """ The class file with a constant pool holding only referenced entries, as a list of buffers.
+
+    Entries keep their relative order, so every index can only decrease and ldc operands still fit
+    in one byte. Raises ValueError if an attribute has no reference walker in ATTRIBUTE_REFERENCES,
+    since the indexes it holds could not be renumbered.
+    """
+    constant_pool = java_class.constant_pool
+    pool = constant_pool.pool
+
+    def name_of(index: int) -> str:
+        return constant_pool.get_utf8_constant_pool_info(index).string
+
+    interfaces = _interface_indexes(java_class)
+    members = [[_CompactMember(member, name_of) for member in java_class.fields],
+               [_CompactMember(member, name_of) for member in java_class.methods]]
+    class_attributes = [(attribute.raw, attribute_references(attribute.raw, name_of))
+                        for attribute in java_class.attributes]
+
+    count = len(pool) + 1
+    used = bytearray(count)
+    for index in (java_class.this_class, java_class.super_class, *interfaces):
+        used[index] = 1
+    attributes = list(class_attributes)
+    for member in (*members[0], *members[1]):
+        used[member.name_index] = used[member.descriptor_index] = 1
+        attributes.extend(member.attributes)
+    for raw, refs in attributes:
+        for offset in refs.wide:
+            used[raw[offset] << 8 | raw[offset + 1]] = 1
+        for offset in refs.narrow:
+            used[raw[offset]] = 1
+    # Index 0 stands for "none" wherever it is allowed, and is never an entry.
+    used[0] = 0
+    worklist = [index for index in range(count) if used[index]]
+    while worklist:
+        raw = pool[worklist.pop()].raw
+        for offset in POOL_REFERENCES.get(raw[0], ()):
+            index = raw[offset] << 8 | raw[offset + 1]
+            if not used[index]:
+                used[index] = 1
+                worklist.append(index)
+
+    mapping = [0] * count
+    entries = []
+    next_index = 1
+    for index, raw in _pool_entries(constant_pool):
+        if used[index]:
+            mapping[index] = next_index
+            next_index += 2 if raw[0] in (ConstantPoolInfoTags.LONG, ConstantPoolInfoTags.DOUBLE) else 1
+            entries.append(raw)
+    if next_index == count:
+        return class_sections(java_class)
+
+    def patched(raw: Buffer, wide: Iterable[int], narrow: Iterable[int] = ()) -> Buffer:
+        buffer = None
+        for offset in wide:
+            if buffer is None:
+                buffer = bytearray(raw)
+            U2.pack_into(buffer, offset, mapping[_u2(raw, offset)])
+        for offset in narrow:
+            if buffer is None:
+                buffer = bytearray(raw)
+            buffer[offset] = mapping[raw[offset]]
+        return raw if buffer is None else buffer
+
+    pieces: list[Buffer] = [
+        bytes.fromhex(java_class.magic),
+        U2.pack(java_class.minor_version),
+        U2.pack(java_class.major_version),
+        U2.pack(next_index),
+    ]
+    pieces.extend(patched(raw, POOL_REFERENCES.get(raw[0], ())) for raw in entries)
+    pieces.append(struct.pack(f">HHHH{len(interfaces)}H", java_class.access_flags, mapping[java_class.this_class],
+                              mapping[java_class.super_class], len(interfaces),
+                              *(mapping[index] for index in interfaces)))
+    for group in members:
+        pieces.append(U2.pack(len(group)))
+        for member in group:
+            pieces.append(MEMBER_HEADER.pack(member.access_flags, mapping[member.name_index],
+                                             mapping[member.descriptor_index], len(member.attributes)))
+            pieces.extend(patched(raw, refs.wide, refs.narrow) for raw, refs in member.attributes)
+    pieces.append(U2.pack(len(class_attributes)))
+    pieces.extend(patched(raw, refs.wide, refs.narrow) for raw, refs in class_attributes)
+    return pieces
+
+
+def write_class(java_class: JavaClass, stream: BinaryIO, compact: bool = False) -> int:
+    """ Write a class file to a binary stream, returning the number of bytes written. """
+    pieces = compact_class_sections(java_class) if compact else class_sections(java_class)
+    stream.writelines(pieces)
+    return sum(len(piece) for piece in pieces)
+
+
+def class_bytes(java_class: JavaClass, compact: bool = False) -> bytes:
+    """ The class file bytes of a possibly modified JavaClass. """
+    return b"".join(compact_class_sections(java_class) if compact else class_sections(java_class))